@@ -0,0 +1,26 @@
+import time
+from typing import Any, Callable
+
+import pytest
+
+
+def measure(function: Callable[..., Any], *args: Any, rounds: int = 100, repeat: int = 3) -> float:
+    """
+    Returns the best, over `repeat` runs, of the mean seconds `function(*args)` takes across `rounds` calls.
+    """
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+
+        for _ in range(rounds):
+            function(*args)
+
+        best = min(best, (time.perf_counter() - start) / rounds)
+
+    return best
+
+
+@pytest.fixture
+def best_time() -> Callable[..., float]:
+    return measure
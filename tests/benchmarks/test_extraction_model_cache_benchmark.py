@@ -0,0 +1,51 @@
+import pytest
+
+from xcrap.extractor import HtmlExtractionModel, css
+from xcrap.factory import ExtractionModelCache, create_extraction_model
+
+ALLOWED_MODELS = {"html": HtmlExtractionModel}
+ALLOWED_EXTRACTORS = {"attr": lambda name: lambda el: el.attrib.get(name)}
+
+CONFIG = {
+    "type": "html",
+    "model": {
+        **{f"field_{i}": {"query": css(f"div.card-{i} span::text"), "default": ""} for i in range(30)},
+        "items": {
+            "query": css("li.item"),
+            "multiple": True,
+            "nested": {
+                "type": "html",
+                "model": {
+                    **{f"value_{i}": {"query": css(f"span.value-{i}::text")} for i in range(10)},
+                    "link": {"query": css("a"), "extractor": "attr:href"},
+                },
+            },
+        },
+    },
+}
+
+
+PAGE = "<div class='card-0'><span>Title</span></div><ul><li class='item'><span class='value-0'>0</span><a href='/a'>a</a></li></ul>"
+
+
+def build() -> None:
+    create_extraction_model(CONFIG, ALLOWED_MODELS, ALLOWED_EXTRACTORS).compile()
+
+
+def test_cached_models_match_built_models(tmp_path) -> None:
+    cache = ExtractionModelCache(path=str(tmp_path))
+    model = create_extraction_model(CONFIG, ALLOWED_MODELS, ALLOWED_EXTRACTORS)
+
+    assert cache.get(CONFIG, ALLOWED_MODELS, ALLOWED_EXTRACTORS) is cache.get(CONFIG, ALLOWED_MODELS, ALLOWED_EXTRACTORS)
+    assert cache.get(CONFIG, ALLOWED_MODELS, ALLOWED_EXTRACTORS).extract(PAGE) == model.extract(PAGE)
+
+
+@pytest.mark.benchmark
+def test_cached_models_skip_reconstruction(tmp_path, best_time) -> None:
+    cache = ExtractionModelCache(path=str(tmp_path))
+    cached = best_time(lambda: cache.get(CONFIG, ALLOWED_MODELS, ALLOWED_EXTRACTORS), rounds=200)
+    uncached = best_time(build, rounds=200)
+
+    print(f"\nbuild + compile {uncached * 1e6:.0f}us, cache hit {cached * 1e6:.0f}us ({uncached / cached:.0f}x)")
+
+    assert cached * 5 < uncached
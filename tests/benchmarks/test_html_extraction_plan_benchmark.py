@@ -0,0 +1,38 @@
+import pytest
+from parsel import Selector
+
+from xcrap.extractor import HtmlBaseField, HtmlExtractionModel, css, xpath
+
+ROUNDS = 100
+
+PAGE = "<html><body><h1>Catalog</h1><ul>{}</ul></body></html>".format(
+    "".join(f'<li class="product"><a href="/p/{i}">Product {i}</a><span class="price">{i}.99</span></li>' for i in range(300))
+)
+
+
+class CatalogModel(HtmlExtractionModel):
+    title = HtmlBaseField(query=css("h1::text"))
+    names = HtmlBaseField(query=css("li.product a::text"), multiple=True)
+    links = HtmlBaseField(query=css("li.product a::attr(href)"), multiple=True)
+    prices = HtmlBaseField(query=xpath("//span[@class='price']/text()"), multiple=True)
+    first = HtmlBaseField(query=css("li.product"))
+
+
+def test_compiled_plan_matches_interpreted_extraction() -> None:
+    selector = Selector(text=PAGE)
+    model = CatalogModel()
+
+    assert model.extract(selector) == model._interpret(selector)
+
+
+@pytest.mark.benchmark
+def test_compiled_plan_is_faster_than_interpreted_extraction(best_time) -> None:
+    selector = Selector(text=PAGE)
+    model = CatalogModel()
+
+    interpreted = best_time(model._interpret, selector, rounds=ROUNDS)
+    compiled = best_time(model.extract, selector, rounds=ROUNDS)
+
+    print(f"\nper-page extraction: interpreted {interpreted * 1e6:.0f}us, compiled {compiled * 1e6:.0f}us")
+
+    assert compiled < interpreted * 0.75
@@ -0,0 +1,52 @@
+import json
+import re
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("httpx", "parsel", "lxml", "cryptography", "pydantic", "jmespath", "selectolax", "cssselect")
+
+# Generous on purpose: `import xcrap` only loads the standard library, while the eager version took ~450ms.
+MAX_IMPORT_TIME = 0.2
+
+
+def run(code: str, *options: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *options, "-c", code], capture_output=True, text=True, check=True)
+
+
+def loaded_heavy_modules(statement: str) -> list[str]:
+    code = f"import sys, json\n{statement}\nprint(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    return json.loads(run(code).stdout)
+
+
+def cumulative_import_time(module: str) -> float:
+    stderr = run(f"import {module}", "-X", "importtime").stderr
+    match = re.search(rf"^import time:\s+\d+ \|\s+(\d+) \| {re.escape(module)}$", stderr, re.MULTILINE)
+
+    return int(match.group(1)) / 1e6
+
+
+@pytest.mark.parametrize("statement", ["import xcrap", "import xcrap.core", "import xcrap.extractor", "import xcrap.factory"])
+def test_package_import_does_not_load_dependencies(statement: str) -> None:
+    assert loaded_heavy_modules(statement) == []
+
+
+def test_json_parser_import_does_not_load_html_or_http_dependencies() -> None:
+    loaded = loaded_heavy_modules("from xcrap.extractor import JsonParser")
+
+    assert not {"httpx", "parsel", "lxml", "cryptography", "selectolax"} & set(loaded)
+
+
+def test_http_response_import_does_not_load_html_dependencies() -> None:
+    loaded = loaded_heavy_modules("from xcrap.core import HttpResponse")
+
+    assert not {"parsel", "lxml", "selectolax", "cryptography"} & set(loaded)
+
+
+@pytest.mark.benchmark
+def test_import_time() -> None:
+    best = min(cumulative_import_time("xcrap") for _ in range(3))
+    print(f"\nimport xcrap: {best * 1e3:.1f}ms")
+
+    assert best < MAX_IMPORT_TIME
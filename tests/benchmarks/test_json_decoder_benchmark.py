@@ -0,0 +1,52 @@
+import importlib.util
+import json
+
+import pytest
+
+from xcrap.utils.json_decoder import load_json_decoder
+
+FAST_BACKENDS = [backend for backend in ("msgspec", "orjson") if importlib.util.find_spec(backend)]
+
+
+def make_payload(records: int) -> bytes:
+    return json.dumps(
+        {
+            "page": 1,
+            "items": [
+                {
+                    "id": i,
+                    "name": f"Product {i}",
+                    "price": i * 1.25,
+                    "tags": ["a", "b", "c"],
+                    "available": i % 2 == 0,
+                    "seller": {"id": i % 97, "name": f"Seller {i % 97}", "rating": None},
+                }
+                for i in range(records)
+            ],
+        }
+    ).encode("utf-8")
+
+
+PAYLOADS = {"10KB": make_payload(60), "1MB": make_payload(6_000), "10MB": make_payload(60_000)}
+
+
+@pytest.mark.skipif(not FAST_BACKENDS, reason="neither msgspec nor orjson is installed")
+def test_fast_backends_decode_like_json() -> None:
+    for payload in PAYLOADS.values():
+        assert all(load_json_decoder(backend)(payload) == json.loads(payload) for backend in FAST_BACKENDS)
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not FAST_BACKENDS, reason="neither msgspec nor orjson is installed")
+def test_fast_backends_decode_large_payloads_faster_than_json(best_time) -> None:
+    print()
+
+    for size, payload in PAYLOADS.items():
+        rounds = max(1, 2_000_000 // len(payload))
+        times = {backend: best_time(load_json_decoder(backend), payload, rounds=rounds) for backend in ("json", *FAST_BACKENDS)}
+
+        timings = ", ".join(f"{name} {seconds * 1e3:.2f}ms" for name, seconds in times.items())
+        print(f"{size} ({len(payload) / 1e6:.2f} MB): {timings}")
+
+    for backend in FAST_BACKENDS:
+        assert times[backend] < times["json"]
@@ -0,0 +1,42 @@
+import pytest
+
+from xcrap.extractor import HtmlBaseField, HtmlExtractionModel, HtmlParser, css
+
+pytest.importorskip("selectolax")
+
+ROUNDS = 50
+
+PAGE = "<html><body><h1>Catalog</h1><ul>{}</ul></body></html>".format(
+    "".join(
+        f'<li class="product" data-id="{i}"><a href="/p/{i}">Product {i}</a>'
+        f'<div class="meta"><span class="price">{i}.99</span><span class="stock">in stock</span></div></li>'
+        for i in range(300)
+    )
+)
+
+
+class CatalogModel(HtmlExtractionModel):
+    title = HtmlBaseField(query=css("h1::text"))
+    ids = HtmlBaseField(query=css("li.product::attr(data-id)"), multiple=True)
+    names = HtmlBaseField(query=css("li.product a::text"), multiple=True)
+    links = HtmlBaseField(query=css("li.product a::attr(href)"), multiple=True)
+    prices = HtmlBaseField(query=css("div.meta span.price::text"), multiple=True)
+    stock = HtmlBaseField(query=css("span.stock::text"))
+
+
+def extract(engine: str) -> dict:
+    return HtmlParser(PAGE, engine=engine).extract_model(CatalogModel)
+
+
+def test_lexbor_engine_matches_parsel_for_document_level_css_models() -> None:
+    assert extract("lexbor") == extract("parsel")
+
+
+@pytest.mark.benchmark
+def test_lexbor_engine_is_faster_than_parsel_for_document_level_css_models(best_time) -> None:
+    parsel = best_time(extract, "parsel", rounds=ROUNDS)
+    lexbor = best_time(extract, "lexbor", rounds=ROUNDS)
+
+    print(f"\nper-page parse + extraction: parsel {parsel * 1e6:.0f}us, lexbor {lexbor * 1e6:.0f}us")
+
+    assert lexbor < parsel
@@ -0,0 +1,38 @@
+import asyncio
+import time
+
+import pytest
+
+from xcrap.core.request_scheduler import RequestScheduler
+
+JOBS = 20_000
+
+
+async def noop(index, job):
+    await asyncio.sleep(0)
+    return job
+
+
+async def per_job_overhead(concurrency: int) -> float:
+    best = float("inf")
+
+    for _ in range(3):
+        scheduler = RequestScheduler(concurrency=concurrency)
+        start = time.perf_counter()
+
+        async for _ in scheduler.run(range(JOBS), noop):
+            pass
+
+        best = min(best, (time.perf_counter() - start) / JOBS)
+
+    return best
+
+
+@pytest.mark.benchmark
+async def test_request_scheduler_overhead_stays_flat_as_concurrency_grows() -> None:
+    low = await per_job_overhead(10)
+    high = await per_job_overhead(1000)
+
+    print(f"\nper-job scheduling overhead: c=10 {low * 1e6:.1f}us, c=1000 {high * 1e6:.1f}us")
+
+    assert high < low * 3
@@ -0,0 +1,53 @@
+import pytest
+from parsel import Selector
+
+from xcrap.extractor import HtmlBaseField, HtmlExtractionModel, css
+from xcrap.extractor.html_extraction_model import HtmlExtractionPlan
+
+ROUNDS = 50
+FIELDS = 30
+
+PAGE = "<html><body>{}<div class='product'>{}</div></body></html>".format(
+    "".join(f"<div class='filler'><p>{i}</p><span>{i}</span></div>" for i in range(1_000)),
+    "".join(f"<span class='f{i}'>{i}</span>" for i in range(FIELDS)),
+)
+
+WideModel = type(
+    "WideModel",
+    (HtmlExtractionModel,),
+    {f"field_{i}": HtmlBaseField(query=css(f"div.product span.f{i}::text")) for i in range(FIELDS)},
+)
+
+
+class UnsharedPlan(HtmlExtractionPlan):
+    def _find_shared_prefixes(self, fields):
+        return {}
+
+
+def compile_plans() -> tuple[HtmlExtractionPlan, HtmlExtractionPlan]:
+    model = WideModel()
+    unshared = UnsharedPlan(model, "html")
+    unshared.build()
+
+    return model.compile(), unshared
+
+
+def test_shared_prefixes_match_per_field_queries() -> None:
+    root = Selector(text=PAGE).root
+    shared, unshared = compile_plans()
+
+    assert len(shared.prefixes) == 1
+    assert shared.evaluate(root) == unshared.evaluate(root) == {f"field_{i}": str(i) for i in range(FIELDS)}
+
+
+@pytest.mark.benchmark
+def test_shared_prefixes_are_faster_on_wide_models(best_time) -> None:
+    root = Selector(text=PAGE).root
+    shared, unshared = compile_plans()
+
+    shared_time = best_time(shared.evaluate, root, rounds=ROUNDS)
+    unshared_time = best_time(unshared.evaluate, root, rounds=ROUNDS)
+
+    print(f"\nwide model ({FIELDS} fields): shared prefixes {shared_time * 1e6:.0f}us, per-field {unshared_time * 1e6:.0f}us")
+
+    assert shared_time < unshared_time * 0.5
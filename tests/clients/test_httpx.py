@@ -2,6 +2,8 @@ import pytest
 import httpx
 from unittest.mock import AsyncMock, patch, MagicMock
 from xcrap.clients.httpx import HttpxClient
+from xcrap.core.rate_limiter import RateLimiter
+from xcrap.core.retry_policy import RetryPolicy
 import asyncio
 
 
@@ -14,7 +16,8 @@ async def test_httpx_client_fetch_success() -> None:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.reason_phrase = "OK"
-        mock_response.text = "Success"
+        mock_response.content = "Success".encode()
+        mock_response.charset_encoding = None
         mock_response.headers = {"Content-Type": "text/plain"}
 
         mock_instance.request.return_value = mock_response
@@ -53,18 +56,20 @@ async def test_httpx_client_fetch_retry_on_failure() -> None:
         mock_instance.request = AsyncMock()
 
         mock_error_response = MagicMock(spec=httpx.Response)
-        mock_error_response.status_code = 404
-        mock_error_response.reason_phrase = "Not Found"
-        mock_error_response.text = "Error"
+        mock_error_response.status_code = 503
+        mock_error_response.reason_phrase = "Service Unavailable"
+        mock_error_response.content = "Error".encode()
+        mock_error_response.charset_encoding = None
         mock_error_response.headers = {}
         mock_error_response.request = MagicMock()
 
-        # First call fails with 404 (which raises HTTPStatusError in our code)
+        # First call fails with a retryable 503
         # Second call succeeds
         mock_success_response = MagicMock()
         mock_success_response.status_code = 200
         mock_success_response.reason_phrase = "OK"
-        mock_success_response.text = "Perfect"
+        mock_success_response.content = "Perfect".encode()
+        mock_success_response.charset_encoding = None
         mock_success_response.headers = {}
 
         mock_instance.request.side_effect = [mock_error_response, mock_success_response]
@@ -77,7 +82,7 @@ async def test_httpx_client_fetch_retry_on_failure() -> None:
         assert response.body == "Perfect"
         assert response.attempts == 2
         assert len(response.failed_attempts) == 1
-        assert "Invalid status code: 404" in response.failed_attempts[0]["error"]
+        assert "Invalid status code: 503" in response.failed_attempts[0]["error"]
 
 
 @pytest.mark.asyncio
@@ -107,7 +112,8 @@ async def test_httpx_client_fetch_status_error_no_retries() -> None:
         mock_resp = MagicMock(spec=httpx.Response)
         mock_resp.status_code = 403
         mock_resp.reason_phrase = "Forbidden"
-        mock_resp.text = "No access"
+        mock_resp.content = "No access".encode()
+        mock_resp.charset_encoding = None
         mock_resp.headers = {"X-Error": "True"}
         mock_resp.request = MagicMock()
 
@@ -130,7 +136,8 @@ async def test_httpx_client_fetch_many() -> None:
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.reason_phrase = "OK"
-        mock_resp.text = "Data"
+        mock_resp.content = "Data".encode()
+        mock_resp.charset_encoding = None
         mock_resp.headers = {}
         mock_instance.request.return_value = mock_resp
 
@@ -153,7 +160,8 @@ async def test_httpx_client_fetch_many_with_concurrency() -> None:
             m = MagicMock()
             m.status_code = 200
             m.reason_phrase = "OK"
-            m.text = "Slow"
+            m.content = "Slow".encode()
+            m.charset_encoding = None
             m.headers = {}
             return m
 
@@ -177,7 +185,8 @@ async def test_httpx_client_fetch_many_hit_gather() -> None:
         mock_resp = MagicMock()
         mock_resp.status_code = 200
         mock_resp.reason_phrase = "OK"
-        mock_resp.text = "Data"
+        mock_resp.content = "Data".encode()
+        mock_resp.charset_encoding = None
         mock_resp.headers = {}
         mock_instance.request.return_value = mock_resp
 
@@ -195,7 +204,9 @@ async def test_httpx_client_proxy_url() -> None:
     with patch("httpx.AsyncClient") as mock_client_class:
         mock_instance = mock_client_class.return_value
         mock_instance.request = AsyncMock()
-        mock_instance.request.return_value = MagicMock(status_code=200, reason_phrase="OK", text="ok", headers={})
+        mock_instance.request.return_value = MagicMock(
+            status_code=200, reason_phrase="OK", content=b"ok", charset_encoding=None, headers={}
+        )
 
         client = HttpxClient(proxy_url="http://proxy/")
         await client.fetch(url="http://test.com")
@@ -209,7 +220,9 @@ async def test_httpx_client_custom_headers() -> None:
     with patch("httpx.AsyncClient") as mock_client_class:
         mock_instance = mock_client_class.return_value
         mock_instance.request = AsyncMock()
-        mock_instance.request.return_value = MagicMock(status_code=200, reason_phrase="OK", text="ok", headers={})
+        mock_instance.request.return_value = MagicMock(
+            status_code=200, reason_phrase="OK", content=b"ok", charset_encoding=None, headers={}
+        )
 
         client = HttpxClient()
         await client.fetch(url="http://test.com", headers={"X-Test": "Value"})
@@ -218,3 +231,230 @@ async def test_httpx_client_custom_headers() -> None:
         args, kwargs = mock_instance.request.call_args
         assert kwargs["headers"]["X-Test"] == "Value"
         assert "User-Agent" in kwargs["headers"]
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_fetch_consults_rate_limiter() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_instance = mock_client_class.return_value
+        mock_instance.request = AsyncMock()
+        mock_instance.request.return_value = MagicMock(
+            status_code=200, reason_phrase="OK", content=b"ok", charset_encoding=None, headers={}
+        )
+
+        limiter = RateLimiter(host_rate=1)
+        client = HttpxClient(rate_limiter=limiter)
+        await client.fetch(url="http://test.com/page")
+
+        assert "test.com" in limiter.host_buckets
+
+
+def make_response(status_code, text="", headers=None):
+    response = MagicMock(spec=httpx.Response)
+    response.status_code = status_code
+    response.reason_phrase = "Reason"
+    response.content = text.encode()
+    response.charset_encoding = None
+    response.headers = headers or {}
+    return response
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_fetch_does_not_retry_permanent_failures() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_instance = mock_client_class.return_value
+        mock_instance.request = AsyncMock(side_effect=[make_response(404, "Missing"), make_response(200, "Late")])
+
+        client = HttpxClient()
+        response = await client.fetch("http://test.com", max_retries=3)
+
+        assert response.status == 404
+        assert response.body == "Missing"
+        assert response.attempts == 1
+        assert mock_instance.request.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_fetch_honors_retry_after() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class, patch("xcrap.clients.httpx.asyncio.sleep") as mock_sleep:
+        mock_instance = mock_client_class.return_value
+        mock_instance.request = AsyncMock(side_effect=[make_response(429, headers={"Retry-After": "3"}), make_response(200, "Ok")])
+
+        client = HttpxClient(retry_policy=RetryPolicy(max_retries=2, backoff=100, jitter=0))
+        response = await client.fetch("http://test.com")
+
+        assert response.status == 200
+        assert response.attempts == 2
+        mock_sleep.assert_awaited_once_with(3.0)
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_fetch_gives_up_on_long_retry_after() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class, patch("xcrap.clients.httpx.asyncio.sleep") as mock_sleep:
+        mock_instance = mock_client_class.return_value
+        mock_instance.request = AsyncMock(
+            side_effect=[make_response(429, headers={"Retry-After": "86400"}), make_response(200, "Ok")]
+        )
+
+        client = HttpxClient(retry_policy=RetryPolicy(max_retries=2, backoff=100, jitter=0))
+        response = await client.fetch("http://test.com")
+
+        assert response.status == 429
+        assert response.attempts == 1
+        mock_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_fetch_uses_exponential_backoff() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class, patch("xcrap.clients.httpx.asyncio.sleep") as mock_sleep:
+        mock_instance = mock_client_class.return_value
+        mock_instance.request = AsyncMock(side_effect=[make_response(502), make_response(502), make_response(200, "Ok")])
+
+        client = HttpxClient()
+        response = await client.fetch("http://test.com", retry_policy=RetryPolicy(max_retries=2, backoff=100, jitter=0))
+
+        assert response.status == 200
+        assert [call.args[0] for call in mock_sleep.await_args_list] == [0.1, 0.2]
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_fetch_skips_non_retryable_exceptions() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_instance = mock_client_class.return_value
+        mock_instance.request = AsyncMock(side_effect=ValueError("bad request"))
+
+        policy = RetryPolicy(max_retries=3, retry_exceptions=(httpx.TransportError,))
+        client = HttpxClient(retry_policy=policy)
+        response = await client.fetch("http://test.com")
+
+        assert response.status == 500
+        assert response.attempts == 1
+        assert response.body == "bad request"
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_fetch_stops_at_deadline() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_instance = mock_client_class.return_value
+        mock_instance.request = AsyncMock(return_value=make_response(503, "Down"))
+
+        policy = RetryPolicy(max_retries=5, backoff=1000, jitter=0, deadline=500)
+        client = HttpxClient(retry_policy=policy)
+        response = await client.fetch("http://test.com")
+
+        assert response.status == 503
+        assert response.attempts == 1
+        assert len(response.failed_attempts) == 1
+
+
+def test_httpx_client_pool_and_timeout_options() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class:
+        client = HttpxClient(
+            max_connections=500,
+            max_keepalive_connections=100,
+            keepalive_expiry=30_000,
+            http2=True,
+            timeout=10_000,
+            connect_timeout=2_000,
+        )
+
+        kwargs = mock_client_class.call_args.kwargs
+        assert kwargs["http2"] is True
+        assert kwargs["limits"] == httpx.Limits(max_connections=500, max_keepalive_connections=100, keepalive_expiry=30)
+        assert kwargs["timeout"] == httpx.Timeout(10, connect=2)
+        assert client.timeout.read == 10
+
+
+def test_httpx_client_default_pool_options() -> None:
+    client = HttpxClient()
+
+    assert client.limits == httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5)
+    assert client.timeout == httpx.Timeout(5)
+    assert client.http2 is False
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_async_context_manager_closes_pool() -> None:
+    with patch("httpx.AsyncClient") as mock_client_class:
+        mock_instance = mock_client_class.return_value
+        mock_instance.aclose = AsyncMock()
+
+        async with HttpxClient() as client:
+            assert isinstance(client, HttpxClient)
+
+        mock_instance.aclose.assert_awaited_once()
+
+
+def make_client_factory(created):
+    def factory(*args, **kwargs):
+        instance = MagicMock()
+        instance.request = AsyncMock(return_value=make_response(200, "ok"))
+        instance.aclose = AsyncMock()
+        created.append((kwargs.get("proxy"), instance))
+        return instance
+
+    return factory
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_routes_requests_through_pooled_proxy_clients() -> None:
+    created = []
+    proxies = iter(["http://p1:8080", "http://p2:8080", "http://p1:8080"])
+
+    with patch("httpx.AsyncClient", side_effect=make_client_factory(created)):
+        client = HttpxClient(proxy=lambda: next(proxies))
+
+        for _ in range(3):
+            await client.fetch("http://test.com")
+
+    by_proxy = dict(created)
+    assert list(by_proxy) == [None, "http://p1:8080", "http://p2:8080"]
+    assert by_proxy["http://p1:8080"].request.await_count == 2
+    assert by_proxy["http://p2:8080"].request.await_count == 1
+    assert by_proxy[None].request.await_count == 0
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_evicts_idle_proxy_clients() -> None:
+    created = []
+    proxies = iter(["http://p1:8080", "http://p2:8080"])
+
+    with patch("httpx.AsyncClient", side_effect=make_client_factory(created)):
+        client = HttpxClient(proxy=lambda: next(proxies), proxy_idle_timeout=0)
+
+        await client.fetch("http://test.com")
+        await client.fetch("http://test.com")
+
+    by_proxy = dict(created)
+    by_proxy["http://p1:8080"].aclose.assert_awaited_once()
+    by_proxy["http://p2:8080"].aclose.assert_not_awaited()
+    assert list(client._proxy_clients) == ["http://p2:8080"]
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_keeps_busy_proxy_clients() -> None:
+    created = []
+
+    with patch("httpx.AsyncClient", side_effect=make_client_factory(created)):
+        client = HttpxClient(proxy_idle_timeout=0)
+
+        async with client._client_for("http://p1:8080"):
+            await client._evict_idle_proxy_clients()
+            assert "http://p1:8080" in client._proxy_clients
+
+        client.proxy_idle_timeout = None
+        await client._evict_idle_proxy_clients()
+        assert "http://p1:8080" in client._proxy_clients
+
+
+@pytest.mark.asyncio
+async def test_httpx_client_aclose_closes_proxy_clients() -> None:
+    created = []
+
+    with patch("httpx.AsyncClient", side_effect=make_client_factory(created)):
+        client = HttpxClient(proxy="http://p1:8080")
+        await client.fetch("http://test.com")
+        await client.aclose()
+
+    assert all(instance.aclose.await_count == 1 for _, instance in created)
+    assert client._proxy_clients == {}
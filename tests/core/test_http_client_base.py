@@ -1,25 +1,16 @@
 import pytest
 import asyncio
-from xcrap.core.http_client_base import HttpClientBase, ExecuteRequestOptions
+from xcrap.core import ExecuteRequestOptions
+from xcrap.core.http_client_base import HttpClientBase
 from xcrap.core.http_response import HttpResponse
+from xcrap.core.rate_limiter import RateLimiter
+from xcrap.core.retry_policy import RetryPolicy
 
 
 class MockHttpClient(HttpClientBase):
     async def fetch(self, url, **kwargs):
         return HttpResponse(200, "OK", f"Content from {url}", {})
 
-    async def fetch_many(self, requests, request_delay=None, concurrency=None):
-        results = [None] * len(requests)
-        tasks = []
-        for i, req in enumerate(requests):
-            tasks.append(
-                asyncio.create_task(
-                    self._execute_request({"index": i, "request": req, "results": results, "request_delay": request_delay})
-                )
-            )
-        await asyncio.gather(*tasks)
-        return results
-
 
 @pytest.mark.asyncio
 async def test_http_client_base_initialization() -> None:
@@ -45,69 +36,45 @@ async def test_http_client_base_is_success() -> None:
 
 
 @pytest.mark.asyncio
-async def test_http_client_base_should_throttle() -> None:
-    client = MockHttpClient()
-    executing = [1, 2, 3]  # mock tasks
-    assert client._should_throttle(executing, 2) is True
-    assert client._should_throttle(executing, 5) is False
-    assert client._should_throttle(executing, None) is False
+async def test_http_client_base_fetch_many_spaces_requests_with_delay() -> None:
+    loop = asyncio.get_running_loop()
+    starts = []
 
+    class RecordingClient(MockHttpClient):
+        async def fetch(self, url, **kwargs):
+            starts.append(loop.time())
+            return await super().fetch(url, **kwargs)
 
-@pytest.mark.asyncio
-async def test_http_client_base_clean_completed_tasks() -> None:
-    client = MockHttpClient()
-
-    class MockTask:
-        def __init__(self, done):
-            self._done = done
+    client = RecordingClient()
+    requests = [{"url": f"http://{i}.com"} for i in range(3)]
 
-        def done(self):
-            return self._done
+    results = await client.fetch_many(requests, request_delay=50, concurrency=3)
 
-    tasks = [MockTask(True), MockTask(False), MockTask(True)]
-    client._clean_completed_tasks(tasks)
-    assert len(tasks) == 1
-    assert tasks[0].done() is False
+    assert [r.body for r in results] == [f"Content from http://{i}.com" for i in range(3)]
+    assert starts[1] - starts[0] >= 0.045
+    assert starts[2] - starts[1] >= 0.045
 
 
 @pytest.mark.asyncio
-async def test_http_client_base_handle_concurrency() -> None:
-    client = MockHttpClient()
+async def test_http_client_base_acquire_rate_limit_uses_host() -> None:
+    limiter = RateLimiter(host_rate=10)
+    client = MockHttpClient(rate_limiter=limiter)
 
-    async def task_fn():
-        await asyncio.sleep(0.01)
+    await client._acquire_rate_limit("http://a.com/1")
+    await client._acquire_rate_limit("http://b.com/1")
 
-    tasks = [asyncio.create_task(task_fn()) for _ in range(3)]
-    await client._handle_concurrency(tasks)
-    # At least one should be done (and cleaned)
-    assert len(tasks) < 3
+    assert set(limiter.host_buckets) == {"a.com", "b.com"}
+    await MockHttpClient()._acquire_rate_limit("http://a.com/1")
 
 
 @pytest.mark.asyncio
-async def test_http_client_base_execute_request_with_delay() -> None:
+async def test_http_client_base_fetch_many_keeps_request_order() -> None:
     client = MockHttpClient()
-    results = [None, None]
-    options: ExecuteRequestOptions = {
-        "index": 1,
-        "request": {"url": "http://test.com", "method": "GET", "retries": 0, "max_retries": 0, "retry_delay": 0},
-        "results": results,
-        "request_delay": 100,  # 100ms
-    }
+    requests = [{"url": f"http://{i}.com"} for i in range(5)]
 
-    start = asyncio.get_event_loop().time()
-    await client._execute_request(options)
-    end = asyncio.get_event_loop().time()
+    results = await client.fetch_many(requests, concurrency=2)
 
-    assert results[1] is not None
-    assert results[1].body == "Content from http://test.com"
-    assert (end - start) >= 0.09
-
-
-@pytest.mark.asyncio
-async def test_http_client_base_handle_concurrency_empty() -> None:
-    client = MockHttpClient()
-    # Should return immediately and cover line 76
-    await client._handle_concurrency([])
+    assert [r.body for r in results] == [f"Content from http://{i}.com" for i in range(5)]
 
 
 def test_http_client_base_abstracts() -> None:
@@ -131,3 +98,290 @@ def test_http_client_base_abstracts() -> None:
         loop.run_until_complete(bo.fetch_many([], 0, 0))
     finally:
         loop.close()
+
+
+class DelayedHttpClient(MockHttpClient):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, url, delay=0.0, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+
+        return HttpResponse(200, "OK", f"Content from {url}", {})
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_fetch_iter_yields_in_completion_order() -> None:
+    client = DelayedHttpClient()
+    requests = [
+        {"url": "http://slow.com", "delay": 0.05},
+        {"url": "http://fast.com", "delay": 0.0},
+        {"url": "http://medium.com", "delay": 0.02},
+    ]
+
+    results = [(index, response.body) async for index, response in client.fetch_iter(requests)]
+
+    assert results == [
+        (1, "Content from http://fast.com"),
+        (2, "Content from http://medium.com"),
+        (0, "Content from http://slow.com"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_fetch_iter_respects_concurrency() -> None:
+    client = DelayedHttpClient()
+    requests = ({"url": f"http://{i}.com", "delay": 0.01} for i in range(10))
+
+    indexes = [index async for index, _ in client.fetch_iter(requests, concurrency=3)]
+
+    assert sorted(indexes) == list(range(10))
+    assert client.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_fetch_many_with_zero_concurrency_runs_serially() -> None:
+    client = DelayedHttpClient()
+    requests = [{"url": f"http://{i}.com", "delay": 0.005} for i in range(4)]
+
+    results = await client.fetch_many(requests, concurrency=0)
+
+    assert len(results) == 4
+    assert client.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_keeps_legacy_fetch_many_helpers() -> None:
+    class LegacyClient(MockHttpClient):
+        async def fetch_many(self, requests, request_delay=None, concurrency=None):
+            results = [None] * len(requests)
+            executing = []
+
+            for i, request in enumerate(requests):
+                options: ExecuteRequestOptions = {
+                    "index": i,
+                    "request": request,
+                    "results": results,
+                    "request_delay": request_delay,
+                }
+                executing.append(asyncio.create_task(self._execute_request(options)))
+
+                if self._should_throttle(executing, concurrency):
+                    await self._handle_concurrency(executing)
+
+            await asyncio.gather(*executing)
+            return results
+
+    requests = [{"url": f"http://{i}.com"} for i in range(3)]
+
+    with pytest.warns(DeprecationWarning) as warnings:
+        results = await LegacyClient().fetch_many(requests, request_delay=1, concurrency=2)
+
+    assert {str(warning.message).split()[0] for warning in warnings} == {
+        "HttpClientBase._execute_request",
+        "HttpClientBase._should_throttle",
+        "HttpClientBase._handle_concurrency",
+    }
+    assert [r.body for r in results] == [f"Content from http://{i}.com" for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_fetch_iter_cancels_pending_on_close() -> None:
+    client = DelayedHttpClient()
+    requests = [{"url": "http://fast.com", "delay": 0.0}, {"url": "http://slow.com", "delay": 10}]
+
+    iterator = client.fetch_iter(requests)
+    index, _ = await iterator.__anext__()
+    await iterator.aclose()
+    await asyncio.sleep(0)
+
+    assert index == 0
+    assert client.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_fetch_many_respects_host_concurrency() -> None:
+    client = DelayedHttpClient(host_concurrency=1)
+    requests = [{"url": f"http://same-host.com/{i}", "delay": 0.01} for i in range(3)]
+
+    results = await client.fetch_many(requests, concurrency=3)
+
+    assert len(results) == 3
+    assert client.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_host_limits_are_shared_by_concurrent_batches() -> None:
+    client = DelayedHttpClient(host_concurrency=1)
+    batch = [{"url": f"http://same-host.com/{i}", "delay": 0.01} for i in range(3)]
+
+    first, second = await asyncio.gather(client.fetch_many(batch, concurrency=3), client.fetch_many(batch, concurrency=3))
+
+    assert len(first) == len(second) == 3
+    assert client.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_host_delay_holds_across_batches() -> None:
+    loop = asyncio.get_running_loop()
+    client = MockHttpClient(host_delay=30)
+    requests = [{"url": "http://same-host.com/"}]
+
+    start = loop.time()
+    await client.fetch_many(requests)
+    await client.fetch_many(requests)
+
+    assert loop.time() - start >= 0.025
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_request_host() -> None:
+    client = MockHttpClient()
+    assert client._request_host({"url": "https://Example.com:8080/path?q=1"}) == "example.com:8080"
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_proxy_slot_limits_per_proxy() -> None:
+    client = MockHttpClient(proxy_concurrency=1)
+    in_flight = 0
+    max_in_flight = 0
+
+    async def use(proxy):
+        nonlocal in_flight, max_in_flight
+        async with client._proxy_slot(proxy):
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(use("http://p1"), use("http://p1"))
+    assert max_in_flight == 1
+
+    max_in_flight = 0
+    await asyncio.gather(use("http://p1"), use("http://p2"), use(None))
+    assert max_in_flight == 3
+
+
+def test_http_client_base_resolve_retry_policy() -> None:
+    default_policy = RetryPolicy(max_retries=1, backoff=50)
+    client = MockHttpClient(retry_policy=default_policy)
+
+    assert client._resolve_retry_policy(None, None, None) is default_policy
+
+    overridden = client._resolve_retry_policy(3, 200, None)
+    assert overridden.max_retries == 3
+    assert overridden.backoff == 200
+    assert default_policy.max_retries == 1
+
+    explicit = RetryPolicy(max_retries=7)
+    assert client._resolve_retry_policy(0, 0, explicit) is explicit
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_async_context_manager() -> None:
+    async with MockHttpClient() as client:
+        assert isinstance(client, MockHttpClient)
+
+    await client.aclose()
+
+
+class CountingHttpClient(MockHttpClient):
+    def __init__(self, status=200, error=None, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+        self.status = status
+        self.error = error
+
+    async def fetch(self, url, method="GET", headers=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+
+        if self.error:
+            raise self.error
+
+        return HttpResponse(self.status, "OK", f"Content from {url}", {})
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_coalesces_identical_in_flight_requests() -> None:
+    client = CountingHttpClient(coalesce_requests=True)
+
+    responses = await asyncio.gather(
+        client.fetch("http://a.com"),
+        client.fetch("http://a.com", method="get"),
+        client.fetch("http://a.com", headers={"X-Test": "1"}),
+        client.fetch("http://b.com"),
+    )
+
+    assert client.calls == 3
+    assert responses[0] is responses[1]
+    assert responses[0] is not responses[2]
+    assert client._in_flight == {}
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_coalesced_fetch_many_hits_each_url_once() -> None:
+    client = CountingHttpClient(coalesce_requests=True)
+    requests = [{"url": "http://detail.com/1"}] * 5 + [{"url": "http://detail.com/2"}] * 5
+
+    results = await client.fetch_many(requests)
+
+    assert client.calls == 2
+    assert [r.body for r in results] == ["Content from http://detail.com/1"] * 5 + ["Content from http://detail.com/2"] * 5
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_memoizes_successful_responses() -> None:
+    client = CountingHttpClient(coalesce_requests=True, coalesce_ttl=50)
+
+    first = await client.fetch("http://a.com")
+    second = await client.fetch("http://a.com")
+    await asyncio.sleep(0.06)
+    third = await client.fetch("http://a.com")
+
+    assert first is second
+    assert third is not first
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_does_not_memoize_failures() -> None:
+    client = CountingHttpClient(status=500, coalesce_requests=True, coalesce_ttl=1000)
+
+    await client.fetch("http://a.com")
+    await client.fetch("http://a.com")
+
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_coalesced_errors_reach_every_caller() -> None:
+    client = CountingHttpClient(error=RuntimeError("boom"), coalesce_requests=True, coalesce_ttl=1000)
+
+    results = await asyncio.gather(client.fetch("http://a.com"), client.fetch("http://a.com"), return_exceptions=True)
+
+    assert client.calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_http_client_base_coalesced_request_survives_caller_cancellation() -> None:
+    client = CountingHttpClient(coalesce_requests=True)
+
+    first = asyncio.create_task(client.fetch("http://a.com"))
+    second = asyncio.create_task(client.fetch("http://a.com"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    response = await second
+
+    assert response.body == "Content from http://a.com"
+    assert client.calls == 1
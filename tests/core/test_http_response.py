@@ -51,3 +51,76 @@ def test_http_response_as_html_parser() -> None:
     res = HttpResponse(200, "OK", "<html></html>", {})
     parser = res.as_html_parser()
     assert isinstance(parser, HtmlParser)
+
+
+def test_http_response_decodes_bytes_lazily() -> None:
+    res = HttpResponse(200, "OK", "café".encode("utf-8"), {})
+
+    assert res._text is None
+    assert res.content == "café".encode("utf-8")
+    assert res.encoding == "utf-8"
+    assert res.text == "café"
+
+
+def test_http_response_uses_declared_charset() -> None:
+    res = HttpResponse(200, "OK", "café".encode("latin-1"), {"Content-Type": 'text/html; charset="ISO-8859-1"'})
+
+    assert res.encoding == "iso8859-1"
+    assert res.body == "café"
+    assert HttpResponse(200, "OK", b"", {"Content-Type": "text/html; charset=bogus"}).encoding == "utf-8"
+    assert HttpResponse(200, "OK", b"", {}, encoding="cp1252").encoding == "cp1252"
+
+
+def test_http_response_encodes_text_on_demand() -> None:
+    res = HttpResponse(200, "OK", "café", {})
+    assert res.content == "café".encode("utf-8")
+
+
+def test_http_response_json_from_bytes() -> None:
+    assert HttpResponse(200, "OK", b'{"key": "value"}', {}).json == {"key": "value"}
+    assert HttpResponse(200, "OK", '{"k": "é"}'.encode("latin-1"), {}, encoding="latin-1").json == {"k": "é"}
+
+
+def test_http_response_as_parser_from_bytes() -> None:
+    res = HttpResponse(200, "OK", "<p>café</p>".encode("latin-1"), {"content-type": "text/html; charset=latin-1"})
+
+    assert res.as_parser(SourceParser).content == "<p>café</p>"
+    assert res.as_html_parser().selector.css("p::text").get() == "café"
+    assert res._text is None
+
+
+def test_http_response_as_html_parser_with_empty_body() -> None:
+    res = HttpResponse(204, "No Content", b"", {})
+    parser = res.as_html_parser()
+
+    assert parser.extract_value({"type": "css", "value": "h1::text"}, default="none") == "none"
+    assert parser.extract_values({"type": "css", "value": "p::text"}) == []
+
+
+def test_http_response_memoizes_json() -> None:
+    res = HttpResponse(200, "OK", b'{"key": "value"}', {})
+    assert res.json is res.json
+
+
+def test_http_response_memoizes_parsers() -> None:
+    res = HttpResponse(200, "OK", b"<p>hi</p>", {})
+
+    assert res.as_html_parser() is res.as_html_parser()
+    assert res.as_parser(HtmlParser) is res.as_html_parser()
+    assert res.as_parser(SourceParser) is not res.as_html_parser()
+
+
+def test_http_response_lowercases_headers_lazily() -> None:
+    headers = {"Content-Type": "text/html", "X-Custom": "val"}
+    res = HttpResponse(200, "OK", "", headers)
+
+    assert res.get_header("X-Custom") == "val"
+    assert res._headers is None
+    assert res.get_header("x-custom") == "val"
+    assert res.headers == {"content-type": "text/html", "x-custom": "val"}
+    assert headers == {"Content-Type": "text/html", "X-Custom": "val"}
+
+
+def test_http_response_uses_slots() -> None:
+    res = HttpResponse(200, "OK", "", {})
+    assert not hasattr(res, "__dict__")
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from xcrap.core.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_spaces_tokens() -> None:
+    bucket = TokenBucket(rate=10, burst=2)
+    starts = []
+
+    for _ in range(4):
+        start = bucket.available_at(100.0)
+        bucket.consume(start)
+        starts.append(start)
+
+    assert starts == pytest.approx([100.0, 100.0, 100.1, 100.2])
+
+
+def test_token_bucket_refills_after_idle_period() -> None:
+    bucket = TokenBucket(rate=1, burst=1)
+    bucket.consume(0.0)
+
+    assert bucket.available_at(0.5) == 1.0
+    assert bucket.available_at(5.0) == 5.0
+
+
+def test_token_bucket_rejects_invalid_settings() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, burst=0)
+
+
+def test_rate_limiter_without_rates_never_waits() -> None:
+    limiter = RateLimiter()
+    assert limiter.reserve("example.com") == 0
+
+
+def test_rate_limiter_hands_out_staggered_slots() -> None:
+    limiter = RateLimiter(rate=10)
+    delays = [limiter.reserve() for _ in range(3)]
+
+    assert delays[0] == pytest.approx(0, abs=0.01)
+    assert delays[1] == pytest.approx(0.1, abs=0.01)
+    assert delays[2] == pytest.approx(0.2, abs=0.01)
+
+
+def test_rate_limiter_limits_each_host_independently() -> None:
+    limiter = RateLimiter(host_rate=10)
+
+    assert limiter.reserve("a.com") == pytest.approx(0, abs=0.01)
+    assert limiter.reserve("b.com") == pytest.approx(0, abs=0.01)
+    assert limiter.reserve("a.com") == pytest.approx(0.1, abs=0.01)
+    assert limiter.reserve(None) == 0
+
+
+def test_rate_limiter_combines_global_and_host_limits() -> None:
+    limiter = RateLimiter(rate=100, host_rate=5)
+
+    assert limiter.reserve("a.com") == pytest.approx(0, abs=0.01)
+    assert limiter.reserve("b.com") == pytest.approx(0.01, abs=0.005)
+    assert limiter.reserve("a.com") == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_acquire_waits_for_slot() -> None:
+    limiter = RateLimiter(rate=20)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await asyncio.gather(*(limiter.acquire() for _ in range(3)))
+
+    assert loop.time() - start >= 0.09
@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+from xcrap.core.request_scheduler import KeyLimits, RequestScheduler
+
+
+async def echo(index, job):
+    await asyncio.sleep(0)
+    return job
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_runs_every_job() -> None:
+    scheduler = RequestScheduler(concurrency=3)
+
+    results = [item async for item in scheduler.run(["a", "b", "c", "d"], echo)]
+
+    assert sorted(results) == [(0, "a"), (1, "b"), (2, "c"), (3, "d")]
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_unbounded_runs_everything_at_once() -> None:
+    in_flight = 0
+    max_in_flight = 0
+
+    async def worker(index, job):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return job
+
+    results = [item async for item in RequestScheduler().run(range(20), worker)]
+
+    assert len(results) == 20
+    assert max_in_flight == 20
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_empty_jobs() -> None:
+    assert [item async for item in RequestScheduler().run([], echo)] == []
+    assert [item async for item in RequestScheduler(concurrency=2).run([], echo)] == []
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_consumes_jobs_lazily() -> None:
+    consumed = []
+
+    def jobs():
+        for i in range(100):
+            consumed.append(i)
+            yield i
+
+    results = RequestScheduler(concurrency=2).run(jobs(), echo)
+    await results.__anext__()
+    await results.aclose()
+
+    assert len(consumed) < 10
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_propagates_worker_errors() -> None:
+    async def failing(index, job):
+        raise RuntimeError(f"boom {job}")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        [item async for item in RequestScheduler(concurrency=2).run([1, 2, 3], failing)]
+
+
+def test_request_scheduler_rejects_negative_concurrency() -> None:
+    with pytest.raises(ValueError):
+        RequestScheduler(concurrency=-1)
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_caps_concurrency_per_key() -> None:
+    in_flight = {}
+    max_in_flight = {}
+
+    async def worker(index, job):
+        host = job[0]
+        in_flight[host] = in_flight.get(host, 0) + 1
+        max_in_flight[host] = max(max_in_flight.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return job
+
+    jobs = [("slow", i) for i in range(6)] + [("fast", i) for i in range(6)]
+    scheduler = RequestScheduler(concurrency=10, key=lambda job: job[0], key_concurrency=2)
+
+    results = [item async for item in scheduler.run(jobs, worker)]
+
+    assert len(results) == 12
+    assert max_in_flight == {"slow": 2, "fast": 2}
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_busy_key_does_not_starve_other_keys() -> None:
+    async def worker(index, job):
+        await asyncio.sleep(0.05 if job == "slow" else 0)
+        return job
+
+    jobs = ["slow"] * 4 + ["fast"] * 4
+    scheduler = RequestScheduler(concurrency=4, key=lambda job: job, key_concurrency=1)
+
+    results = [job async for _, job in scheduler.run(jobs, worker)]
+
+    assert results[:4] == ["fast"] * 4
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_spaces_jobs_per_key() -> None:
+    loop = asyncio.get_running_loop()
+    starts = {}
+
+    async def worker(index, job):
+        starts.setdefault(job, []).append(loop.time())
+        return job
+
+    jobs = ["a", "a", "a", "b", "b"]
+    scheduler = RequestScheduler(key=lambda job: job, key_interval=0.03)
+
+    results = [item async for item in scheduler.run(jobs, worker)]
+
+    assert len(results) == 5
+    assert starts["a"][2] - starts["a"][0] >= 0.055
+    assert starts["b"][0] - starts["a"][0] < 0.02
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_key_is_ignored_without_limits() -> None:
+    def key(job):
+        raise AssertionError("key should not be computed")
+
+    results = [item async for item in RequestScheduler(key=key).run([1, 2], echo)]
+
+    assert sorted(results) == [(0, 1), (1, 2)]
+
+
+def test_request_scheduler_rejects_invalid_key_concurrency() -> None:
+    with pytest.raises(ValueError):
+        RequestScheduler(key=lambda job: job, key_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_request_scheduler_shares_key_limits_between_runs() -> None:
+    in_flight = 0
+    max_in_flight = 0
+
+    async def worker(index, job):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return job
+
+    async def run(limits):
+        return [
+            item async for item in RequestScheduler(concurrency=4, key=lambda job: "host", key_limits=limits).run(range(4), worker)
+        ]
+
+    limits = KeyLimits(concurrency=1)
+    results = await asyncio.gather(run(limits), run(limits))
+
+    assert [len(items) for items in results] == [4, 4]
+    assert max_in_flight == 1
+    assert limits._active == {}
+
+
+def test_key_limits_drop_past_start_times() -> None:
+    limits = KeyLimits(interval=1)
+
+    for index in range(2000):
+        limits.start(index, now=index * 2)
+        limits.release(index)
+
+    assert len(limits._next_start) < 1100
+    assert limits.wait_time(1999, now=3998) == 1
@@ -0,0 +1,235 @@
+import time
+
+import pytest
+
+from xcrap.core.http_client_base import HttpClientBase
+from xcrap.core.http_response import HttpResponse
+from xcrap.core.response_cache import ResponseCache, cache_client, inject_cache
+
+
+class ScriptedClient(HttpClientBase):
+    def __init__(self, responses=None, **kwargs):
+        super().__init__(**kwargs)
+        self.responses = list(responses or [])
+        self.calls = []
+
+    async def fetch(self, url, method="GET", headers=None, **kwargs):
+        self.calls.append({"url": url, "method": method, "headers": headers})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60_000)
+    yield cache
+    cache.close()
+
+
+def test_response_cache_roundtrip(cache) -> None:
+    cache.set("get", "http://a.com", HttpResponse(200, "OK", "hello", {"ETag": '"v1"'}))
+
+    entry = cache.get("GET", "http://a.com")
+
+    assert entry.fresh is True
+    assert entry.response.body == "hello"
+    assert entry.response.get_header("etag") == '"v1"'
+    assert entry.validators == {"If-None-Match": '"v1"'}
+    assert cache.get("POST", "http://a.com") is None
+    assert cache.size == 5
+
+
+def test_response_cache_keeps_raw_bytes_and_encoding(cache) -> None:
+    body = "olá".encode("latin-1")
+    cache.set("GET", "http://a.com", HttpResponse(200, "OK", body, {}, encoding="latin-1"))
+
+    response = cache.get("GET", "http://a.com").response
+
+    assert response.content == body
+    assert response.encoding == "latin-1"
+    assert response.body == "olá"
+    assert cache.size == 3
+
+
+def test_response_cache_drops_stale_entries_without_validators(tmp_path) -> None:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=0)
+    cache.set("GET", "http://a.com", HttpResponse(200, "OK", "plain", {}))
+    cache.set("GET", "http://b.com", HttpResponse(200, "OK", "dated", {"Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}))
+
+    assert cache.get("GET", "http://a.com") is None
+    assert cache.size == 5
+
+    entry = cache.get("GET", "http://b.com")
+    assert entry.fresh is False
+    assert entry.validators == {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    cache.close()
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_size=10)
+
+    cache.set("GET", "http://a.com", HttpResponse(200, "OK", "aaaa", {}))
+    time.sleep(0.01)
+    cache.set("GET", "http://b.com", HttpResponse(200, "OK", "bbbb", {}))
+    time.sleep(0.01)
+    cache.get("GET", "http://a.com")
+    time.sleep(0.01)
+    cache.set("GET", "http://c.com", HttpResponse(200, "OK", "cccc", {}))
+
+    assert cache.get("GET", "http://b.com") is None
+    assert cache.get("GET", "http://a.com") is not None
+    assert cache.get("GET", "http://c.com") is not None
+    assert cache.size == 8
+    cache.close()
+
+
+def test_response_cache_persists_between_instances(tmp_path) -> None:
+    path = str(tmp_path / "cache.sqlite")
+    ResponseCache(path).set("GET", "http://a.com", HttpResponse(200, "OK", "kept", {}))
+
+    reopened = ResponseCache(path)
+
+    assert reopened.size == 4
+    assert reopened.get("GET", "http://a.com").response.body == "kept"
+
+    reopened.clear()
+    assert reopened.size == 0
+    assert reopened.get("GET", "http://a.com") is None
+
+
+def test_response_cache_keys_on_identity_headers(cache) -> None:
+    cache.set("GET", "http://a.com", HttpResponse(200, "OK", "alice", {}), {"Authorization": "Bearer alice"})
+    cache.set("GET", "http://a.com", HttpResponse(200, "OK", "json", {}), {"Accept": "application/json"})
+
+    assert cache.get("GET", "http://a.com", {"authorization": "Bearer alice"}).response.body == "alice"
+    assert cache.get("GET", "http://a.com", {"Authorization": "Bearer bob"}) is None
+    assert cache.get("GET", "http://a.com", {"Accept": "application/json"}).response.body == "json"
+    assert cache.get("GET", "http://a.com") is None
+
+
+def test_response_cache_honors_vary(cache) -> None:
+    cache.set("GET", "http://a.com", HttpResponse(200, "OK", "mobile", {"Vary": "X-Device"}), {"X-Device": "mobile"})
+
+    assert cache.get("GET", "http://a.com", {"x-device": "mobile"}).response.body == "mobile"
+    assert cache.get("GET", "http://a.com", {"X-Device": "desktop"}) is None
+    assert cache.get("GET", "http://a.com") is None
+
+
+def test_response_cache_skips_responses_it_must_not_store(cache) -> None:
+    cache.set("GET", "http://a.com", HttpResponse(200, "OK", "secret", {"Cache-Control": "no-store"}))
+    cache.set("GET", "http://b.com", HttpResponse(200, "OK", "mine", {"Cache-Control": "private, max-age=60"}))
+    cache.set("GET", "http://c.com", HttpResponse(200, "OK", "any", {"Vary": "*"}))
+    cache.set("GET", "http://d.com", HttpResponse(200, "OK", "check", {"Cache-Control": "no-cache", "ETag": '"d"'}))
+
+    assert [cache.get("GET", f"http://{host}.com") for host in "abc"] == [None, None, None]
+    assert cache.get("GET", "http://d.com").fresh is False
+    assert cache.size == 5
+
+
+@pytest.mark.asyncio
+async def test_inject_cache_serves_fresh_entries_without_network(cache) -> None:
+    client = inject_cache(ScriptedClient([HttpResponse(200, "OK", "page", {})]), cache)
+
+    first = await client.fetch("http://a.com")
+    second = await client.fetch("http://a.com")
+
+    assert first.body == "page"
+    assert second.body == "page"
+    assert second.get_header("x-xcrap-cache") == "hit"
+    assert len(client.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_inject_cache_revalidates_stale_entries(tmp_path) -> None:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=0)
+    client = inject_cache(
+        ScriptedClient(
+            [
+                HttpResponse(200, "OK", "v1", {"ETag": '"v1"'}),
+                HttpResponse(304, "Not Modified", "", {}),
+                HttpResponse(200, "OK", "v2", {"ETag": '"v2"'}),
+            ]
+        ),
+        cache,
+    )
+
+    await client.fetch("http://a.com", headers={"X-Test": "1"})
+    revalidated = await client.fetch("http://a.com")
+    changed = await client.fetch("http://a.com")
+
+    assert client.calls[0]["headers"] == {"X-Test": "1"}
+    assert client.calls[1]["headers"] == {"If-None-Match": '"v1"'}
+    assert revalidated.body == "v1"
+    assert revalidated.get_header("x-xcrap-cache") == "revalidated"
+    assert changed.body == "v2"
+    assert cache.get("GET", "http://a.com").response.body == "v2"
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_inject_cache_refreshes_validators_on_not_modified(tmp_path) -> None:
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=0)
+    client = inject_cache(
+        ScriptedClient(
+            [
+                HttpResponse(200, "OK", "v1", {"ETag": '"v1"', "Expires": "Wed, 21 Oct 2015 07:28:00 GMT"}),
+                HttpResponse(304, "Not Modified", "", {"etag": '"v1b"', "Expires": "Thu, 22 Oct 2015 07:28:00 GMT"}),
+                HttpResponse(304, "Not Modified", "", {}),
+            ]
+        ),
+        cache,
+    )
+
+    await client.fetch("http://a.com", headers={"Authorization": "token"})
+    await client.fetch("http://a.com", headers={"Authorization": "token"})
+    revalidated = await client.fetch("http://a.com", headers={"Authorization": "token"})
+
+    assert client.calls[2]["headers"] == {"If-None-Match": '"v1b"', "Authorization": "token"}
+    assert revalidated.body == "v1"
+    assert revalidated.get_header("expires") == "Thu, 22 Oct 2015 07:28:00 GMT"
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_inject_cache_does_not_share_entries_between_users(cache) -> None:
+    client = inject_cache(
+        ScriptedClient([HttpResponse(200, "OK", "alice", {}), HttpResponse(200, "OK", "bob", {})]),
+        cache,
+    )
+
+    alice = await client.fetch("http://a.com", headers={"Cookie": "session=alice"})
+    bob = await client.fetch("http://a.com", headers={"Cookie": "session=bob"})
+    again = await client.fetch("http://a.com", headers={"Cookie": "session=alice"})
+
+    assert (alice.body, bob.body, again.body) == ("alice", "bob", "alice")
+    assert again.get_header("x-xcrap-cache") == "hit"
+    assert len(client.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_inject_cache_skips_uncacheable_requests(cache) -> None:
+    client = inject_cache(
+        ScriptedClient([HttpResponse(200, "OK", "created", {}), HttpResponse(500, "Error", "boom", {})]),
+        cache,
+    )
+
+    await client.fetch("http://a.com", method="POST")
+    failed = await client.fetch("http://a.com")
+
+    assert failed.status == 500
+    assert cache.get("POST", "http://a.com") is None
+    assert cache.get("GET", "http://a.com") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_client_decorator(cache) -> None:
+    @cache_client(cache)
+    class CachedClient(ScriptedClient):
+        pass
+
+    client = CachedClient([HttpResponse(200, "OK", "page", {})])
+
+    await client.fetch("http://a.com")
+    results = await client.fetch_many([{"url": "http://a.com"}])
+
+    assert results[0].get_header("x-xcrap-cache") == "hit"
+    assert len(client.calls) == 1
@@ -0,0 +1,72 @@
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from xcrap.core.retry_policy import RetryPolicy
+
+
+def test_retry_policy_retryable_statuses() -> None:
+    policy = RetryPolicy()
+
+    assert policy.is_retryable_status(503) is True
+    assert policy.is_retryable_status(429) is True
+    assert policy.is_retryable_status(404) is False
+    assert policy.is_retryable_status(400) is False
+
+
+def test_retry_policy_retryable_exceptions() -> None:
+    policy = RetryPolicy(retry_exceptions=(ConnectionError, TimeoutError))
+
+    assert policy.is_retryable_exception(ConnectionResetError()) is True
+    assert policy.is_retryable_exception(ValueError()) is False
+
+
+def test_retry_policy_exponential_backoff_is_capped() -> None:
+    policy = RetryPolicy(backoff=100, backoff_factor=2, max_backoff=300, jitter=0)
+
+    assert [policy.get_delay(n) for n in range(1, 5)] == [0.1, 0.2, 0.3, 0.3]
+
+
+def test_retry_policy_jitter_stays_within_bounds() -> None:
+    policy = RetryPolicy(backoff=1000, jitter=0.5)
+
+    for _ in range(50):
+        assert 0.5 <= policy.get_delay(1) <= 1.0
+
+
+def test_retry_policy_retry_after_seconds() -> None:
+    policy = RetryPolicy(backoff=100, jitter=0)
+
+    assert policy.get_delay(1, status=429, retry_after="7") == 7.0
+    assert policy.get_delay(1, status=500, retry_after="7") == 0.1
+    assert policy.get_delay(1, status=503, retry_after="soon") == 0.1
+    assert RetryPolicy(respect_retry_after=False).get_delay(1, status=429, retry_after="7") == 0
+
+
+def test_retry_policy_gives_up_on_long_retry_after() -> None:
+    started_at = time.monotonic()
+    policy = RetryPolicy(max_retry_after=60_000)
+
+    assert policy.get_delay(1, status=429, retry_after="60") == 60.0
+    assert policy.get_delay(1, status=429, retry_after="86400") == math.inf
+    assert policy.within_deadline(started_at, policy.get_delay(1, status=429, retry_after="86400")) is False
+    assert RetryPolicy().get_delay(1, status=503, retry_after="86400") == math.inf
+    assert RetryPolicy(max_retry_after=None).get_delay(1, status=503, retry_after="86400") == 86400.0
+
+
+def test_retry_policy_retry_after_http_date() -> None:
+    policy = RetryPolicy()
+    retry_at = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+
+    assert policy.get_delay(1, status=503, retry_after=retry_at) == pytest.approx(30, abs=2)
+
+
+def test_retry_policy_deadline() -> None:
+    started_at = time.monotonic()
+
+    assert RetryPolicy().within_deadline(started_at, 1000) is True
+    assert RetryPolicy(deadline=1000).within_deadline(started_at, 0.1) is True
+    assert RetryPolicy(deadline=1000).within_deadline(started_at, 2) is False
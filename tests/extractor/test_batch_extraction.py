@@ -0,0 +1,108 @@
+import json
+import multiprocessing
+import pickle
+
+from xcrap.extractor import (
+    HtmlBaseField,
+    HtmlExtractionModel,
+    HtmlNestedField,
+    HtmlParser,
+    JsonBaseField,
+    JsonExtractionModel,
+    JsonParser,
+    css,
+    jmes_path,
+)
+from xcrap.factory import create_extraction_model
+
+
+class ItemModel(HtmlExtractionModel):
+    name = HtmlBaseField(query=css("span::text"))
+    price = HtmlBaseField(query=css("b::text"), extractor=lambda selector: float(selector.get()))
+
+
+class PageModel(HtmlExtractionModel):
+    title = HtmlBaseField(query=css("h1::text"))
+    items = HtmlNestedField(query=css("li"), model=ItemModel, multiple=True)
+
+
+class ProjectModel(JsonExtractionModel):
+    name = JsonBaseField(query=jmes_path("title"))
+
+
+def upper():
+    return lambda selector: selector.get().upper()
+
+
+def make_page(index: int) -> str:
+    return f"<h1>Page {index}</h1><ul><li><span>a{index}</span><b>{index}.5</b></li><li><span>b{index}</span><b>1</b></li></ul>"
+
+
+pages = [make_page(index) for index in range(12)]
+
+factory_config = {
+    "type": "html",
+    "model": {
+        "title": {"query": css("h1::text"), "extractor": "upper"},
+        "names": {"query": css("li span::text"), "multiple": True},
+    },
+}
+
+
+def test_extract_many_matches_extract() -> None:
+    model = PageModel.get_instance()
+
+    assert model.extract_many(pages, workers=2) == [model.extract(page) for page in pages]
+
+
+def test_extract_many_in_process() -> None:
+    assert PageModel().extract_many(pages[:2], workers=1) == [PageModel().extract(page) for page in pages[:2]]
+
+
+def test_extract_many_keeps_order_with_chunks() -> None:
+    results = PageModel.get_instance().extract_many(iter(pages), workers=3, chunksize=4)
+
+    assert [result["title"] for result in results] == [f"Page {index}" for index in range(12)]
+
+
+def test_factory_model_is_shipped_as_config() -> None:
+    model = create_extraction_model(factory_config, {"html": HtmlExtractionModel, "json": JsonExtractionModel}, {"upper": upper})
+    builder, args = model.get_recipe()
+
+    assert builder is create_extraction_model
+    assert args == (factory_config, {"html": HtmlExtractionModel}, {"upper": upper}, ":")
+
+    # spawn pickles everything sent to the workers, which fails for lambdas.
+    results = model.extract_many(pages[:3], workers=2, mp_context=multiprocessing.get_context("spawn"))
+
+    assert results == [{"title": f"PAGE {index}", "names": [f"a{index}", f"b{index}"]} for index in range(3)]
+
+
+def test_recipe_of_shared_instance_is_its_class() -> None:
+    builder, args = PageModel.get_instance().get_recipe()
+
+    assert builder(*args) is PageModel.get_instance()
+
+
+def test_other_instances_are_pickled_without_compiled_plans() -> None:
+    model = HtmlExtractionModel(shape={"title": HtmlBaseField(query=css("h1::text"))})
+    model.extract(pages[0])
+
+    copy = pickle.loads(pickle.dumps(model))
+
+    assert copy._plans == {}
+    assert copy.extract(pages[1]) == {"title": "Page 1"}
+
+
+def test_html_parser_extract_many() -> None:
+    results = HtmlParser.extract_many(pages[:4], ItemModel, css("li"), multiple=True, workers=2)
+
+    assert results == [HtmlParser(page).extract_models(ItemModel, css("li")) for page in pages[:4]]
+    assert results[0][0] == {"name": "a0", "price": 0.5}
+
+
+def test_json_parser_extract_many() -> None:
+    contents = [json.dumps({"title": f"Project {index}"}).encode() for index in range(3)]
+
+    assert JsonParser.extract_many(contents, ProjectModel, workers=2) == [{"name": f"Project {index}"} for index in range(3)]
+    assert JsonParser.extract_many(contents[:1], ProjectModel, workers=1) == [{"name": "Project 0"}]
@@ -0,0 +1,146 @@
+import asyncio
+import json
+import multiprocessing
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from xcrap.extractor import (
+    ExtractionExecutor,
+    HtmlBaseField,
+    HtmlExtractionModel,
+    HtmlParser,
+    JsonBaseField,
+    JsonExtractionModel,
+    JsonParser,
+    css,
+    extraction_executor,
+    get_default_executor,
+    jmes_path,
+    set_default_executor,
+)
+from xcrap.factory import create_extraction_model
+
+
+class ItemModel(HtmlExtractionModel):
+    name = HtmlBaseField(query=css("span::text"))
+    price = HtmlBaseField(query=css("b::text"), extractor=lambda selector: float(selector.get()))
+
+
+class ProjectModel(JsonExtractionModel):
+    name = JsonBaseField(query=jmes_path("title"))
+
+
+html = "<ul><li><span>a</span><b>1.5</b></li><li><span>b</span><b>2</b></li></ul>"
+
+
+async def test_model_extract_async_runs_off_the_event_loop() -> None:
+    loop_thread = threading.get_ident()
+    seen = []
+
+    class ThreadModel(HtmlExtractionModel):
+        name = HtmlBaseField(query=css("span::text"), extractor=lambda selector: seen.append(threading.get_ident()) or selector.get())
+
+    assert await ThreadModel().extract_async(html) == {"name": "a"}
+    assert seen and seen[0] != loop_thread
+
+
+async def test_html_parser_async_matches_sync() -> None:
+    parser = HtmlParser(html)
+
+    assert await parser.extract_models_async(ItemModel, css("li"), limit=1) == [{"name": "a", "price": 1.5}]
+    assert await parser.extract_model_async(ItemModel, css("li")) == parser.extract_model(ItemModel, css("li"))
+
+
+async def test_json_parser_async() -> None:
+    parser = JsonParser(json.dumps({"items": [{"title": "x"}, {"title": "y"}]}))
+
+    assert await parser.extract_models_async(ProjectModel, jmes_path("items")) == [{"name": "x"}, {"name": "y"}]
+
+
+async def test_queue_depth_counts_unfinished_tasks() -> None:
+    release = threading.Event()
+    executor = ExtractionExecutor(ThreadPoolExecutor(max_workers=1))
+
+    tasks = [asyncio.create_task(executor.run(release.wait)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+
+    assert executor.queue_depth == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert executor.queue_depth == 0
+    executor.shutdown()
+
+
+async def test_queue_depth_after_failure() -> None:
+    executor = ExtractionExecutor(max_workers=1)
+
+    with pytest.raises(ValueError):
+        await executor.run(int, "not a number")
+
+    assert executor.queue_depth == 0
+    executor.shutdown()
+
+
+async def test_process_executor() -> None:
+    # spawn sends everything pickled, like any platform without fork.
+    executor = ExtractionExecutor(ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")))
+    model = create_extraction_model(
+        {"type": "html", "model": {"names": {"query": css("span::text"), "multiple": True}}},
+        {"html": HtmlExtractionModel},
+        {},
+    )
+
+    try:
+        assert executor.processes
+        assert await model.extract_async(html, executor) == {"names": ["a", "b"]}
+        assert await HtmlParser(html).extract_models_async(ItemModel, css("li"), executor=executor) == [
+            {"name": "a", "price": 1.5},
+            {"name": "b", "price": 2.0},
+        ]
+        assert await JsonParser('{"title": "x"}').extract_model_async(ProjectModel, executor=executor) == {"name": "x"}
+    finally:
+        executor.shutdown()
+
+
+def test_workers_reuse_rebuilt_models(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(extraction_executor, "_worker_models", OrderedDict())
+    monkeypatch.setattr(extraction_executor, "WORKER_CACHE_SIZE", 2)
+    config = {"type": "html", "model": {"names": {"query": css("span::text"), "multiple": True}}}
+    recipes = [
+        pickle.dumps(create_extraction_model({**config, "index": index}, {"html": HtmlExtractionModel}, {}).get_recipe())
+        for index in range(3)
+    ]
+
+    assert extraction_executor._extract(recipes[0], html) == {"names": ["a", "b"]}
+
+    model = extraction_executor._rebuild(recipes[0])
+
+    assert extraction_executor._rebuild(pickle.dumps(pickle.loads(recipes[0]))) is model
+    assert "html" in model._plans
+    assert extraction_executor._call_parser(HtmlParser(html), "extract_model", recipes[0]) == {"names": ["a", "b"]}
+
+    extraction_executor._rebuild(recipes[1])
+    extraction_executor._rebuild(recipes[2])
+
+    assert len(extraction_executor._worker_models) == 2
+    assert extraction_executor._rebuild(recipes[0]) is not model
+
+
+async def test_default_executor_can_be_replaced() -> None:
+    executor = ExtractionExecutor(max_workers=1)
+    set_default_executor(executor)
+
+    try:
+        assert get_default_executor() is executor
+        assert await ProjectModel().extract_async('{"title": "x"}') == {"name": "x"}
+    finally:
+        set_default_executor(None)
+        executor.shutdown()
+
+    assert get_default_executor() is not executor
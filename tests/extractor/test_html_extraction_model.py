@@ -1,6 +1,8 @@
 from xcrap.extractor import HtmlParser, HtmlExtractionModel, HtmlBaseField, HtmlNestedField
 from xcrap.extractor.query_builders import css, xpath
 import pytest
+from parsel import Selector
+from parsel.csstranslator import HTMLTranslator
 
 parser = HtmlParser("""
 <html>
@@ -253,3 +255,195 @@ def test_html_extraction_model_with_extractors():
     data = parser_with_link.extract_model(MyModel)
     assert data["link"] == "https://xcrap.com"
     assert data["tags"] == ["a"]
+
+
+class CompiledItemModel(HtmlExtractionModel):
+    label = HtmlBaseField(query=css("::text"))
+    markup = HtmlBaseField(query=css("li"), default="none")
+
+
+class CompiledPageModel(HtmlExtractionModel):
+    title = HtmlBaseField(query=css("h1.title::text"))
+    heading = HtmlBaseField(query=css("h1"))
+    items = HtmlBaseField(query=css("li.item::text"), multiple=True, limit=3)
+    item_count = HtmlBaseField(query=xpath("count(//li[@class='item'])"))
+    has_profile = HtmlBaseField(query=xpath("boolean(//section[@id='profile'])"))
+    matches = HtmlBaseField(query=xpath("//span[re:test(@id, '^user')]/text()"))
+    tags = HtmlBaseField(query=css("li.item"), multiple=True, extractor=lambda el: el.root.tag)
+    entries = HtmlNestedField(query=css("ul.list li"), model=CompiledItemModel, multiple=True)
+    skills = HtmlNestedField(query=css("#skills"), model=CompiledItemModel, extractor=lambda el: el.css("ul")[1])
+    missing = HtmlNestedField(query=css(".missing"), model=CompiledItemModel, default={})
+
+
+def test_html_extraction_model_compiled_plan_matches_interpreted_path() -> None:
+    model = CompiledPageModel()
+
+    compiled = model.extract(parser.selector)
+    interpreted = model._interpret(parser.selector)
+
+    assert compiled == interpreted
+    assert compiled["item_count"] == "4.0"
+    assert compiled["has_profile"] == "1"
+    assert compiled["matches"] == "marcuth"
+    assert compiled["heading"] == '<h1 class="title">This is a heading</h1>'
+    assert compiled["entries"][0] == {"label": "Item 1", "markup": '<li class="item">Item 1</li>'}
+    assert compiled["missing"] == {}
+
+
+def test_html_extraction_model_extracts_defaults_from_empty_bytes() -> None:
+    model = CompiledPageModel()
+
+    data = model.extract(b"")
+
+    assert data == model.extract("")
+    assert data["items"] == []
+    assert data["missing"] == {}
+
+
+def test_html_extraction_model_compile_is_cached_per_document_type() -> None:
+    model = CompiledPageModel()
+
+    assert model.compile() is model.compile("html")
+    assert model.compile("xml") is not model.compile()
+    assert model.compile().fields[0][0] == "title"
+
+
+def test_html_extraction_model_compiled_plan_handles_xml_documents() -> None:
+    class FeedModel(HtmlExtractionModel):
+        titles = HtmlBaseField(query=css("Item > Title::text"), multiple=True)
+        first = HtmlBaseField(query=css("Item"))
+
+    selector = Selector(text="<Feed><Item><Title>A</Title></Item><Item><Title>B</Title></Item></Feed>", type="xml")
+    model = FeedModel()
+
+    assert model.extract(selector) == model._interpret(selector)
+    assert model.extract(selector)["titles"] == ["A", "B"]
+
+
+shared_prefix_html = """
+<div class="product" id="p1">
+  <h2 class="title">First</h2><span class="price">10</span><img src="/1.png">
+  <div class="product" id="p2"><h2 class="title">Inner</h2><span class="price">20</span></div>
+  <em>Note</em>
+</div>
+<span class="price">99</span>
+"""
+
+
+class SharedPrefixModel(HtmlExtractionModel):
+    titles = HtmlBaseField(query=css(".product .title::text"), multiple=True)
+    prices = HtmlBaseField(query=css(".product .price::text"), multiple=True)
+    image = HtmlBaseField(query=css(".product img::attr(src)"))
+    texts = HtmlBaseField(query=css(".product > *::text"), multiple=True)
+    after_title = HtmlBaseField(query=css(".product .title + span::text"), multiple=True)
+    notes = HtmlBaseField(query=css(".product ~ em::text"))
+    products = HtmlNestedField(query=css(".product"), model=CompiledItemModel, multiple=True)
+    ids = HtmlBaseField(query=css(".product::attr(id)"), multiple=True)
+    headings = HtmlBaseField(query=css(".product h2::text, span::text"), multiple=True)
+
+
+def test_html_extraction_model_shares_common_query_prefixes() -> None:
+    model = SharedPrefixModel()
+    selector = Selector(text=shared_prefix_html)
+
+    assert model.extract(selector) == model._interpret(selector)
+    assert model.extract(selector)["prices"] == ["10", "20"]
+
+    plan = model.compile()
+    product = HTMLTranslator().css_to_xpath(".product")
+
+    assert [prefix for prefix, _ in plan.prefixes] == [product]
+    assert ("css", ".product h2::text, span::text") not in plan._shared_prefixes
+
+
+def test_html_extraction_model_shares_prefixes_inside_nested_models() -> None:
+    class RowModel(HtmlExtractionModel):
+        name = HtmlBaseField(query=css("td.info a::text"))
+        link = HtmlBaseField(query=css("td.info a::attr(href)"))
+
+    class TableModel(HtmlExtractionModel):
+        rows = HtmlNestedField(query=css("tr"), model=RowModel, multiple=True)
+
+    selector = Selector(
+        text="<table><tr><td class='info'><a href='/a'>A</a></td></tr><tr><td class='info'><a href='/b'>B</a></td></tr></table>"
+    )
+
+    assert TableModel().extract(selector) == {"rows": [{"name": "A", "link": "/a"}, {"name": "B", "link": "/b"}]}
+    assert len(RowModel().compile().prefixes) == 1
+
+
+def test_html_extraction_model_falls_back_for_non_markup_selectors() -> None:
+    class TextModel(HtmlExtractionModel):
+        value = HtmlBaseField(query=xpath("."), default="missing")
+
+    assert TextModel().extract(Selector(root="plain", type="html")) == {"value": "plain"}
+
+    with pytest.raises(ValueError):
+        TextModel().extract('{"a": 1}')
+
+
+def test_html_extraction_model_compile_reports_invalid_xpath() -> None:
+    class BrokenModel(HtmlExtractionModel):
+        value = HtmlBaseField(query=xpath("//*["))
+
+    with pytest.raises(ValueError):
+        BrokenModel().compile()
+
+
+def test_html_extraction_model_compiles_self_referencing_models() -> None:
+    node = HtmlExtractionModel(shape={"name": HtmlBaseField(query=xpath("./span/text()"))})
+    node.shape["children"] = HtmlNestedField(query=xpath("./ul/li"), model=node, multiple=True)
+    tree = HtmlExtractionModel(shape={"items": HtmlNestedField(query=css("body > ul > li"), model=node, multiple=True)})
+    content = "<html><body><ul><li><span>a</span><ul><li><span>b</span></li></ul></li></ul></body></html>"
+
+    expected = {"items": [{"name": "a", "children": [{"name": "b", "children": []}]}]}
+
+    assert tree.extract(content) == expected
+    assert tree._interpret(Selector(text=content)) == expected
+
+
+def test_html_extraction_model_discards_plans_referring_to_a_broken_plan() -> None:
+    first = HtmlExtractionModel(shape={"value": HtmlBaseField(query=xpath("//*["))})
+    second = HtmlExtractionModel(shape={"first": HtmlNestedField(model=first)})
+    first.shape["second"] = HtmlNestedField(model=second)
+
+    with pytest.raises(ValueError):
+        first.compile()
+
+    assert first._plans == {}
+    assert second._plans == {}
+
+
+def test_html_extraction_model_reuses_nested_model_instances() -> None:
+    created = []
+
+    class CountedItemModel(HtmlExtractionModel):
+        name = HtmlBaseField(query=css("::text"))
+
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    class ListModel(HtmlExtractionModel):
+        items = HtmlNestedField(query=css("ul.list li.item"), model=CountedItemModel, multiple=True)
+
+    first = parser.extract_model(ListModel)
+    second = parser.extract_models(CountedItemModel, css("ul.list li.item"))
+
+    assert [item["name"] for item in first["items"]] == ["Item 1", "Item 2", "Item 3", "Item 4"]
+    assert second == first["items"]
+    assert len(created) == 1
+    assert ListModel()._interpret(parser.selector) == first
+    assert len(created) == 1
+
+
+def test_extraction_model_shared_instance_is_per_class() -> None:
+    class ParentModel(HtmlExtractionModel):
+        title = HtmlBaseField(query=css("h1::text"))
+
+    class ChildModel(ParentModel):
+        pass
+
+    assert ParentModel.get_instance() is ParentModel.get_instance()
+    assert type(ChildModel.get_instance()) is ChildModel
+    assert parser.extract_model(ParentModel.get_instance()) == {"title": "This is a heading"}
@@ -1,5 +1,15 @@
+import os
+import pickle
+
+import pytest
+
 from xcrap.extractor import HtmlParser, HtmlExtractionModel, HtmlBaseField
 from xcrap.extractor.query_builders import css, xpath
+from xcrap.extractor.source_parser import map_file
+
+
+class PageTitleModel(HtmlExtractionModel):
+    title = HtmlBaseField(query=css("h1::text"))
 
 
 def test_html_parser_extract_value() -> None:
@@ -48,3 +58,107 @@ def test_html_parser_xpath() -> None:
     parser = HtmlParser(html)
 
     assert parser.extract_value(xpath("//h1[@class='title']/text()")) == "Hello World"
+
+
+def test_html_parser_from_bytes() -> None:
+    parser = HtmlParser.from_bytes("<h1>Olá</h1>".encode("cp1252"), "cp1252")
+    assert parser.extract_value(css("h1::text")) == "Olá"
+
+
+def test_html_parser_load_file_parses_the_memory_map(tmp_path) -> None:
+    class PageModel(HtmlExtractionModel):
+        title = HtmlBaseField(query=css("h1::text"))
+        items = HtmlBaseField(query=css("li::text"), multiple=True)
+
+    content = "  <html><body><h1>Título</h1><ul><li>a</li><li>b</li></ul></body></html>\n"
+    path = tmp_path / "page.html"
+    path.write_text(content, encoding="utf-8")
+
+    parser = HtmlParser.load_file(str(path))
+
+    assert "selector" in parser.__dict__
+    assert parser.source is None
+    assert parser.extract_model(PageModel) == HtmlParser(content).extract_model(PageModel) == {"title": "Título", "items": ["a", "b"]}
+    assert parser.selector.root.getroottree().docinfo.encoding == "UTF-8"
+    assert pickle.loads(pickle.dumps(parser)).extract_value(css("h1::text")) == "Título"
+
+
+def test_html_parser_load_file_falls_back_to_parsel(tmp_path) -> None:
+    cases = {
+        "nul.html": (b"<p>a\x00b</p>", "utf-8", "ab"),
+        "latin.html": ("<p>olá</p>".encode("latin-1"), "latin-1", "olá"),
+        "invalid.html": (b"<p>ol\xe1</p>", "utf-8", "ol�"),
+    }
+
+    for name, (content, encoding, expected) in cases.items():
+        path = tmp_path / name
+        path.write_bytes(content)
+
+        assert HtmlParser.load_file(str(path), encoding).extract_value(css("p::text")) == expected
+
+
+def test_html_parser_load_files(tmp_path) -> None:
+    paths = []
+
+    for index in range(6):
+        path = tmp_path / f"{index}.html"
+        path.write_text(f"<h1>Page {index}</h1>")
+        paths.append(str(path))
+
+    parsers = HtmlParser.load_files(paths, workers=3)
+
+    assert all("selector" in parser.__dict__ for parser in parsers)
+    assert [parser.extract_value(css("h1::text")) for parser in parsers] == [f"Page {index}" for index in range(6)]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd to count open descriptors")
+def test_html_parser_load_files_does_not_hold_file_descriptors(tmp_path) -> None:
+    paths = []
+
+    for index in range(200):
+        path = tmp_path / f"{index}.html"
+        path.write_text(f"<h1>Page {index}</h1>")
+        paths.append(str(path))
+
+    before = len(os.listdir("/proc/self/fd"))
+    parsers = HtmlParser.load_files(paths, workers=4) + [HtmlParser.load_file(paths[0])]
+
+    assert len(os.listdir("/proc/self/fd")) < before + 10
+    assert all(parser.source is None for parser in parsers)
+    assert parsers[-1].iter_models(PageTitleModel, "h1").__next__() == {"title": "Page 0"}
+
+
+def test_html_parser_close_releases_the_memory_map(tmp_path) -> None:
+    path = tmp_path / "page.html"
+    path.write_text("<h1>Title</h1>")
+    mapped = map_file(str(path))
+    parser = HtmlParser.from_bytes(mapped)
+
+    parser.close()
+
+    assert mapped.closed
+    assert parser.extract_value(css("h1::text")) == "Title"
+
+
+def test_html_parser_load_file_reads_the_file_again_for_the_other_engine(tmp_path) -> None:
+    pytest.importorskip("selectolax")
+
+    path = tmp_path / "page.html"
+    path.write_text("<h1>Title</h1><p>Body</p>")
+
+    parser = HtmlParser.load_file(str(path))
+    parser.engine = "lexbor"
+
+    assert parser.source is None
+    assert parser.extract_value(css("p::text")) == "Body"
+    assert parser.extract_value(xpath("//h1/text()")) == "Title"
+
+
+def test_html_parser_load_file_with_empty_file(tmp_path) -> None:
+    path = tmp_path / "empty.html"
+    path.write_bytes(b"")
+
+    parser = HtmlParser.load_file(str(path))
+
+    assert parser.extract_value(css("h1::text"), default="none") == "none"
+    assert parser.extract_model(PageTitleModel) == {"title": None}
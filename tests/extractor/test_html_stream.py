@@ -0,0 +1,91 @@
+import io
+
+from parsel import Selector
+
+from xcrap.extractor import HtmlBaseField, HtmlExtractionModel, HtmlParser, css, xpath
+from xcrap.extractor.html_stream import iter_html_records, iter_source_chunks
+
+
+class ProductModel(HtmlExtractionModel):
+    id = HtmlBaseField(query=css("li::attr(data-id)"))
+    name = HtmlBaseField(query=css("a::text"))
+    tags = HtmlBaseField(query=css("span.tag::text"), multiple=True)
+
+
+def make_listing(count: int) -> str:
+    products = "".join(
+        f'<li class="product" data-id="{i}"><a href="/p/{i}">Product {i}</a><span class="tag">t{i}</span></li><li class="ad">ad</li>'
+        for i in range(count)
+    )
+    return f"<html><body><h1>Catalog</h1><ul class='products'>{products}</ul><footer>end</footer></body></html>"
+
+
+def test_html_parser_iter_models_matches_extract_models() -> None:
+    html = make_listing(50)
+    parser = HtmlParser(html)
+    expected = HtmlParser(html).extract_models(ProductModel, css("li.product"))
+
+    assert list(parser.iter_models(ProductModel, css("li.product"))) == expected
+    assert list(parser.iter_models(ProductModel, css("ul.products > li.product"))) == expected
+    assert list(parser.iter_models(ProductModel, xpath("//li[@class='product']"))) == expected
+    assert len(list(parser.iter_models(ProductModel, "li"))) == 100
+    assert "selector" not in parser.__dict__
+
+
+def test_html_parser_iter_models_limit() -> None:
+    parser = HtmlParser(make_listing(10))
+
+    assert [item["id"] for item in parser.iter_models(ProductModel, css("li.product"), limit=3)] == ["0", "1", "2"]
+    assert list(parser.iter_models(ProductModel, css("li.product"), limit=0)) == []
+
+
+def test_html_parser_iter_file_models(tmp_path) -> None:
+    html = make_listing(5).replace("Product 1<", "Produção 1<")
+    path = tmp_path / "listing.html"
+    path.write_bytes(html.encode("latin-1"))
+
+    from_path = list(HtmlParser.iter_file_models(str(path), ProductModel, css("li.product"), encoding="latin-1"))
+    from_file = list(HtmlParser.iter_file_models(io.BytesIO(html.encode("utf-8")), ProductModel, css("li.product")))
+
+    assert from_path == from_file
+    assert from_path[1]["name"] == "Produção 1"
+
+
+def test_iter_html_records_keeps_the_tree_bounded() -> None:
+    html = make_listing(10_000)
+    largest = 0
+    count = 0
+
+    for element in iter_html_records(iter_source_chunks(html), css("li.product")):
+        largest = max(largest, sum(1 for _ in element.getroottree().iter()))
+        count += 1
+
+    # the tree never holds more than what was parsed from the current chunk
+    assert count == 10_000
+    assert largest < 5_000
+
+
+class SpansModel(HtmlExtractionModel):
+    spans = HtmlBaseField(query=css("span::text"), multiple=True)
+
+
+def test_html_parser_iter_models_with_nested_records() -> None:
+    record = "<div class='r'><span>outer</span><div class='r'><span>inner</span></div><span>after</span></div>"
+    html = f"<html><body>{record}<p>gap</p><div class='r'><span>last</span></div></body></html>"
+    parser = HtmlParser(html)
+    expected = parser.extract_models(SpansModel, css(".r"))
+
+    assert expected[:2] == [{"spans": ["outer", "inner", "after"]}, {"spans": ["inner"]}]
+    assert list(parser.iter_models(SpansModel, css(".r"))) == expected
+    assert list(parser.iter_models(SpansModel, css("body .r"))) == expected
+    assert list(parser.iter_models(SpansModel, "div")) == expected
+
+
+def test_iter_html_records_holds_nested_records_across_chunks() -> None:
+    html = "<div class='r'>" + "<span>x</span>" * 10_000 + "<div class='r'><span>inner</span></div><span>end</span></div>"
+    chunks = (html[start : start + 1024].encode("utf-8") for start in range(0, len(html), 1024))
+
+    records = [SpansModel().extract(Selector(root=element, type="html")) for element in iter_html_records(chunks, "div")]
+
+    assert [len(record["spans"]) for record in records] == [10_002, 1]
+    assert records[1] == {"spans": ["inner"]}
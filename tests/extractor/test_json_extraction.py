@@ -1,6 +1,11 @@
 import json
+import pickle
 
-from xcrap.extractor import JsonBaseField, JsonExtractionModel, JsonNestedField, JsonParser, jmes_path
+import pytest
+
+from xcrap.extractor import JsonBaseField, JsonExtractionModel, JsonNestedField, JsonParser, jmes_path, jmes_path_cache
+from xcrap.extractor.jmes_path_cache import DEFAULT_CACHE_SIZE, compile_jmes_path, set_jmes_path_cache_size
+from xcrap.utils.json_decoder import set_json_backend
 
 json_data = {
     "title": "Main Project",
@@ -151,3 +156,150 @@ def test_json_extraction_model_nested_multiple_with_limit() -> None:
 
     assert len(data["contributors"]) == 1
     assert data["contributors"][0]["name"] == "Alice"
+
+
+def test_json_parser_from_bytes() -> None:
+    assert JsonParser.from_bytes(content.encode("utf-8")).extract_value(jmes_path("title")) == "Main Project"
+    assert JsonParser.from_bytes('{"a": "é"}'.encode("latin-1"), "latin-1").data == {"a": "é"}
+
+
+def test_json_extraction_model_reuses_nested_model_instances() -> None:
+    created = []
+
+    class CountedModel(JsonExtractionModel):
+        name = JsonBaseField(query=jmes_path("name"))
+
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            created.append(self)
+
+    class MyModel(JsonExtractionModel):
+        contributors = JsonNestedField(query=jmes_path("contributors"), model=CountedModel, multiple=True)
+        owner = JsonNestedField(query=jmes_path("owner"), model=CountedModel)
+
+    parser = JsonParser(content)
+    data = parser.extract_model(MyModel)
+
+    assert data["contributors"] == [{"name": "Alice"}, {"name": "Bob"}]
+    assert parser.extract_models(CountedModel, jmes_path("contributors")) == data["contributors"]
+    assert len(created) == 1
+
+
+def test_json_fields_compile_their_query_once() -> None:
+    field = JsonBaseField(query=jmes_path("owner.name"))
+    nested = JsonNestedField(model=JsonExtractionModel)
+
+    assert field.expression is field.expression
+    assert field.expression.search(json_data) == "Marcuth"
+    assert nested.expression is None
+
+    field.query = jmes_path("title")
+
+    assert field.expression.search(json_data) == "Main Project"
+
+    with pytest.raises(ValueError):
+        JsonBaseField(query=jmes_path("owner.["))
+
+
+def test_json_parser_caches_compiled_queries() -> None:
+    parser = JsonParser(content)
+
+    try:
+        set_jmes_path_cache_size(2)
+
+        assert compile_jmes_path("tags") is compile_jmes_path("tags")
+
+        for query in ("title", "tags", "owner.name", "owner.name"):
+            parser.extract_value(jmes_path(query))
+
+        info = jmes_path_cache._compile.cache_info()
+
+        assert (info.maxsize, info.currsize, info.hits) == (2, 2, 3)
+    finally:
+        set_jmes_path_cache_size(DEFAULT_CACHE_SIZE)
+
+
+def test_json_parser_decodes_lazily() -> None:
+    parser = JsonParser("{invalid")
+
+    with pytest.raises(ValueError):
+        parser.extract_value(jmes_path("title"))
+
+
+def test_json_parser_iter_models() -> None:
+    pytest.importorskip("ijson")
+
+    class ContributorModel(JsonExtractionModel):
+        name = JsonBaseField(query=jmes_path("name"))
+        role = JsonBaseField(query=jmes_path("role"), default="none")
+
+    parser = JsonParser(content.encode("utf-8"))
+    expected = [{"name": "Alice", "role": "developer"}, {"name": "Bob", "role": "tester"}]
+
+    assert list(parser.iter_models(ContributorModel, "contributors.item")) == expected
+    assert list(JsonParser(content).iter_models(ContributorModel, "contributors.item", limit=1)) == expected[:1]
+    assert list(parser.iter_models(ContributorModel, "missing.item")) == []
+    assert "data" not in parser.__dict__
+
+
+def test_json_parser_iter_file_models_streams(tmp_path) -> None:
+    pytest.importorskip("ijson")
+
+    class RowModel(JsonExtractionModel):
+        id = JsonBaseField(query=jmes_path("id"))
+        price = JsonBaseField(query=jmes_path("price"))
+
+    path = tmp_path / "dump.json"
+    path.write_text(json.dumps({"rows": [{"id": i, "price": i / 2} for i in range(50_000)]}))
+
+    rows = JsonParser.iter_file_models(str(path), RowModel, "rows.item")
+    assert next(rows) == {"id": 0, "price": 0.0}
+    rows.close()
+
+    with open(path, "rb") as file:
+        rows = JsonParser.iter_file_models(file, RowModel, "rows.item", limit=3)
+
+        assert [row["id"] for row in rows] == [0, 1, 2]
+        assert file.tell() < path.stat().st_size / 10
+
+
+@pytest.mark.parametrize("backend", ["json", None])
+def test_json_parser_load_file_decodes_the_memory_map(tmp_path, backend) -> None:
+    path = tmp_path / "data.json"
+    path.write_text(content, encoding="utf-8")
+
+    set_json_backend(backend)
+
+    try:
+        parser = JsonParser.load_file(str(path))
+
+        assert parser.extract_value(jmes_path("owner.name")) == "Marcuth"
+        assert [parser.data for parser in JsonParser.load_files([str(path)] * 3, workers=2)] == [json_data] * 3
+    finally:
+        set_json_backend(None)
+
+
+def test_json_parser_load_file_reads_the_file_again_when_pickled(tmp_path) -> None:
+    path = tmp_path / "data.json"
+    path.write_bytes('{"name": "olá"}'.encode("latin-1"))
+
+    parser = JsonParser.load_file(str(path), encoding="latin-1")
+
+    assert parser.content is None
+    assert pickle.loads(pickle.dumps(parser)).data == parser.data == {"name": "olá"}
+
+
+def test_json_parser_iter_models_reads_the_memory_map(tmp_path) -> None:
+    pytest.importorskip("ijson")
+
+    class ContributorModel(JsonExtractionModel):
+        name = JsonBaseField(query=jmes_path("name"))
+
+    path = tmp_path / "data.json"
+    path.write_text(content, encoding="utf-8")
+
+    parser = JsonParser.load_file(str(path))
+
+    assert parser.content is None
+    assert list(parser.iter_models(ContributorModel, "contributors.item")) == [{"name": "Alice"}, {"name": "Bob"}]
+    assert list(parser.iter_models(ContributorModel, "contributors.item")) == [{"name": "Alice"}, {"name": "Bob"}]
@@ -0,0 +1,106 @@
+import io
+import json
+import pickle
+
+import pytest
+
+from xcrap.core import HttpResponse
+from xcrap.extractor import JsonBaseField, JsonExtractionModel, JsonLinesParser, jmes_path
+from xcrap.extractor.json_lines_parser import LineBatcher
+from xcrap.utils.json_decoder import set_json_backend
+
+
+class EventModel(JsonExtractionModel):
+    id = JsonBaseField(query=jmes_path("id"))
+    kind = JsonBaseField(query=jmes_path("kind"), default="unknown")
+
+
+records = [{"id": i, "kind": "click" if i % 2 else None, "text": "a b"} for i in range(1_000)]
+content = "\n".join(json.dumps(record, ensure_ascii=False) for record in records) + "\n\n"
+expected = [{"id": i, "kind": "click" if i % 2 else "unknown"} for i in range(1_000)]
+
+
+@pytest.fixture(params=["msgspec", "json"])
+def backend(request):
+    if request.param != "json":
+        pytest.importorskip(request.param)
+
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend(None)
+
+
+def test_line_batcher_splits_on_whole_lines() -> None:
+    batcher = LineBatcher(batch_size=4)
+
+    assert batcher.feed(b'{"a"') is None
+    assert batcher.feed(b':1}\n{"b"') == b'{"a":1}\n'
+    assert batcher.feed(b":2}") is None
+    assert batcher.close() == b'{"b":2}'
+    assert batcher.close() is None
+
+
+def test_json_lines_parser_reads_strings_and_bytes(backend) -> None:
+    parser = JsonLinesParser(content, batch_size=512)
+
+    assert parser.data == records
+    assert list(parser.iter_models(EventModel, limit=2)) == expected[:2]
+    assert JsonLinesParser(content.encode("utf-8"), batch_size=100).extract_models(EventModel) == expected
+
+
+def test_json_lines_parser_queries_all_records() -> None:
+    parser = JsonLinesParser(content)
+
+    assert parser.extract_value(jmes_path("length(@)")) == 1_000
+    assert parser.extract_models(EventModel, jmes_path("[?kind == 'click']"), limit=1) == [{"id": 1, "kind": "click"}]
+    assert parser.extract_model(EventModel, jmes_path("[0]")) == expected[0]
+
+
+def test_json_lines_parser_iter_file_models(tmp_path, backend) -> None:
+    path = tmp_path / "events.jsonl"
+    path.write_text(content, encoding="utf-8")
+
+    assert list(JsonLinesParser.iter_file_models(str(path), EventModel, batch_size=1024)) == expected
+
+    with open(path, "rb") as file:
+        events = JsonLinesParser.iter_file_models(file, EventModel, batch_size=1024)
+
+        assert next(events) == expected[0]
+        assert file.tell() <= 1024
+
+
+def test_json_lines_parser_load_file_drops_the_raw_document(tmp_path) -> None:
+    path = tmp_path / "events.jsonl"
+    path.write_text(content, encoding="utf-8")
+
+    parser = JsonLinesParser.load_file(str(path))
+
+    assert parser.content is None
+    assert parser.data == records
+    assert list(parser.iter_models(EventModel, limit=2)) == expected[:2]
+    assert pickle.loads(pickle.dumps(parser)).extract_models(EventModel) == expected
+
+
+async def test_json_lines_parser_aiter_models(backend) -> None:
+    async def stream():
+        data = io.BytesIO(content.encode("utf-8"))
+
+        while chunk := data.read(777):
+            yield chunk
+
+    assert [event async for event in JsonLinesParser.aiter_models(stream(), EventModel, batch_size=4096)] == expected
+    assert [event async for event in JsonLinesParser.aiter_models(stream(), EventModel, limit=3)] == expected[:3]
+
+
+def test_json_lines_parser_reports_invalid_lines(backend) -> None:
+    with pytest.raises(json.JSONDecodeError):
+        JsonLinesParser('{"id": 1}\n{broken\n').data
+
+
+def test_http_response_as_json_lines_parser() -> None:
+    response = HttpResponse(status=200, status_text="OK", body=b'{"id": 1}\n{"id": 2}\n', headers={})
+
+    assert response.as_parser(JsonLinesParser).extract_models(EventModel) == [
+        {"id": 1, "kind": "unknown"},
+        {"id": 2, "kind": "unknown"},
+    ]
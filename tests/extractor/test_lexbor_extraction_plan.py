@@ -0,0 +1,166 @@
+import pytest
+
+from xcrap.extractor import HtmlBaseField, HtmlExtractionModel, HtmlNestedField, HtmlParser, css, xpath
+
+pytest.importorskip("selectolax")
+
+from xcrap.extractor.lexbor_extraction_plan import LexborExtractionPlan, get_lexbor_query  # noqa: E402
+
+html = """
+<html>
+<body>
+    <div class="listing">
+        <h1 class="title">Catalog</h1>
+        <ul class="products">
+            <li class="product" data-id="1">
+                <a href="/p/1" class="name">First <b>bold</b> product</a>
+                <span class="price">1.99</span>
+                <input type="checkbox" checked>
+            </li>
+            <li class="product" data-id="2">
+                <a href="/p/2" class="name">Second</a>
+                <div class="meta"><span class="tag">new</span><span class="tag">sale</span></div>
+            </li>
+            <li class="product" data-id="3">
+                <a href="/p/3" class="name">Third</a>
+            </li>
+        </ul>
+    </div>
+    <div class="meta"><span class="tag">outside</span></div>
+</body>
+</html>
+"""
+
+
+class TagModel(HtmlExtractionModel):
+    name = HtmlBaseField(query=css("::text"))
+
+
+class ProductModel(HtmlExtractionModel):
+    id = HtmlBaseField(query=css("li::attr(data-id)"))
+    name = HtmlBaseField(query=css("a.name::text"))
+    texts = HtmlBaseField(query=css("a.name *::text"), multiple=True)
+    href = HtmlBaseField(query=css("a::attr(href)"))
+    price = HtmlBaseField(query=css("span.price::text"), default="0")
+    checked = HtmlBaseField(query=css("input::attr(checked)"))
+    listing_tags = HtmlBaseField(query=css("div.listing span.tag::text"), multiple=True)
+    meta_tags = HtmlBaseField(query=css("div.meta > span.tag::text"), multiple=True)
+    tags = HtmlNestedField(query=css("li > div span"), model=TagModel, multiple=True)
+
+
+class PageModel(HtmlExtractionModel):
+    title = HtmlBaseField(query=css("h1.title::text"))
+    all_text = HtmlBaseField(query=css("li.product a::text, li.product b::text"), multiple=True, limit=4)
+    nested_text = HtmlBaseField(query=css("li::text"), multiple=True)
+    products = HtmlNestedField(query=css("ul.products li.product"), model=ProductModel, multiple=True)
+    first = HtmlNestedField(query=css("li.product:nth-child(2)"), model=ProductModel)
+    missing = HtmlNestedField(query=css(".missing"), model=ProductModel, default={})
+
+
+def test_lexbor_plan_matches_parsel() -> None:
+    model = PageModel()
+
+    assert model.compile_lexbor() is not None
+    assert HtmlParser(html, engine="lexbor").extract_model(model) == HtmlParser(html, engine="parsel").extract_model(model)
+
+
+def test_lexbor_plan_keeps_nested_queries_inside_their_context() -> None:
+    data = HtmlParser(html, engine="lexbor").extract_model(PageModel)
+
+    assert data["products"][0]["listing_tags"] == []
+    assert data["products"][1]["meta_tags"] == ["new", "sale"]
+    assert data["products"][1]["tags"] == [{"name": "new"}, {"name": "sale"}]
+    assert data["products"][0]["texts"] == ["First ", "bold", " product"]
+    assert data["products"][0]["checked"] == "checked"
+
+
+def test_lexbor_models_fall_back_to_parsel() -> None:
+    class XPathModel(HtmlExtractionModel):
+        title = HtmlBaseField(query=xpath("//h1/text()"))
+
+    class ExtractorModel(HtmlExtractionModel):
+        title = HtmlBaseField(query=css("h1"), extractor=lambda el: el.attrib["class"])
+
+    class MarkupModel(HtmlExtractionModel):
+        title = HtmlBaseField(query=css("h1"))
+
+    class NestedFallbackModel(HtmlExtractionModel):
+        inner = HtmlNestedField(model=XPathModel)
+
+    parser = HtmlParser(html, engine="lexbor")
+
+    for model in (XPathModel, ExtractorModel, MarkupModel, NestedFallbackModel):
+        assert model.get_instance().compile_lexbor() is None
+
+    assert parser.extract_model(XPathModel) == {"title": "Catalog"}
+    assert parser.extract_model(ExtractorModel) == {"title": "title"}
+    assert parser.extract_model(MarkupModel) == {"title": '<h1 class="title">Catalog</h1>'}
+    assert parser.extract_model(NestedFallbackModel) == {"inner": {"title": "Catalog"}}
+
+
+def test_lexbor_plan_compiles_self_referencing_models() -> None:
+    node = HtmlExtractionModel(shape={"name": HtmlBaseField(query=css("li > span::text"))})
+    node.shape["children"] = HtmlNestedField(query=css("li > ul > li"), model=node, multiple=True)
+    tree = HtmlExtractionModel(shape={"items": HtmlNestedField(query=css("body > ul > li"), model=node, multiple=True)})
+    content = "<html><body><ul><li><span>a</span><ul><li><span>b</span></li></ul></li></ul></body></html>"
+
+    assert tree.compile_lexbor() is not None
+    assert HtmlParser(content, engine="lexbor").extract_model(tree) == {
+        "items": [{"name": "a", "children": [{"name": "b", "children": []}]}]
+    }
+
+
+def test_lexbor_plan_discards_plans_referring_to_an_unsupported_model() -> None:
+    first = HtmlExtractionModel(shape={"title": HtmlBaseField(query=xpath("//h1/text()"))})
+    second = HtmlExtractionModel(shape={"first": HtmlNestedField(query=css("h1"), model=first)})
+    first.shape = {"second": HtmlNestedField(query=css(".missing"), model=second), **first.shape}
+
+    assert first.compile_lexbor() is None
+    assert second.compile_lexbor() is None
+    assert HtmlParser(html, engine="lexbor").extract_model(first)["title"] == "Catalog"
+
+
+def test_lexbor_engine_matches_parsel_on_sibling_combinators() -> None:
+    class SpecModel(HtmlExtractionModel):
+        value = HtmlBaseField(query=css("dt + dd::text"))
+        rest = HtmlBaseField(query=css("dt ~ dd::text"), multiple=True)
+
+    content = "<dl><dt>Color</dt><dd>Red</dd><dt>Size</dt><dd>XL</dd></dl>"
+    expected = HtmlParser(content, engine="parsel").extract_models(SpecModel, css("dt"))
+
+    assert [item["value"] for item in expected] == ["Red", "XL"]
+    assert HtmlParser(content, engine="lexbor").extract_models(SpecModel, css("dt")) == expected
+
+
+def test_html_parser_lexbor_engine_is_lazy() -> None:
+    parser = HtmlParser(html.encode(), engine="lexbor")
+
+    assert parser.extract_value(css("a.name::text")) == "First "
+    assert parser.extract_values(css("li::attr(data-id)"), limit=2) == ["1", "2"]
+    assert parser.extract_models(ProductModel, css("li.product"), limit=1)[0]["name"] == "First "
+    assert "selector" not in parser.__dict__
+
+    assert parser.extract_value(css("h1")) == '<h1 class="title">Catalog</h1>'
+    assert "selector" in parser.__dict__
+
+
+def test_model_engine_selects_lexbor_for_raw_markup() -> None:
+    class LexborPageModel(PageModel):
+        engine = "lexbor"
+
+    expected = PageModel().extract(html)
+
+    assert LexborPageModel().extract(html) == expected
+    assert PageModel(engine="lexbor").extract(html.encode()) == expected
+    assert HtmlParser(html).extract_model(LexborPageModel) == expected
+    assert "selector" not in HtmlParser(html).__dict__
+
+
+def test_lexbor_query_support() -> None:
+    assert get_lexbor_query(xpath("//a")) is None
+    assert get_lexbor_query(css("a::text, a::attr(href)")) is None
+    assert get_lexbor_query(css("li:contains('x')")) is None
+    assert get_lexbor_query(css("dt + dd::text")) is None
+    assert get_lexbor_query(css("h1 ~ ul li::text")) is None
+    assert get_lexbor_query(css("a::attr(href)")).pseudo_element == ("attr", "href")
+    assert isinstance(PageModel().compile_lexbor(), LexborExtractionPlan)
@@ -19,3 +19,26 @@ def test_init_with_file_loading(tmp_path: str) -> None:
     parser = SourceParser.load_file(str(file_path))
 
     assert parser.content == "xpto"
+
+
+def test_load_file_maps_the_file(tmp_path) -> None:
+    file_path = tmp_path / "example.txt"
+    file_path.write_bytes("olá".encode("latin-1"))
+
+    assert SourceParser.load_file(str(file_path), encoding="latin-1").content == "olá"
+
+    empty_path = tmp_path / "empty.txt"
+    empty_path.write_bytes(b"")
+
+    assert SourceParser.load_file(str(empty_path)).content == ""
+
+
+def test_load_files_keeps_the_order_of_paths(tmp_path) -> None:
+    paths = []
+
+    for index in range(8):
+        path = tmp_path / f"{index}.txt"
+        path.write_text(f"file {index}")
+        paths.append(str(path))
+
+    assert [parser.content for parser in SourceParser.load_files(paths, workers=3)] == [f"file {index}" for index in range(8)]
@@ -47,3 +47,11 @@ def test_create_extractor_no_args():
     allowed = {"mock": lambda: lambda el: "extracted"}
     extractor = create_extractor("mock", allowed)
     assert extractor(None) == "extracted"
+
+def test_create_client_with_pool_options():
+    from xcrap.clients import HttpxClient
+
+    client = create_client("httpx", {"httpx": HttpxClient}, {"max_connections": 50, "read_timeout": 30_000})
+
+    assert client.limits.max_connections == 50
+    assert client.timeout.read == 30
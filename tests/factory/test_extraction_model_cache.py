@@ -0,0 +1,132 @@
+import functools
+import os
+
+import pytest
+
+from xcrap.extractor import HtmlExtractionModel, JsonExtractionModel, css, jmes_path
+from xcrap.factory import ExtractionModelCache, create_extraction_model, extraction_model_cache as cache_module
+
+HTML = "<html><body><h1>Title</h1><ul><li><a href='/a'>A</a></li><li><a href='/b'>B</a></li></ul></body></html>"
+
+ALLOWED_MODELS = {"html": HtmlExtractionModel, "json": JsonExtractionModel}
+
+
+def upper(element) -> str:
+    return element.get().upper()
+
+
+def make_upper():
+    return functools.partial(upper)
+
+
+def make_config(title_query: str = "h1::text") -> dict:
+    return {
+        "type": "html",
+        "model": {
+            "title": {"query": css(title_query), "extractor": "upper"},
+            "links": {
+                "query": css("li"),
+                "multiple": True,
+                "nested": {"type": "html", "model": {"href": {"query": css("a::attr(href)")}}},
+            },
+        },
+    }
+
+
+EXPECTED = {"title": "TITLE", "links": [{"href": "/a"}, {"href": "/b"}]}
+
+
+def test_returns_the_same_compiled_model_for_equal_configs() -> None:
+    cache = ExtractionModelCache()
+
+    model = cache.get(make_config(), ALLOWED_MODELS, {"upper": make_upper})
+    again = cache.get(make_config(), ALLOWED_MODELS, {"upper": make_upper, "unused": make_upper})
+
+    assert again is model
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert "html" in model._plans
+    assert model.extract(HTML) == EXPECTED
+
+
+def test_key_ignores_key_order_and_unused_extractors() -> None:
+    cache = ExtractionModelCache()
+    config = {"model": {"price": {"query": jmes_path("price"), "default": 0}}, "type": "json"}
+    reordered = {"type": "json", "model": {"price": {"default": 0, "query": jmes_path("price")}}}
+
+    assert cache.key(config, {"json": JsonExtractionModel}, {}) == cache.key(reordered, ALLOWED_MODELS, {"upper": upper})
+    assert cache.get(config, ALLOWED_MODELS, {}) is cache.get(reordered, ALLOWED_MODELS, {"upper": upper})
+    assert cache.get(config, ALLOWED_MODELS, {}) is not cache.get(make_config(), ALLOWED_MODELS, {"upper": make_upper})
+
+
+def test_evicts_least_recently_used_models() -> None:
+    cache = ExtractionModelCache(max_size=2)
+    first = cache.get(make_config("h1::text"), ALLOWED_MODELS, {"upper": make_upper})
+    second = cache.get(make_config("h2::text"), ALLOWED_MODELS, {"upper": make_upper})
+
+    assert cache.get(make_config("h1::text"), ALLOWED_MODELS, {"upper": make_upper}) is first
+
+    cache.get(make_config("h3::text"), ALLOWED_MODELS, {"upper": make_upper})
+
+    assert len(cache) == 2
+    assert cache.get(make_config("h1::text"), ALLOWED_MODELS, {"upper": make_upper}) is first
+    assert cache.get(make_config("h2::text"), ALLOWED_MODELS, {"upper": make_upper}) is not second
+
+
+def test_colliding_extractor_names_do_not_share_models() -> None:
+    cache = ExtractionModelCache()
+    config = {"type": "html", "model": {"title": {"query": css("h1::text"), "extractor": "fmt"}}}
+
+    lower = cache.get(config, ALLOWED_MODELS, {"fmt": lambda: lambda el: el.get().lower()})
+    swap = cache.get(config, ALLOWED_MODELS, {"fmt": lambda: lambda el: el.get().swapcase()})
+
+    assert lower is not swap
+    assert swap.extract(HTML) == {"title": "tITLE"}
+
+
+def test_persists_models_for_other_caches(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = str(tmp_path / "models")
+    built = ExtractionModelCache(path=path).get(make_config(), ALLOWED_MODELS, {"upper": make_upper})
+
+    assert len(os.listdir(path)) == 1
+
+    def fail(*args):
+        raise AssertionError("the model should be loaded from disk")
+
+    monkeypatch.setattr(cache_module, "create_extraction_model", fail)
+    loaded = ExtractionModelCache(path=path).get(make_config(), ALLOWED_MODELS, {"upper": make_upper})
+
+    assert loaded is not built
+    assert "html" in loaded._plans
+    assert loaded.extract(HTML) == EXPECTED
+
+
+def test_rebuilds_unreadable_files(tmp_path) -> None:
+    cache = ExtractionModelCache(path=str(tmp_path))
+    key = cache.key(make_config(), ALLOWED_MODELS, {"upper": make_upper})
+    (tmp_path / f"{key}.pickle").write_bytes(b"not a pickle")
+
+    assert cache.get(make_config(), ALLOWED_MODELS, {"upper": make_upper}).extract(HTML) == EXPECTED
+
+    reloaded = ExtractionModelCache(path=str(tmp_path)).get(make_config(), ALLOWED_MODELS, {"upper": make_upper})
+
+    assert reloaded.extract(HTML) == EXPECTED
+
+
+def test_keeps_unpicklable_models_in_memory_only(tmp_path) -> None:
+    cache = ExtractionModelCache(path=str(tmp_path))
+    extractors = {"upper": lambda: lambda el: el.get().upper()}
+
+    model = cache.get(make_config(), ALLOWED_MODELS, extractors)
+
+    assert os.listdir(tmp_path) == []
+    assert cache.get(make_config(), ALLOWED_MODELS, extractors) is model
+
+
+def test_create_extraction_model_uses_the_cache() -> None:
+    cache = ExtractionModelCache()
+
+    model = create_extraction_model(make_config(), ALLOWED_MODELS, {"upper": make_upper}, cache=cache)
+
+    assert create_extraction_model(make_config(), ALLOWED_MODELS, {"upper": make_upper}, cache=cache) is model
+    assert create_extraction_model(make_config(), ALLOWED_MODELS, {"upper": make_upper}) is not model
+    assert model.get_recipe()[0] is create_extraction_model
@@ -102,3 +102,15 @@ def test_create_parsing_model_unsupported_type():
     config = {"type": "unknown", "model": {}}
     with pytest.raises(ValueError, match="Unsupported model type"):
         create_extraction_model(config, {}, {})
+
+def test_create_parsing_model_keeps_its_own_copy_of_the_config():
+    config = {"type": "html", "model": {"title": {"query": css("h1::text")}}}
+    model = create_extraction_model(config, {"html": HtmlExtractionModel}, {})
+    builder, args = model.get_recipe()
+
+    config["model"]["title"]["query"] = css("h2::text")
+    config["model"]["extra"] = {"query": css("p::text")}
+
+    assert model.shape["title"].query == css("h1::text")
+    assert list(builder(*args).shape) == ["title"]
+    assert builder(*args).extract("<h1>Title</h1><h2>Other</h2>") == {"title": "Title"}
@@ -0,0 +1,61 @@
+import importlib.util
+import json
+
+import pytest
+
+from xcrap.core import HttpResponse
+from xcrap.extractor import JsonParser
+from xcrap.utils import json_decoder
+from xcrap.utils.json_decoder import AUTO_BACKENDS, get_json_backend, load_json_decoder, loads, set_json_backend
+
+BACKENDS = [
+    pytest.param(backend, marks=pytest.mark.skipif(importlib.util.find_spec(backend) is None, reason=f"{backend} is not installed"))
+    for backend in AUTO_BACKENDS
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    set_json_backend(request.param)
+    yield request.param
+    set_json_backend(None)
+
+
+def test_loads_accepts_str_and_bytes(backend) -> None:
+    document = {"name": "é", "items": [1, 2.5, None, True], "big": 2**70}
+
+    assert loads(json.dumps(document)) == document
+    assert loads(json.dumps(document, ensure_ascii=False).encode("utf-8")) == document
+    assert get_json_backend() == backend
+
+
+def test_loads_falls_back_to_the_standard_library(backend) -> None:
+    assert loads('{"value": NaN}')["value"] != loads('{"value": NaN}')["value"]
+    assert loads('{"a": 1}'.encode("utf-16")) == {"a": 1}
+    assert loads(b"\xef\xbb\xbf[1]") == [1]
+
+    with pytest.raises(json.JSONDecodeError):
+        loads(b"{invalid")
+
+
+def test_parsers_and_responses_use_the_backend(backend) -> None:
+    response = HttpResponse(status=200, status_text="OK", body=b'{"a": [1, 2]}', headers={})
+
+    assert response.json == {"a": [1, 2]}
+    assert JsonParser(b'{"a": [1, 2]}').data == {"a": [1, 2]}
+
+
+def test_auto_backend_is_the_first_installed() -> None:
+    set_json_backend(None)
+
+    expected = next(backend for backend in AUTO_BACKENDS if backend == "json" or importlib.util.find_spec(backend))
+
+    assert get_json_backend() == expected
+    assert loads("[]") == []
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        load_json_decoder("simdjson")
+
+    assert json_decoder.load_json_decoder("json") is json.loads
@@ -0,0 +1,36 @@
+import pytest
+
+import xcrap
+import xcrap.extractor
+from xcrap.extractor.html_parser import HtmlParser
+
+
+def test_lazy_export_resolves_to_the_defining_module() -> None:
+    assert xcrap.extractor.HtmlParser is HtmlParser
+    assert "HtmlParser" in vars(xcrap.extractor)
+
+
+def test_lazy_exports_are_listed() -> None:
+    assert set(xcrap.extractor.__all__) <= set(dir(xcrap.extractor))
+    assert {"clients", "core", "extractor", "factory"} <= set(dir(xcrap))
+
+
+def test_star_import_loads_every_export() -> None:
+    namespace: dict = {}
+    exec("from xcrap.core import *", namespace)
+
+    assert {"HttpResponse", "RetryPolicy", "inject_decryptor"} <= set(namespace)
+
+
+def test_unknown_attribute_raises() -> None:
+    with pytest.raises(AttributeError, match="xcrap.extractor"):
+        xcrap.extractor.Missing
+
+    with pytest.raises(AttributeError):
+        xcrap.missing
+
+
+def test_submodules_stay_importable() -> None:
+    from xcrap.extractor import jmes_path_cache
+
+    assert callable(jmes_path_cache.compile_jmes_path)
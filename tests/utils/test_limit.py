@@ -0,0 +1,30 @@
+import itertools
+
+from xcrap.utils.limit import alimit_items, limit_items
+
+
+def test_limit_items_stops_at_the_limit() -> None:
+    counter = itertools.count()
+
+    assert list(limit_items(counter, 3)) == [0, 1, 2]
+    assert next(counter) == 3
+
+
+def test_limit_items_without_limit_or_below_one() -> None:
+    assert list(limit_items([1, 2, 3], None)) == [1, 2, 3]
+    assert list(limit_items(itertools.count(), 0)) == []
+    assert list(limit_items(itertools.count(), -1)) == []
+
+
+async def test_alimit_items_stops_at_the_limit() -> None:
+    read = []
+
+    async def items():
+        for item in range(10):
+            read.append(item)
+            yield item
+
+    assert [item async for item in alimit_items(items(), 3)] == [0, 1, 2]
+    assert read == [0, 1, 2]
+    assert [item async for item in alimit_items(items(), None)] == list(range(10))
+    assert [item async for item in alimit_items(items(), 0)] == []
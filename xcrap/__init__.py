@@ -1,6 +1,22 @@
 __author__ = "Marcuth <contact@marcuth.dev>"
 __version__ = "0.0.1"
 
-from . import clients, core, extractor, factory
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import clients, core, extractor, factory
 
 __all__ = ["clients", "core", "extractor", "factory"]
+
+
+def __getattr__(name: str) -> Any:
+    # Subpackages are imported on first use, so `import xcrap` does not load httpx, lxml, pydantic, etc.
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
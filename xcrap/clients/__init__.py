@@ -1,3 +1,10 @@
-from .httpx import HttpxClient
+from typing import TYPE_CHECKING
+
+from ..utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .httpx import HttpxClient
+
+__getattr__, __dir__ = lazy_exports(__name__, {"HttpxClient": ".httpx"})
 
 __all__ = ["HttpxClient"]
@@ -1,15 +1,12 @@
 import asyncio
 import time
-from typing import Callable, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
 
 import httpx
 
-from ..core import (
-    ExecuteRequestOptions,
-    HttpClientBase,
-    HttpClientFetchOptions,
-    HttpResponse,
-)
+from ..core import FailedAttempt, HttpClientBase, HttpResponse, RateLimiter, RetryPolicy
 
 
 class HttpxClient(HttpClientBase):
@@ -18,9 +15,106 @@ class HttpxClient(HttpClientBase):
         proxy_url: Optional[str | Callable[[], str]] = None,
         proxy: Optional[str | Callable[[], str]] = None,
         user_agent: Optional[str | Callable[[], str]] = None,
+        host_concurrency: Optional[int] = None,
+        host_delay: Optional[int] = None,
+        proxy_concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[int] = 5000,
+        http2: bool = False,
+        timeout: Optional[int] = 5000,
+        connect_timeout: Optional[int] = None,
+        read_timeout: Optional[int] = None,
+        proxy_idle_timeout: Optional[int] = 60_000,
+        coalesce_requests: bool = False,
+        coalesce_ttl: Optional[int] = None,
     ) -> None:
-        super().__init__(proxy_url, proxy, user_agent)
-        self.httpx_client = httpx.AsyncClient()
+        """
+        Pool and timeout options map to `httpx.Limits` and `httpx.Timeout`; durations are in milliseconds
+        and `None` disables the limit. `http2=True` requires the `h2` package (`pip install httpx[http2]`).
+
+        Requests routed through `proxy` use one pooled `httpx.AsyncClient` per proxy endpoint, so rotating
+        proxies keep their own keep-alive connections. Pools left idle for `proxy_idle_timeout` are closed.
+        """
+        super().__init__(
+            proxy_url,
+            proxy,
+            user_agent,
+            host_concurrency,
+            host_delay,
+            proxy_concurrency,
+            rate_limiter,
+            retry_policy,
+            coalesce_requests,
+            coalesce_ttl,
+        )
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=_to_seconds(keepalive_expiry),
+        )
+        self.timeout = httpx.Timeout(
+            _to_seconds(timeout),
+            connect=_to_seconds(connect_timeout if connect_timeout is not None else timeout),
+            read=_to_seconds(read_timeout if read_timeout is not None else timeout),
+        )
+        self.http2 = http2
+        self.proxy_idle_timeout = proxy_idle_timeout
+        self.httpx_client = self._create_httpx_client()
+        self._proxy_clients: OrderedDict[str, _ProxyClient] = OrderedDict()
+
+    async def aclose(self) -> None:
+        proxy_clients = list(self._proxy_clients.values())
+        self._proxy_clients.clear()
+
+        for proxy_client in proxy_clients:
+            await proxy_client.client.aclose()
+
+        await self.httpx_client.aclose()
+
+    def _create_httpx_client(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        return httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2, proxy=proxy)
+
+    @asynccontextmanager
+    async def _client_for(self, proxy: Optional[str]) -> AsyncIterator[httpx.AsyncClient]:
+        if not proxy:
+            yield self.httpx_client
+            return
+
+        await self._evict_idle_proxy_clients()
+
+        proxy_client = self._proxy_clients.get(proxy)
+
+        if proxy_client is None:
+            proxy_client = self._proxy_clients[proxy] = _ProxyClient(self._create_httpx_client(proxy))
+
+        proxy_client.in_flight += 1
+
+        try:
+            yield proxy_client.client
+        finally:
+            proxy_client.in_flight -= 1
+            proxy_client.last_used = time.monotonic()
+
+            if self._proxy_clients.get(proxy) is proxy_client:
+                self._proxy_clients.move_to_end(proxy)
+
+    async def _evict_idle_proxy_clients(self) -> None:
+        if self.proxy_idle_timeout is None:
+            return
+
+        expired_before = time.monotonic() - self.proxy_idle_timeout / 1000
+
+        while self._proxy_clients:
+            proxy, proxy_client = next(iter(self._proxy_clients.items()))
+
+            if proxy_client.in_flight or proxy_client.last_used > expired_before:
+                break
+
+            del self._proxy_clients[proxy]
+            await proxy_client.client.aclose()
 
     async def fetch(
         self,
@@ -30,103 +124,99 @@ class HttpxClient(HttpClientBase):
         max_retries: Optional[int] = 0,
         retry_delay: Optional[int] = 0,
         headers: Optional[dict[str, str]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ) -> HttpResponse:
-        max_retries = max_retries or 0
-        retries = retries or 0
-        retry_delay = retry_delay or 0
+        policy = self._resolve_retry_policy(max_retries, retry_delay, retry_policy)
+        current_retry = retries or 0
+        started_at = time.monotonic()
 
-        failed_attempts = []
+        failed_attempts: list[FailedAttempt] = []
         request_headers = {"User-Agent": self._current_user_agent}
         if headers:
             request_headers.update(headers)
 
-        async def attempt_request(current_retry: int) -> HttpResponse:
+        while True:
+            response: Optional[httpx.Response] = None
+
             try:
-                target_url = f"{self._current_proxy_url}{url}" if self._current_proxy_url else url
+                await self._acquire_rate_limit(url)
 
-                response = await self.httpx_client.request(
-                    method=method,
-                    url=target_url,
-                    headers=request_headers,
-                )
+                proxy_url = self._current_proxy_url
+                proxy = self._current_proxy
+                target_url = f"{proxy_url}{url}" if proxy_url else url
 
-                if not self._is_success(response.status_code):
-                    raise httpx.HTTPStatusError(
-                        message=f"Invalid status code: {response.status_code}",
-                        request=response.request,
-                        response=response,
+                async with self._proxy_slot(proxy or proxy_url), self._client_for(proxy) as client:
+                    response = await client.request(
+                        method=method,
+                        url=target_url,
+                        headers=request_headers,
                     )
 
-                return HttpResponse(
-                    status=response.status_code,
-                    status_text=response.reason_phrase,
-                    body=response.text,
-                    headers=dict(response.headers),
-                    attempts=current_retry + 1,
-                    failed_attempts=failed_attempts,
-                )
+                if self._is_success(response.status_code):
+                    return self._build_response(response, current_retry + 1, failed_attempts)
+
+                error_message = f"Invalid status code: {response.status_code}"
+                retryable = policy.is_retryable_status(response.status_code)
 
             except Exception as error:
+                response = None
                 error_message = str(error)
+                retryable = policy.is_retryable_exception(error)
 
-                failed_attempts.append({"error": error_message, "timestamp": int(time.time())})
-
-                if current_retry < max_retries:
-                    if retry_delay and retry_delay > 0:
-                        await asyncio.sleep(retry_delay / 1000)
-
-                    return await attempt_request(current_retry + 1)
-
-                status = 500
-                status_text = "Request Failed"
-                body = error_message
-                headers = {}
+            failed_attempts.append({"error": error_message, "timestamp": int(time.time())})
 
-                if isinstance(error, httpx.HTTPStatusError):
-                    status = error.response.status_code
-                    status_text = error.response.reason_phrase
-                    body = error.response.text
-                    headers = dict(error.response.headers)
-
-                return HttpResponse(
-                    status=status,
-                    status_text=status_text,
-                    body=body,
-                    headers=headers,
-                    attempts=current_retry + 1,
-                    failed_attempts=failed_attempts,
+            if retryable and current_retry < policy.max_retries:
+                delay = policy.get_delay(
+                    len(failed_attempts),
+                    status=response.status_code if response is not None else None,
+                    retry_after=response.headers.get("Retry-After") if response is not None else None,
                 )
 
-        return await attempt_request(retries)
-
-    async def fetch_many(
-        self,
-        requests: list[HttpClientFetchOptions],
-        request_delay: Optional[int],
-        concurrency: Optional[int],
-    ) -> list[HttpResponse]:
-
-        results: list[HttpResponse | None] = [None] * len(requests)
-        executing: list[asyncio.Task] = []
+                if policy.within_deadline(started_at, delay):
+                    if delay > 0:
+                        await asyncio.sleep(delay)
 
-        for i, request in enumerate(requests):
-            execute_options: ExecuteRequestOptions = {
-                "index": i,
-                "request": request,
-                "results": results,
-                "request_delay": request_delay,
-            }
+                    current_retry += 1
+                    continue
 
-            task = asyncio.create_task(self._execute_request(execute_options))
-            executing.append(task)
+            if response is not None:
+                return self._build_response(response, current_retry + 1, failed_attempts)
 
-            if self._should_throttle(executing, concurrency):
-                await self._handle_concurrency(executing)
+            return HttpResponse(
+                status=500,
+                status_text="Request Failed",
+                body=error_message,
+                headers={},
+                attempts=current_retry + 1,
+                failed_attempts=failed_attempts,
+            )
 
-        if executing:
-            await asyncio.gather(*executing)
-
-        return results
+    def _build_response(
+        self,
+        response: httpx.Response,
+        attempts: int,
+        failed_attempts: list[FailedAttempt],
+    ) -> HttpResponse:
+        return HttpResponse(
+            status=response.status_code,
+            status_text=response.reason_phrase,
+            body=response.content,
+            headers=dict(response.headers),
+            attempts=attempts,
+            failed_attempts=failed_attempts,
+            encoding=response.charset_encoding,
+        )
+
+
+class _ProxyClient:
+    def __init__(self, client: httpx.AsyncClient) -> None:
+        self.client = client
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+
+
+def _to_seconds(milliseconds: Optional[int]) -> Optional[float]:
+    return milliseconds / 1000 if milliseconds is not None else None
 
 
 __all__ = ["HttpxClient"]
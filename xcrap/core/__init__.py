@@ -1,15 +1,52 @@
-from .decryptor import decrypt_client, decrypt_response, inject_decryptor
-from .http_client_base import (
-    ExecuteRequestOptions,
-    HttpClientBase,
-    HttpClientFetchOptions,
+from typing import TYPE_CHECKING
+
+from ..utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .decryptor import decrypt_client, decrypt_response, inject_decryptor
+    from .http_client_base import ExecuteRequestOptions, HttpClientBase, HttpClientFetchOptions
+    from .http_response import FailedAttempt, HttpResponse
+    from .rate_limiter import RateLimiter, TokenBucket
+    from .request_scheduler import KeyLimits, RequestScheduler
+    from .response_cache import CachedResponse, ResponseCache, cache_client, inject_cache
+    from .retry_policy import RetryPolicy
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "decrypt_client": ".decryptor",
+        "decrypt_response": ".decryptor",
+        "inject_decryptor": ".decryptor",
+        "HttpClientBase": ".http_client_base",
+        "HttpClientFetchOptions": ".http_client_base",
+        "ExecuteRequestOptions": ".http_client_base",
+        "FailedAttempt": ".http_response",
+        "HttpResponse": ".http_response",
+        "RateLimiter": ".rate_limiter",
+        "TokenBucket": ".rate_limiter",
+        "RequestScheduler": ".request_scheduler",
+        "KeyLimits": ".request_scheduler",
+        "CachedResponse": ".response_cache",
+        "ResponseCache": ".response_cache",
+        "cache_client": ".response_cache",
+        "inject_cache": ".response_cache",
+        "RetryPolicy": ".retry_policy",
+    },
 )
-from .http_response import FailedAttempt, HttpResponse
 
 __all__ = [
     "HttpClientBase",
     "HttpClientFetchOptions",
     "ExecuteRequestOptions",
+    "RequestScheduler",
+    "KeyLimits",
+    "RateLimiter",
+    "TokenBucket",
+    "RetryPolicy",
+    "ResponseCache",
+    "CachedResponse",
+    "inject_cache",
+    "cache_client",
     "HttpResponse",
     "FailedAttempt",
     "inject_decryptor",
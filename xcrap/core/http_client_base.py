@@ -1,10 +1,18 @@
 import asyncio
+import time
+import warnings
 from abc import ABC, abstractmethod
-from typing import Callable, Optional, TypedDict
+from collections import OrderedDict
+from contextlib import aclosing, asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Hashable, Iterable, Optional, TypedDict
+from urllib.parse import urlsplit
 
 from ..utils.constants import DEFAULT_USER_AGENT
 from ..utils.resolve import resolve
 from .http_response import HttpResponse
+from .rate_limiter import RateLimiter
+from .request_scheduler import KeyLimits, RequestScheduler
+from .retry_policy import RetryPolicy
 
 
 class HttpClientFetchOptions(TypedDict):
@@ -14,9 +22,15 @@ class HttpClientFetchOptions(TypedDict):
     max_retries: Optional[int]
     retry_delay: Optional[int]
     headers: Optional[dict[str, str]]
+    retry_policy: Optional[RetryPolicy]
 
 
 class ExecuteRequestOptions(TypedDict):
+    """
+    Deprecated: arguments of the legacy `_execute_request` helper, kept for clients that implement their own
+    `fetch_many`. `HttpClientBase.fetch_many` no longer uses it.
+    """
+
     index: int
     request: HttpClientFetchOptions
     results: list[HttpResponse | None]
@@ -29,10 +43,42 @@ class HttpClientBase(ABC):
         proxy_url: Optional[str | Callable[[], str]] = None,
         proxy: Optional[str | Callable[[], str]] = None,
         user_agent: Optional[str | Callable[[], str]] = None,
+        host_concurrency: Optional[int] = None,
+        host_delay: Optional[int] = None,
+        proxy_concurrency: Optional[int] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        coalesce_requests: bool = False,
+        coalesce_ttl: Optional[int] = None,
     ) -> None:
         self.proxy_url = proxy_url
         self.proxy = proxy
         self.user_agent = user_agent or DEFAULT_USER_AGENT
+        self.host_concurrency = host_concurrency
+        self.host_delay = host_delay
+        self.proxy_concurrency = proxy_concurrency
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.coalesce_requests = coalesce_requests
+        self.coalesce_ttl = coalesce_ttl
+        self._proxy_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._host_limits = KeyLimits(host_concurrency, (host_delay or 0) / 1000)
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self._memoized: OrderedDict[Hashable, tuple[float, HttpResponse]] = OrderedDict()
+
+        if coalesce_requests:
+            self.fetch = self._coalesce_fetch(self.fetch)
+
+    async def __aenter__(self) -> "HttpClientBase":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Releases the resources (such as connection pools) held by the client.
+        """
 
     @abstractmethod
     async def fetch(
@@ -43,17 +89,49 @@ class HttpClientBase(ABC):
         max_retries: Optional[int] = 0,
         retry_delay: Optional[int] = 0,
         headers: Optional[dict[str, str]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ) -> HttpResponse:
         pass
 
-    @abstractmethod
     async def fetch_many(
         self,
         requests: list[HttpClientFetchOptions],
-        request_delay: Optional[int],
-        concurrency: Optional[int],
+        request_delay: Optional[int] = None,
+        concurrency: Optional[int] = None,
     ) -> list[HttpResponse]:
-        pass
+        results: list[HttpResponse | None] = [None] * len(requests)
+
+        async for index, response in self.fetch_iter(requests, request_delay, concurrency):
+            results[index] = response
+
+        return results
+
+    async def fetch_iter(
+        self,
+        requests: Iterable[HttpClientFetchOptions],
+        request_delay: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[tuple[int, HttpResponse]]:
+        """
+        Fetches the given requests and yields `(index, response)` pairs in completion order.
+
+        At most `concurrency` requests are in flight at any time, and `requests` is consumed
+        lazily, so responses can be processed while the rest of the batch is still downloading.
+        The client's `host_concurrency` and `host_delay` (in milliseconds) are enforced per host
+        without stalling requests to other hosts, across all the batches the client runs at once,
+        and `request_delay` (in milliseconds) spaces out the start of every request in the batch.
+        `concurrency=0` runs the requests one at a time.
+        """
+        scheduler = RequestScheduler(concurrency, key=self._request_host, key_limits=self._host_limits)
+
+        batch_limiter = RateLimiter(rate=1000 / request_delay) if request_delay and request_delay > 0 else None
+
+        async def execute(index: int, request: HttpClientFetchOptions) -> HttpResponse:
+            return await self._send_request(request, batch_limiter)
+
+        async with aclosing(scheduler.run(requests, execute)) as results:
+            async for item in results:
+                yield item
 
     @property
     def _current_proxy_url(self) -> str | None:
@@ -67,30 +145,164 @@ class HttpClientBase(ABC):
     def _current_user_agent(self) -> str:
         return resolve(self.user_agent)
 
+    def _coalesce_fetch(self, fetch: Callable[..., Awaitable[HttpResponse]]) -> Callable[..., Awaitable[HttpResponse]]:
+        """
+        Wraps `fetch` so that concurrent identical requests (same method, URL and headers) share a single
+        in-flight request, and successful responses are reused for `coalesce_ttl` milliseconds.
+        """
+
+        async def fetch_wrapper(
+            url: str,
+            method: str = "GET",
+            retries: Optional[int] = 0,
+            max_retries: Optional[int] = 0,
+            retry_delay: Optional[int] = 0,
+            headers: Optional[dict[str, str]] = None,
+            **kwargs,
+        ) -> HttpResponse:
+            key = (method.upper(), url, tuple(sorted((headers or {}).items())))
+            memoized = self._get_memoized(key)
+
+            if memoized is not None:
+                return memoized
+
+            future = self._in_flight.get(key)
+
+            if future is None:
+                future = asyncio.ensure_future(
+                    fetch(
+                        url=url,
+                        method=method,
+                        retries=retries,
+                        max_retries=max_retries,
+                        retry_delay=retry_delay,
+                        headers=headers,
+                        **kwargs,
+                    )
+                )
+                self._in_flight[key] = future
+                future.add_done_callback(lambda done: self._settle_in_flight(key, done))
+
+            return await asyncio.shield(future)
+
+        return fetch_wrapper
+
+    def _settle_in_flight(self, key: Hashable, future: asyncio.Future) -> None:
+        del self._in_flight[key]
+
+        if future.cancelled() or future.exception() is not None or not self.coalesce_ttl:
+            return
+
+        response = future.result()
+
+        if response.is_success():
+            self._memoized[key] = (time.monotonic() + self.coalesce_ttl / 1000, response)
+            self._memoized.move_to_end(key)
+
+    def _get_memoized(self, key: Hashable) -> Optional[HttpResponse]:
+        now = time.monotonic()
+
+        while self._memoized:
+            oldest_key, (expires_at, _) = next(iter(self._memoized.items()))
+
+            if expires_at > now:
+                break
+
+            del self._memoized[oldest_key]
+
+        memoized = self._memoized.get(key)
+        return memoized[1] if memoized else None
+
+    @asynccontextmanager
+    async def _proxy_slot(self, proxy: Optional[str]) -> AsyncIterator[None]:
+        if not self.proxy_concurrency or not proxy:
+            yield
+            return
+
+        semaphore = self._proxy_semaphores.get(proxy)
+
+        if semaphore is None:
+            semaphore = self._proxy_semaphores[proxy] = asyncio.Semaphore(self.proxy_concurrency)
+
+        async with semaphore:
+            yield
+
+    async def _acquire_rate_limit(self, url: str) -> None:
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(self._url_host(url))
+
+    def _resolve_retry_policy(
+        self,
+        max_retries: Optional[int],
+        retry_delay: Optional[int],
+        retry_policy: Optional[RetryPolicy],
+    ) -> RetryPolicy:
+        policy = retry_policy or self.retry_policy
+        overrides = {}
+
+        if max_retries:
+            overrides["max_retries"] = max_retries
+
+        if retry_delay:
+            overrides["backoff"] = retry_delay
+
+        return policy.model_copy(update=overrides) if overrides else policy
+
+    def _request_host(self, request: HttpClientFetchOptions) -> str:
+        return self._url_host(request["url"])
+
+    def _url_host(self, url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    async def _send_request(
+        self,
+        request: HttpClientFetchOptions,
+        rate_limiter: Optional[RateLimiter],
+    ) -> HttpResponse:
+        if rate_limiter:
+            await rate_limiter.acquire()
+
+        return await self.fetch(**request)
+
+    # Deprecated helpers of the task-list `fetch_many` clients used to implement themselves. They behave as they
+    # did, but `fetch_many`/`fetch_iter` (through `RequestScheduler`) should be used instead.
+
     def _should_throttle(self, executing: list[asyncio.Task], concurrency: Optional[int]) -> bool:
+        _warn_deprecated("_should_throttle")
         return concurrency is not None and len(executing) >= concurrency
 
     def _clean_completed_tasks(self, executing: list[asyncio.Task]) -> None:
+        _warn_deprecated("_clean_completed_tasks")
         executing[:] = [task for task in executing if not task.done()]
 
     async def _handle_concurrency(self, executing: list[asyncio.Task]) -> None:
+        _warn_deprecated("_handle_concurrency")
+
         if not executing:
             return
 
         await asyncio.wait(executing, return_when=asyncio.FIRST_COMPLETED)
 
-        self._clean_completed_tasks(executing)
+        executing[:] = [task for task in executing if not task.done()]
 
     async def _execute_request(self, options: ExecuteRequestOptions) -> None:
+        _warn_deprecated("_execute_request")
+
         index = options["index"]
-        request = options["request"]
-        results = options["results"]
         request_delay = options.get("request_delay")
 
         if request_delay and request_delay > 0 and index > 0:
             await asyncio.sleep(request_delay / 1000)
 
-        results[index] = await self.fetch(**request)
+        options["results"][index] = await self.fetch(**options["request"])
 
     def _is_success(self, status_code: int) -> bool:
         return status_code >= 200 and status_code < 300
+
+
+def _warn_deprecated(name: str) -> None:
+    warnings.warn(
+        f"HttpClientBase.{name} is deprecated; use HttpClientBase.fetch_many or fetch_iter instead",
+        DeprecationWarning,
+        stacklevel=3,
+    )
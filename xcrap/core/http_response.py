@@ -1,10 +1,15 @@
-import json
-from typing import Optional, TypedDict, TypeVar
+import codecs
+from typing import TYPE_CHECKING, Any, Optional, TypedDict, TypeVar
 
-from ..extractor.html_parser import HtmlParser
-from ..extractor.source_parser import SourceParser
+from ..utils.json_decoder import loads
 
-SourceParserType = TypeVar("SourceParserType", bound=SourceParser)
+if TYPE_CHECKING:
+    from ..extractor.html_parser import HtmlParser
+    from ..extractor.source_parser import SourceParser
+
+SourceParserType = TypeVar("SourceParserType", bound="SourceParser")
+
+_UNSET = object()
 
 
 class FailedAttempt(TypedDict):
@@ -13,41 +18,141 @@ class FailedAttempt(TypedDict):
 
 
 class HttpResponse:
+    """
+    HTTP response whose body may be given as raw `bytes` or as `str`.
+
+    Raw bodies are kept as-is together with their `encoding` (taken from the `Content-Type` charset
+    when not given) and only decoded when `body`/`text` is first read; parsers receive the bytes directly.
+
+    The `headers` dict is stored without copying and only lowercased on first access. Parsed JSON and
+    parser objects are built once and shared by later calls, so they should be treated as read-only.
+    """
+
+    __slots__ = (
+        "status",
+        "status_text",
+        "attempts",
+        "failed_attempts",
+        "encoding",
+        "_raw_headers",
+        "_headers",
+        "_text",
+        "_content",
+        "_json",
+        "_parsers",
+    )
+
     def __init__(
         self,
         status: int,
         status_text: str,
-        body: str,
+        body: str | bytes,
         headers: dict[str, str],
         attempts: Optional[int] = None,
         failed_attempts: Optional[list[FailedAttempt]] = None,
+        encoding: Optional[str] = None,
     ) -> None:
         self.status = status
         self.status_text = status_text
-        self.body = body
-        self.headers = {k.lower(): v for k, v in headers.items()}
         self.attempts = attempts
         self.failed_attempts = failed_attempts
+        self._raw_headers = headers
+        self._headers: Optional[dict[str, str]] = None
+        self._json: Any = _UNSET
+        self._parsers: dict[type["SourceParser"], "SourceParser"] = {}
+
+        if isinstance(body, str):
+            self._text: Optional[str] = body
+            self._content: Optional[bytes] = None
+            self.encoding = encoding or "utf-8"
+        else:
+            self._text = None
+            self._content = body
+            self.encoding = encoding or self._declared_encoding() or "utf-8"
 
     def is_success(self) -> bool:
         return 200 <= self.status < 300
 
+    @property
+    def headers(self) -> dict[str, str]:
+        if self._headers is None:
+            self._headers = {name.lower(): value for name, value in self._raw_headers.items()}
+
+        return self._headers
+
     def get_header(self, name: str) -> Optional[str]:
+        if self._headers is None:
+            value = self._raw_headers.get(name)
+
+            if value is not None:
+                return value
+
         return self.headers.get(name.lower())
 
+    @property
+    def content(self) -> bytes:
+        if self._content is None:
+            self._content = self._text.encode(self.encoding)
+
+        return self._content
+
+    @property
+    def body(self) -> str:
+        if self._text is None:
+            self._text = self._content.decode(self.encoding, errors="replace")
+
+        return self._text
+
     @property
     def text(self) -> str:
         return self.body
 
     @property
-    def json(self) -> dict:
-        return json.loads(self.body)
+    def json(self) -> Any:
+        if self._json is _UNSET:
+            if self._text is None and codecs.lookup(self.encoding).name == "utf-8":
+                self._json = loads(self._content)
+            else:
+                self._json = loads(self.body)
+
+        return self._json
 
     def as_parser(self, parser: type[SourceParserType]) -> SourceParserType:
-        return parser(self.body)
+        instance = self._parsers.get(parser)
+
+        if instance is None:
+            if self._text is None:
+                instance = parser.from_bytes(self._content, self.encoding)
+            else:
+                instance = parser(self._text)
+
+            self._parsers[parser] = instance
+
+        return instance
+
+    def as_html_parser(self) -> "HtmlParser":
+        from ..extractor.html_parser import HtmlParser
+
+        return self.as_parser(HtmlParser)
+
+    def _declared_encoding(self) -> Optional[str]:
+        content_type = self.get_header("content-type")
+
+        if not content_type:
+            return None
+
+        for parameter in content_type.split(";")[1:]:
+            name, _, value = parameter.partition("=")
+
+            if name.strip().lower() == "charset" and value:
+                encoding = value.strip().strip("\"'")
+
+                try:
+                    return codecs.lookup(encoding).name
+                except LookupError:
+                    return None
 
-    def as_html_parser(self) -> HtmlParser:
-        return HtmlParser(self.body)
+        return None
 
 
 __all__ = [
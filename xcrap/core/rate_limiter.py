@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket that refills `rate` tokens per second and holds at most `burst` tokens.
+
+    Tokens are reserved ahead of time (each caller is handed its own start time), so concurrent
+    callers are spread out evenly instead of all waking up at once.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+
+        if burst < 1:
+            raise ValueError("Burst must be at least one")
+
+        self.rate = rate
+        self.burst = burst
+        self._interval = 1 / rate
+        self._tolerance = (burst - 1) * self._interval
+        self._next_free: Optional[float] = None
+
+    def available_at(self, now: float) -> float:
+        if self._next_free is None:
+            return now
+
+        return max(now, self._next_free - self._tolerance)
+
+    def consume(self, at: float) -> None:
+        if self._next_free is None or self._next_free < at:
+            self._next_free = at
+
+        self._next_free += self._interval
+
+
+class RateLimiter:
+    """
+    Limits how often requests may start, globally and/or per host.
+
+    Rates are given in requests per second; `burst` is how many requests may start back to back
+    after an idle period.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 1,
+        host_rate: Optional[float] = None,
+        host_burst: int = 1,
+    ) -> None:
+        self.global_bucket = TokenBucket(rate, burst) if rate else None
+        self.host_rate = host_rate
+        self.host_burst = host_burst
+        self.host_buckets: dict[str, TokenBucket] = {}
+
+    def reserve(self, host: Optional[str] = None) -> float:
+        """
+        Reserves a start slot and returns how many seconds the caller has to wait for it.
+        """
+        now = time.monotonic()
+        buckets = [bucket for bucket in (self.global_bucket, self._host_bucket(host)) if bucket]
+
+        if not buckets:
+            return 0
+
+        start = max(bucket.available_at(now) for bucket in buckets)
+
+        for bucket in buckets:
+            bucket.consume(start)
+
+        return start - now
+
+    async def acquire(self, host: Optional[str] = None) -> None:
+        delay = self.reserve(host)
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _host_bucket(self, host: Optional[str]) -> Optional[TokenBucket]:
+        if not self.host_rate or not host:
+            return None
+
+        bucket = self.host_buckets.get(host)
+
+        if bucket is None:
+            bucket = self.host_buckets[host] = TokenBucket(self.host_rate, self.host_burst)
+
+        return bucket
+
+
+__all__ = ["RateLimiter", "TokenBucket"]
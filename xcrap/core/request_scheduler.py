@@ -0,0 +1,309 @@
+import asyncio
+import math
+from collections import defaultdict, deque
+from typing import AsyncIterator, Awaitable, Callable, Generic, Hashable, Iterable, Iterator, Optional, TypeVar
+
+JobType = TypeVar("JobType")
+ResultType = TypeVar("ResultType")
+
+# Number of start times `KeyLimits` keeps before dropping the ones already past.
+_PRUNE_SIZE = 1024
+
+
+class _WorkerFailure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class _DispatchDone:
+    def __init__(self, dispatched: int) -> None:
+        self.dispatched = dispatched
+
+
+class KeyLimits:
+    """
+    Caps the jobs in flight per key at `concurrency` and starts them at least `interval` seconds apart.
+
+    The counts live here rather than in a single `RequestScheduler.run`, so every run given the same instance
+    shares them: a client passes its own to all of its batches, and concurrent batches to one host stay within
+    the host's limits together.
+    """
+
+    def __init__(self, concurrency: Optional[int] = None, interval: float = 0) -> None:
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("Key concurrency must be greater than zero")
+
+        self.concurrency = concurrency
+        self.interval = interval
+        self._active: defaultdict[Hashable, int] = defaultdict(int)
+        self._next_start: dict[Hashable, float] = {}
+        self._prune_at = _PRUNE_SIZE
+        self._waiters: set[asyncio.Event] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.concurrency or self.interval)
+
+    def wait_time(self, key: Hashable, now: float) -> float:
+        """
+        Returns the seconds until a job for `key` may start (`math.inf` while the key is at its cap).
+        """
+        if self.concurrency is not None and self._active.get(key, 0) >= self.concurrency:
+            return math.inf
+
+        return max(self._next_start.get(key, now) - now, 0)
+
+    def start(self, key: Hashable, now: float) -> None:
+        self._active[key] += 1
+
+        if self.interval:
+            self._next_start[key] = now + self.interval
+
+            # Start times of keys seen long ago would otherwise pile up on long-lived instances.
+            if len(self._next_start) >= self._prune_at:
+                self._next_start = {key: start for key, start in self._next_start.items() if start > now}
+                self._prune_at = max(_PRUNE_SIZE, len(self._next_start) * 2)
+
+    def subscribe(self, waiter: asyncio.Event) -> None:
+        """
+        Sets `waiter` every time a job is released, until `unsubscribe` is called.
+        """
+        self._waiters.add(waiter)
+
+    def unsubscribe(self, waiter: asyncio.Event) -> None:
+        self._waiters.discard(waiter)
+
+    def release(self, key: Hashable) -> None:
+        self._active[key] -= 1
+
+        if not self._active[key]:
+            del self._active[key]
+
+        for waiter in self._waiters:
+            waiter.set()
+
+
+class _JobBoard(Generic[JobType]):
+    """
+    Hands out jobs whose key is under its concurrency cap and past its minimum spacing.
+
+    Jobs whose key is busy are parked in a per-key queue (up to `lookahead` jobs in total)
+    so that jobs for other keys can keep flowing instead of waiting behind them.
+    """
+
+    def __init__(
+        self,
+        jobs: Iterator[tuple[int, JobType]],
+        key: Optional[Callable[[JobType], Hashable]],
+        limits: KeyLimits,
+        lookahead: int,
+    ) -> None:
+        self._jobs = jobs
+        self._key = key
+        self._limits = limits
+        self._lookahead = lookahead
+        self._exhausted = False
+        self._parked: dict[Hashable, deque[tuple[int, JobType]]] = {}
+        self._parked_count = 0
+        self._changed = asyncio.Event()
+
+    def open(self) -> None:
+        self._limits.subscribe(self._changed)
+
+    def close(self) -> None:
+        self._limits.unsubscribe(self._changed)
+
+    def take(self) -> tuple[int, JobType, Hashable] | float | None:
+        """
+        Returns a runnable `(index, job, key)`, the seconds to wait before trying again, or `None` when
+        every job has been handed out.
+        """
+        if self._key is None:
+            item = next(self._jobs, None)
+            return None if item is None else (*item, None)
+
+        now = asyncio.get_running_loop().time()
+        delay = math.inf
+
+        for key, parked in self._parked.items():
+            wait = self._limits.wait_time(key, now)
+
+            if wait == 0:
+                item = parked.popleft()
+                self._parked_count -= 1
+
+                if not parked:
+                    del self._parked[key]
+
+                return self._start(item, key, now)
+
+            delay = min(delay, wait)
+
+        while not self._exhausted and self._parked_count < self._lookahead:
+            item = next(self._jobs, None)
+
+            if item is None:
+                self._exhausted = True
+                break
+
+            key = self._key(item[1])
+            wait = self._limits.wait_time(key, now)
+
+            if wait == 0:
+                return self._start(item, key, now)
+
+            self._parked.setdefault(key, deque()).append(item)
+            self._parked_count += 1
+            delay = min(delay, wait)
+
+        if self._exhausted and not self._parked:
+            return None
+
+        return delay
+
+    def release(self, key: Hashable) -> None:
+        if self._key is not None:
+            self._limits.release(key)
+
+    async def wait(self, delay: float) -> None:
+        self._changed.clear()
+
+        if math.isinf(delay):
+            await self._changed.wait()
+            return
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), delay)
+        except TimeoutError:
+            pass
+
+    def _start(self, item: tuple[int, JobType], key: Hashable, now: float) -> tuple[int, JobType, Hashable]:
+        self._limits.start(key, now)
+
+        return (*item, key)
+
+
+class RequestScheduler(Generic[JobType, ResultType]):
+    """
+    Dispatches jobs to a worker coroutine and yields `(index, result)` pairs as they complete.
+
+    A single dispatcher hands jobs out under a global semaphore, so scheduling a job costs O(1)
+    regardless of how many jobs are in flight. When `key` is given, jobs sharing a key (usually a host)
+    are additionally capped at `key_concurrency` in flight and started at least `key_interval` seconds apart,
+    without holding back jobs for other keys. Pass `key_limits` instead to share those limits with other
+    schedulers (see `KeyLimits`).
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        key: Optional[Callable[[JobType], Hashable]] = None,
+        key_concurrency: Optional[int] = None,
+        key_interval: float = 0,
+        lookahead: int = 1000,
+        key_limits: Optional[KeyLimits] = None,
+    ) -> None:
+        if concurrency is not None and concurrency < 0:
+            raise ValueError("Concurrency cannot be negative")
+
+        # 0 keeps its historical meaning in `fetch_many`: requests run one at a time.
+        self.concurrency = max(concurrency, 1) if concurrency is not None else None
+        self.key_limits = key_limits if key_limits is not None else KeyLimits(key_concurrency, key_interval)
+        self.key = key if self.key_limits else None
+        self.lookahead = lookahead
+
+    async def run(
+        self,
+        jobs: Iterable[JobType],
+        worker: Callable[[int, JobType], Awaitable[ResultType]],
+    ) -> AsyncIterator[tuple[int, ResultType]]:
+        board = _JobBoard(enumerate(jobs), self.key, self.key_limits, self.lookahead)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency or 0)
+        slots = asyncio.Semaphore(self.concurrency) if self.concurrency else None
+        running: set[asyncio.Task] = set()
+        board.open()
+        dispatcher = asyncio.create_task(self._dispatch(board, worker, queue, slots, running))
+
+        try:
+            dispatched = None
+            received = 0
+
+            while dispatched is None or received < dispatched:
+                item = await queue.get()
+
+                if isinstance(item, _DispatchDone):
+                    dispatched = item.dispatched
+                elif isinstance(item, _WorkerFailure):
+                    raise item.error
+                else:
+                    received += 1
+                    yield item
+        finally:
+            board.close()
+            dispatcher.cancel()
+
+            for task in list(running):
+                task.cancel()
+
+    async def _dispatch(
+        self,
+        board: _JobBoard[JobType],
+        worker: Callable[[int, JobType], Awaitable[ResultType]],
+        queue: asyncio.Queue,
+        slots: Optional[asyncio.Semaphore],
+        running: set[asyncio.Task],
+    ) -> None:
+        dispatched = 0
+
+        try:
+            while True:
+                if slots:
+                    await slots.acquire()
+
+                item = board.take()
+
+                while isinstance(item, float):
+                    await board.wait(item)
+                    item = board.take()
+
+                if item is None:
+                    break
+
+                task = asyncio.create_task(self._execute(item, board, worker, queue, slots))
+                running.add(task)
+                task.add_done_callback(running.discard)
+                dispatched += 1
+        except asyncio.CancelledError:
+            raise
+        except BaseException as error:
+            await queue.put(_WorkerFailure(error))
+            return
+
+        await queue.put(_DispatchDone(dispatched))
+
+    async def _execute(
+        self,
+        item: tuple[int, JobType, Hashable],
+        board: _JobBoard[JobType],
+        worker: Callable[[int, JobType], Awaitable[ResultType]],
+        queue: asyncio.Queue,
+        slots: Optional[asyncio.Semaphore],
+    ) -> None:
+        index, job, key = item
+
+        try:
+            try:
+                result = await worker(index, job)
+            finally:
+                board.release(key)
+
+            await queue.put((index, result))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as error:
+            await queue.put(_WorkerFailure(error))
+        finally:
+            if slots:
+                slots.release()
+
+
+__all__ = ["RequestScheduler", "KeyLimits"]
@@ -0,0 +1,335 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable, Mapping, NamedTuple, Optional, Type, TypeVar
+
+from .http_client_base import HttpClientBase
+from .http_response import HttpResponse
+
+T = TypeVar("T", bound=HttpClientBase)
+
+# Request headers that always take part in the key, so responses for different users or formats never mix.
+KEY_HEADERS = ("authorization", "cookie", "proxy-authorization", "accept", "accept-language", "accept-encoding")
+
+# Response headers a `304 Not Modified` refreshes on the stored entry.
+REVALIDATED_HEADERS = ("etag", "last-modified", "expires", "cache-control", "date")
+
+
+class CachedResponse(NamedTuple):
+    response: HttpResponse
+    stored_at: float
+    fresh: bool
+
+    @property
+    def validators(self) -> dict[str, str]:
+        headers = {}
+
+        if etag := self.response.get_header("etag"):
+            headers["If-None-Match"] = etag
+
+        if last_modified := self.response.get_header("last-modified"):
+            headers["If-Modified-Since"] = last_modified
+
+        return headers
+
+
+class ResponseCache:
+    """
+    SQLite-backed store of successful responses, keyed by method, URL and the `key_headers` of the request.
+
+    Entries younger than `ttl` (milliseconds, forever when `None`) are served without touching the network;
+    older ones are revalidated with `If-None-Match`/`If-Modified-Since` when they carry validators and dropped
+    otherwise. When the stored bodies exceed `max_size` bytes, the least recently used entries are evicted.
+
+    Responses marked `Cache-Control: no-store` or `private`, or `Vary: *`, are not stored; `no-cache` ones are
+    always revalidated. An entry is only served to requests that send the same values for the headers named in
+    its `Vary`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[int] = None,
+        max_size: Optional[int] = None,
+        methods: tuple[str, ...] = ("GET",),
+        key_headers: tuple[str, ...] = KEY_HEADERS,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.methods = {method.upper() for method in methods}
+        self.key_headers = tuple(sorted({name.lower() for name in key_headers}))
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                status INTEGER NOT NULL,
+                status_text TEXT NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                encoding TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                vary TEXT NOT NULL DEFAULT '{}'
+            )
+            """
+        )
+
+        if "vary" not in {row[1] for row in self._connection.execute("PRAGMA table_info(responses)")}:
+            self._connection.execute("ALTER TABLE responses ADD COLUMN vary TEXT NOT NULL DEFAULT '{}'")
+
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._connection.commit()
+        self._size = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def is_cacheable(self, method: str) -> bool:
+        return method.upper() in self.methods
+
+    def get(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None) -> Optional[CachedResponse]:
+        key = self._key(method, url, headers)
+        now = time.time()
+
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status, status_text, headers, body, encoding, stored_at, vary FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            status, status_text, response_headers, body, encoding, stored_at, vary = row
+            vary = json.loads(vary)
+
+            if _select_headers(headers, vary) != vary:
+                return None
+
+            response = HttpResponse(
+                status=status,
+                status_text=status_text,
+                body=body,
+                headers=json.loads(response_headers),
+                encoding=encoding,
+            )
+            fresh = self.ttl is None or (now - stored_at) * 1000 < self.ttl
+            entry = CachedResponse(
+                response=response,
+                stored_at=stored_at,
+                fresh=fresh and "no-cache" not in _cache_control(response),
+            )
+
+            if not entry.fresh and not entry.validators:
+                self._delete(key)
+                self._connection.commit()
+                return None
+
+            self._connection.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+
+        return entry
+
+    def is_storable(self, response: HttpResponse) -> bool:
+        vary = response.get_header("vary") or ""
+
+        return not {"no-store", "private"} & _cache_control(response) and vary.strip() != "*"
+
+    def set(self, method: str, url: str, response: HttpResponse, headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Stores `response` to the request made with `headers`, unless its headers forbid it (see `is_storable`).
+        """
+        if not self.is_storable(response):
+            return
+
+        key = self._key(method, url, headers)
+        vary = [name.strip().lower() for name in (response.get_header("vary") or "").split(",") if name.strip()]
+        body = response.content
+        size = len(body)
+        now = time.time()
+
+        with self._lock:
+            self._delete(key)
+            self._connection.execute(
+                "INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    response.status,
+                    response.status_text,
+                    json.dumps(response.headers),
+                    body,
+                    response.encoding,
+                    size,
+                    now,
+                    now,
+                    json.dumps(_select_headers(headers, vary)),
+                ),
+            )
+            self._size += size
+            self._evict()
+            self._connection.commit()
+
+    def touch(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        revalidation: Optional[HttpResponse] = None,
+    ) -> None:
+        """
+        Marks an entry as freshly validated (after a `304 Not Modified`), taking the new validators and expiry
+        (`ETag`, `Last-Modified`, `Expires`, ...) from the `revalidation` response when given.
+        """
+        key = self._key(method, url, headers)
+        now = time.time()
+
+        with self._lock:
+            if revalidation is not None:
+                updates = {name: revalidation.get_header(name) for name in REVALIDATED_HEADERS}
+                updates = {name: value for name, value in updates.items() if value is not None}
+                row = self._connection.execute("SELECT headers FROM responses WHERE key = ?", (key,)).fetchone()
+
+                if row is not None and updates:
+                    stored = {name: value for name, value in json.loads(row[0]).items() if name.lower() not in updates}
+                    self._connection.execute(
+                        "UPDATE responses SET headers = ? WHERE key = ?",
+                        (json.dumps({**stored, **updates}), key),
+                    )
+
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+            self._connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _delete(self, key: str) -> None:
+        row = self._connection.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+
+        if row is not None:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= row[0]
+
+    def _evict(self) -> None:
+        if self.max_size is None:
+            return
+
+        while self._size > self.max_size:
+            rows = self._connection.execute("SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64").fetchall()
+
+            if not rows:
+                break
+
+            for key, size in rows:
+                if self._size <= self.max_size:
+                    break
+
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+
+    def _key(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None) -> str:
+        payload = json.dumps([method.upper(), url, _select_headers(headers, self.key_headers)], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def inject_cache(client: T, cache: ResponseCache) -> T:
+    original_fetch = client.fetch
+
+    async def fetch_wrapper(
+        url: str,
+        method: str = "GET",
+        retries: Optional[int] = 0,
+        max_retries: Optional[int] = 0,
+        retry_delay: Optional[int] = 0,
+        headers: Optional[dict[str, str]] = None,
+        **kwargs,
+    ) -> HttpResponse:
+        options = {"retries": retries, "max_retries": max_retries, "retry_delay": retry_delay, **kwargs}
+
+        if not cache.is_cacheable(method):
+            return await original_fetch(url=url, method=method, headers=headers, **options)
+
+        entry = await asyncio.to_thread(cache.get, method, url, headers)
+
+        if entry is not None and entry.fresh:
+            return _mark(entry.response, "hit")
+
+        request_headers = headers
+
+        if entry is not None:
+            request_headers = {**entry.validators, **(headers or {})}
+
+        response = await original_fetch(url=url, method=method, headers=request_headers, **options)
+
+        if entry is not None and response.status == 304:
+            await asyncio.to_thread(cache.touch, method, url, headers, response)
+            return _mark(entry.response, "revalidated")
+
+        if response.is_success():
+            await asyncio.to_thread(cache.set, method, url, response, headers)
+
+        return response
+
+    client.fetch = fetch_wrapper  # type: ignore
+    return client
+
+
+def cache_client(cache: ResponseCache):
+    """
+    Class decorator to inject a response cache into an HttpClient class.
+    """
+
+    def decorator(cls: Type[T]) -> Type[T]:
+        original_init = cls.__init__
+
+        def new_init(self, *args, **kwargs):
+            original_init(self, *args, **kwargs)
+            inject_cache(self, cache)
+
+        cls.__init__ = new_init  # type: ignore
+        return cls
+
+    return decorator
+
+
+def _select_headers(headers: Optional[Mapping[str, str]], names: Iterable[str]) -> dict[str, Optional[str]]:
+    lowered = {name.lower(): value for name, value in (headers or {}).items()}
+    return {name: lowered.get(name) for name in names}
+
+
+def _cache_control(response: HttpResponse) -> set[str]:
+    value = response.get_header("cache-control") or ""
+    return {directive.split("=")[0].strip().lower() for directive in value.split(",") if directive.strip()}
+
+
+def _mark(response: HttpResponse, state: str) -> HttpResponse:
+    return HttpResponse(
+        status=response.status,
+        status_text=response.status_text,
+        body=response.content,
+        headers={**response.headers, "x-xcrap-cache": state},
+        attempts=response.attempts,
+        failed_attempts=response.failed_attempts,
+        encoding=response.encoding,
+    )
+
+
+__all__ = ["ResponseCache", "CachedResponse", "inject_cache", "cache_client"]
@@ -0,0 +1,90 @@
+import math
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class RetryPolicy(BaseModel):
+    """
+    Decides which failed attempts are retried and how long to wait between them.
+
+    Delays are in milliseconds: attempt `n` waits `backoff * backoff_factor ** (n - 1)`, capped at
+    `max_backoff`, with up to `jitter` of it randomized away. `Retry-After` headers on
+    `retry_after_statuses` take precedence; when one asks for more than `max_retry_after`, the request
+    is given up instead of parking the worker. No retry is scheduled past `deadline`.
+    """
+
+    max_retries: int = 0
+    retry_statuses: frozenset[int] = frozenset({408, 425, 429, 500, 502, 503, 504})
+    retry_exceptions: tuple[type[BaseException], ...] = (Exception,)
+    backoff: int = 0
+    backoff_factor: float = 2.0
+    max_backoff: Optional[int] = 30_000
+    jitter: float = 0.5
+    respect_retry_after: bool = True
+    retry_after_statuses: frozenset[int] = frozenset({429, 503})
+    max_retry_after: Optional[int] = 300_000
+    deadline: Optional[int] = None
+
+    model_config = {"arbitrary_types_allowed": True}
+
+    def is_retryable_status(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def is_retryable_exception(self, error: BaseException) -> bool:
+        return isinstance(error, self.retry_exceptions)
+
+    def get_delay(self, failures: int, status: Optional[int] = None, retry_after: Optional[str] = None) -> float:
+        """
+        Returns the number of seconds to wait before the next attempt, after `failures` failed attempts, or
+        `math.inf` when `Retry-After` exceeds `max_retry_after` (`within_deadline` rejects it).
+        """
+        if self.respect_retry_after and retry_after and status in self.retry_after_statuses:
+            delay = self._parse_retry_after(retry_after)
+
+            if delay is not None:
+                if self.max_retry_after is not None and delay * 1000 > self.max_retry_after:
+                    return math.inf
+
+                return delay
+
+        delay = self.backoff * self.backoff_factor ** (failures - 1)
+
+        if self.max_backoff is not None:
+            delay = min(delay, self.max_backoff)
+
+        if self.jitter:
+            delay *= 1 - self.jitter * random.random()
+
+        return delay / 1000
+
+    def within_deadline(self, started_at: float, delay: float) -> bool:
+        """
+        Checks whether an attempt started after waiting `delay` seconds still fits in the deadline.
+        """
+        if math.isinf(delay):
+            return False
+
+        if self.deadline is None:
+            return True
+
+        return time.monotonic() + delay - started_at < self.deadline / 1000
+
+    def _parse_retry_after(self, value: str) -> Optional[float]:
+        value = value.strip()
+
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        return max(retry_at.timestamp() - time.time(), 0)
+
+
+__all__ = ["RetryPolicy"]
@@ -1,9 +1,41 @@
-from .html_extraction_model import HtmlBaseField, HtmlExtractionModel, HtmlNestedField
-from .html_parser import HtmlParser
-from .json_extraction_model import JsonBaseField, JsonExtractionModel, JsonNestedField
-from .json_parser import JsonParser
-from .query_builders import QueryConfig, css, jmes_path, xpath
-from .source_parser import SourceParser
+from typing import TYPE_CHECKING
+
+from ..utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .extraction_executor import ExtractionExecutor, get_default_executor, set_default_executor
+    from .html_extraction_model import HtmlBaseField, HtmlExtractionModel, HtmlNestedField
+    from .html_parser import HtmlParser
+    from .jmes_path_cache import set_jmes_path_cache_size
+    from .json_extraction_model import JsonBaseField, JsonExtractionModel, JsonNestedField
+    from .json_lines_parser import JsonLinesParser
+    from .json_parser import JsonParser
+    from .query_builders import QueryConfig, css, jmes_path, xpath
+    from .source_parser import SourceParser
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "ExtractionExecutor": ".extraction_executor",
+        "get_default_executor": ".extraction_executor",
+        "set_default_executor": ".extraction_executor",
+        "HtmlBaseField": ".html_extraction_model",
+        "HtmlExtractionModel": ".html_extraction_model",
+        "HtmlNestedField": ".html_extraction_model",
+        "HtmlParser": ".html_parser",
+        "set_jmes_path_cache_size": ".jmes_path_cache",
+        "JsonBaseField": ".json_extraction_model",
+        "JsonExtractionModel": ".json_extraction_model",
+        "JsonNestedField": ".json_extraction_model",
+        "JsonLinesParser": ".json_lines_parser",
+        "JsonParser": ".json_parser",
+        "QueryConfig": ".query_builders",
+        "css": ".query_builders",
+        "jmes_path": ".query_builders",
+        "xpath": ".query_builders",
+        "SourceParser": ".source_parser",
+    },
+)
 
 __all__ = [
     "css",
@@ -14,9 +46,14 @@ __all__ = [
     "HtmlBaseField",
     "HtmlNestedField",
     "JsonParser",
+    "JsonLinesParser",
     "JsonExtractionModel",
     "JsonBaseField",
     "JsonNestedField",
     "SourceParser",
+    "ExtractionExecutor",
+    "get_default_executor",
+    "set_default_executor",
+    "set_jmes_path_cache_size",
     "QueryConfig",
 ]
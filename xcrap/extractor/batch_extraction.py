@@ -0,0 +1,114 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Type
+
+from .query_builders import QueryConfig
+
+if TYPE_CHECKING:
+    from .extraction_model import ExtractionModel, ModelRecipe
+    from .source_parser import SourceParser
+
+# Per-process state set up by `_initialize_worker`: the rebuilt model and, for parser batches, how to parse.
+_worker_model: Any = None
+_worker_parser: Optional[Type["SourceParser"]] = None
+_worker_query: Optional[QueryConfig] = None
+_worker_multiple = False
+
+
+def extract_many(
+    model: "ExtractionModel",
+    contents: Iterable[Any],
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    mp_context: Optional[BaseContext] = None,
+) -> list[Any]:
+    """
+    Runs `model.extract` on every item of `contents` across a pool of `workers` processes (one per core when
+    `None`) and returns the results in order. With `workers=1`, everything runs in the current process.
+
+    Workers receive the model's recipe (see `ExtractionModel.get_recipe`) once, when they start, instead of a
+    pickled model per task.
+    """
+    if workers == 1:
+        return [model.extract(content) for content in contents]
+
+    return _run(model, None, None, False, contents, workers, chunksize, mp_context)
+
+
+def parse_many(
+    parser_class: Type["SourceParser"],
+    contents: Iterable[str | bytes],
+    model: "ExtractionModel",
+    query: Optional[QueryConfig] = None,
+    multiple: bool = False,
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    mp_context: Optional[BaseContext] = None,
+) -> list[Any]:
+    """
+    Parses every document of `contents` with `parser_class` and runs `extract_model` (or `extract_models` when
+    `multiple`) on it across a pool of `workers` processes, returning the results in order.
+    """
+    if workers == 1:
+        return [_parse(parser_class, content, model, query, multiple) for content in contents]
+
+    return _run(model, parser_class, query, multiple, contents, workers, chunksize, mp_context)
+
+
+def _run(
+    model: "ExtractionModel",
+    parser_class: Optional[Type["SourceParser"]],
+    query: Optional[QueryConfig],
+    multiple: bool,
+    contents: Iterable[Any],
+    workers: Optional[int],
+    chunksize: int,
+    mp_context: Optional[BaseContext],
+) -> list[Any]:
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_initialize_worker,
+        initargs=(model.get_recipe(), parser_class, query, multiple),
+    ) as executor:
+        return list(executor.map(_work, contents, chunksize=chunksize))
+
+
+def _initialize_worker(
+    recipe: "ModelRecipe",
+    parser_class: Optional[Type["SourceParser"]],
+    query: Optional[QueryConfig],
+    multiple: bool,
+) -> None:
+    global _worker_model, _worker_parser, _worker_query, _worker_multiple
+
+    builder, args = recipe
+    _worker_model = builder(*args)
+    _worker_parser = parser_class
+    _worker_query = query
+    _worker_multiple = multiple
+
+
+def _work(content: Any) -> Any:
+    if _worker_parser is None:
+        return _worker_model.extract(content)
+
+    return _parse(_worker_parser, content, _worker_model, _worker_query, _worker_multiple)
+
+
+def _parse(
+    parser_class: Type["SourceParser"],
+    content: str | bytes,
+    model: "ExtractionModel",
+    query: Optional[QueryConfig],
+    multiple: bool,
+) -> Any:
+    parser = parser_class.from_bytes(content) if isinstance(content, bytes) else parser_class(content)
+
+    if multiple:
+        return parser.extract_models(model, query)
+
+    return parser.extract_model(model, query)
+
+
+__all__ = ["extract_many", "parse_many"]
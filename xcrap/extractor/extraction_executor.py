@@ -0,0 +1,137 @@
+import asyncio
+import hashlib
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from .extraction_model import ExtractionModel
+    from .source_parser import SourceParser
+
+_default_executor: Optional["ExtractionExecutor"] = None
+_default_lock = threading.Lock()
+
+# Models rebuilt in a worker process, by digest of their pickled recipe, so each one is built and compiled once
+# per worker instead of once per task.
+WORKER_CACHE_SIZE = 32
+_worker_models: OrderedDict[bytes, "ExtractionModel"] = OrderedDict()
+
+
+class ExtractionExecutor:
+    """
+    Runs parsing and extraction outside of the event loop, so network I/O keeps flowing during heavy pages.
+
+    Uses a thread pool by default; with `processes=True` (or a `ProcessPoolExecutor`), models are sent to the
+    workers as their recipe (see `ExtractionModel.get_recipe`) and parsers as their source. Each worker keeps the
+    models it rebuilt (up to `WORKER_CACHE_SIZE`), so a model is built and compiled once per worker rather than once
+    per document. `queue_depth` counts the tasks submitted and not finished yet, including the ones running.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, processes: bool = False, max_workers: Optional[int] = None) -> None:
+        if executor is None:
+            if processes:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="xcrap-extraction")
+
+        self.executor = executor
+        self.processes = isinstance(executor, ProcessPoolExecutor)
+        self._queue_depth = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue_depth
+
+    async def run(self, function: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            self._queue_depth += 1
+
+        try:
+            future = self.executor.submit(function, *args)
+        except BaseException:
+            self._task_done(None)
+            raise
+
+        future.add_done_callback(self._task_done)
+
+        return await asyncio.wrap_future(future)
+
+    async def extract(self, model: "ExtractionModel", content: Any) -> Any:
+        if self.processes:
+            return await self.run(_extract, pickle.dumps(model.get_recipe()), content)
+
+        return await self.run(model.extract, content)
+
+    async def call_parser(self, parser: "SourceParser", method: str, model: "ExtractionModel", *args: Any) -> Any:
+        """
+        Runs `parser.<method>(model, *args)`, parsing the document in the executor if it has not been parsed yet.
+        """
+        if self.processes:
+            return await self.run(_call_parser, parser, method, pickle.dumps(model.get_recipe()), *args)
+
+        return await self.run(getattr(parser, method), model, *args)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait)
+
+    def _task_done(self, future: Optional[Future]) -> None:
+        with self._lock:
+            self._queue_depth -= 1
+
+
+def get_default_executor() -> ExtractionExecutor:
+    """
+    Returns the executor used by the `*_async` extraction methods when none is given, creating a thread pool on
+    first use.
+    """
+    global _default_executor
+
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = ExtractionExecutor()
+
+        return _default_executor
+
+
+def set_default_executor(executor: Optional[ExtractionExecutor]) -> None:
+    """
+    Replaces the default executor. The previous one is not shut down; `None` restores a fresh thread pool on next use.
+    """
+    global _default_executor
+
+    with _default_lock:
+        _default_executor = executor
+
+
+def _rebuild(recipe: bytes) -> "ExtractionModel":
+    """
+    Returns the model of a pickled recipe, building it on the first task of this worker that uses it.
+    """
+    key = hashlib.blake2b(recipe, digest_size=16).digest()
+    model = _worker_models.get(key)
+
+    if model is not None:
+        _worker_models.move_to_end(key)
+        return model
+
+    builder, args = pickle.loads(recipe)
+    model = _worker_models[key] = builder(*args)
+
+    while len(_worker_models) > WORKER_CACHE_SIZE:
+        _worker_models.popitem(last=False)
+
+    return model
+
+
+def _extract(recipe: bytes, content: Any) -> Any:
+    return _rebuild(recipe).extract(content)
+
+
+def _call_parser(parser: "SourceParser", method: str, recipe: bytes, *args: Any) -> Any:
+    return getattr(parser, method)(_rebuild(recipe), *args)
+
+
+__all__ = ["ExtractionExecutor", "get_default_executor", "set_default_executor"]
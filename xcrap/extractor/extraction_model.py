@@ -1,10 +1,82 @@
 from abc import ABC, abstractmethod
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, Type, TypeVar, Union
+
+if TYPE_CHECKING:
+    from .extraction_executor import ExtractionExecutor
+
+ExtractionModelType = TypeVar("ExtractionModelType", bound="ExtractionModel")
+
+ModelRecipe = tuple[Callable[..., "ExtractionModel"], tuple]
 
 
 class ExtractionModel(ABC):
     """
     Abstract base class for all extraction models.
     """
+
+    _recipe: Optional[ModelRecipe] = None
+
     @abstractmethod
     def extract(self, content: str) -> any:
         pass
+
+    def extract_many(
+        self,
+        contents: Iterable[Any],
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        mp_context: Optional[BaseContext] = None,
+    ) -> list[Any]:
+        """
+        Extracts every item of `contents` across a pool of `workers` processes (one per core when `None`) and
+        returns the results in order. See `get_recipe` for how the model reaches the workers.
+        """
+        from .batch_extraction import extract_many
+
+        return extract_many(self, contents, workers, chunksize, mp_context)
+
+    async def extract_async(self, content: Any, executor: Optional["ExtractionExecutor"] = None) -> Any:
+        """
+        Runs `extract` in `executor` (the default thread pool when `None`) without blocking the event loop.
+        """
+        from .extraction_executor import get_default_executor
+
+        return await (executor or get_default_executor()).extract(self, content)
+
+    def get_recipe(self) -> ModelRecipe:
+        """
+        Returns a picklable `(builder, args)` pair that rebuilds this model in another process.
+
+        Models made by `create_extraction_model` are rebuilt from their config and the shared instance of a model
+        class from the class itself, so neither pickles its fields (and their extractor lambdas). Any other
+        instance is pickled as is.
+        """
+        if self._recipe is not None:
+            return self._recipe
+
+        if type(self).__dict__.get("_shared_instance") is self:
+            return type(self).get_instance, ()
+
+        return _identity, (self,)
+
+    @classmethod
+    def get_instance(cls: Type[ExtractionModelType]) -> ExtractionModelType:
+        """
+        Returns the instance shared by every place that refers to this model by class, creating it on first use.
+        """
+        instance = cls.__dict__.get("_shared_instance")
+
+        if instance is None:
+            instance = cls()
+            cls._shared_instance = instance
+
+        return instance
+
+
+def resolve_model(model: Union[ExtractionModelType, Type[ExtractionModelType]]) -> ExtractionModelType:
+    return model.get_instance() if isinstance(model, type) else model
+
+
+def _identity(model: ExtractionModelType) -> ExtractionModelType:
+    return model
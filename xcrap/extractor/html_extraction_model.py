@@ -1,10 +1,18 @@
-from typing import Any, Callable, Dict, Optional, Type, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Literal, Optional, Type, Union
+
+import cssselect
+from cssselect.parser import CombinedSelector
+from lxml import etree
 from parsel import Selector
+from parsel.csstranslator import GenericTranslator, HTMLTranslator
 from pydantic import BaseModel
 
-from .extraction_model import ExtractionModel
+from .extraction_model import ExtractionModel, resolve_model
 from .query_builders import QueryConfig
 
+if TYPE_CHECKING:
+    from .lexbor_extraction_plan import LexborExtractionPlan
+
 
 class HtmlBaseField(BaseModel):
     query: QueryConfig
@@ -27,12 +35,318 @@ class HtmlNestedField(BaseModel):
 
 HtmlExtractionField = Union[HtmlBaseField, HtmlNestedField]
 
+HtmlEngine = Literal["parsel", "lexbor"]
+
+
+FieldHandler = Callable[[Any, "Scope"], Any]
+
+# Node sets of the shared query prefixes, evaluated once per `evaluate` call.
+Scope = Dict[str, list]
+
+_UNCOMPILED = object()
+
+_translators = {"html": HTMLTranslator(), "xml": GenericTranslator()}
+
+
+class HtmlExtractionPlan:
+    """
+    A model compiled for one document type: every query is translated and compiled to an `lxml.etree.XPath`
+    once, and every field is bound to a handler that runs it directly on lxml nodes.
+
+    Results match what the interpreted path returns through parsel (`.get()`/`.getall()` serialization,
+    defaults and limits); `Selector` objects are only built for fields that have an `extractor`.
+
+    CSS queries of different fields that start with the same selectors (`.product .price`, `.product img`)
+    share that prefix: it is evaluated once per call and the rest of each query runs from its node set,
+    passed as the `$shared` XPath variable.
+    """
+
+    def __init__(self, model: "HtmlExtractionModel", type_: str) -> None:
+        self.model = model
+        self.type = type_
+        self._method = "xml" if type_ == "xml" else "html"
+        self._shared_prefixes: Dict[tuple[str, str], str] = {}
+        self.prefixes: tuple[tuple[str, Callable[[Any], list]], ...] = ()
+        self.fields: tuple[tuple[str, FieldHandler], ...] = ()
+        # Plans whose nested fields run this one; they are discarded with it if it fails to build.
+        self.referrers: list["HtmlExtractionPlan"] = []
+
+    def build(self) -> None:
+        """
+        Compiles the queries and fields of the model. Kept apart from `__init__` so the model can register the
+        plan first: nested fields that refer back to the model (recursive models) reuse it instead of recursing.
+        """
+        self._shared_prefixes = self._find_shared_prefixes(self.model.shape.values())
+        self.prefixes = tuple(
+            (prefix, etree.XPath(prefix, namespaces=self._namespaces(prefix)))
+            for prefix in sorted(set(self._shared_prefixes.values()))
+        )
+        self.fields = tuple((key, self._compile_field(field)) for key, field in self.model.shape.items())
+
+    def discard(self) -> None:
+        """
+        Unregisters the plan and every plan that refers to it, so they are compiled again on next use.
+        """
+        if self.model._plans.get(self.type) is not self:
+            return
+
+        del self.model._plans[self.type]
+
+        for referrer in self.referrers:
+            referrer.discard()
+
+    def evaluate(self, node: Any) -> Dict[str, Any]:
+        if not hasattr(node, "xpath"):
+            return self.model._interpret(self._wrap(node))
+
+        scope = {prefix: select(node) for prefix, select in self.prefixes}
+
+        return {key: handler(node, scope) for key, handler in self.fields}
+
+    def _compile_field(self, field: HtmlExtractionField) -> FieldHandler:
+        if isinstance(field, HtmlNestedField):
+            return self._compile_nested_field(field)
+
+        return self._compile_base_field(field)
+
+    def _compile_base_field(self, field: HtmlBaseField) -> FieldHandler:
+        select = self._compile_query(field.query)
+        serialize = self._serialize
+        wrap = self._wrap
+        extractor = field.extractor
+        default = field.default
+        limit = field.limit
+
+        if field.multiple:
+            empty = default if default is not None else []
+
+            def extract_all(node: Any, scope: Scope) -> Any:
+                elements = select(node, scope)
+
+                if limit is not None:
+                    elements = elements[:limit]
+
+                if extractor:
+                    results = [extractor(wrap(element)) for element in elements]
+                else:
+                    results = [serialize(element) for element in elements]
+
+                return results if results else empty
+
+            return extract_all
+
+        def extract_first(node: Any, scope: Scope) -> Any:
+            elements = select(node, scope)
+
+            if not elements:
+                return default
+
+            if extractor:
+                return extractor(wrap(elements[0]))
+
+            return serialize(elements[0])
+
+        return extract_first
+
+    def _compile_nested_field(self, field: HtmlNestedField) -> FieldHandler:
+        if field.multiple and field.query is None:
+            raise Exception("Query is required for nested model with multiple values")
+
+        select = self._compile_query(field.query) if field.query else None
+        model = resolve_model(field.model)
+        wrap = self._wrap
+        extractor = field.extractor
+        default = field.default
+        limit = field.limit
+
+        if isinstance(model, HtmlExtractionModel) and type(model).extract is HtmlExtractionModel.extract:
+            plan = model.compile(self.type)
+            plan.referrers.append(self)
+            evaluate = plan.evaluate
+        else:
+
+            def evaluate(node: Any) -> Any:
+                return model.extract(wrap(node))
+
+        if field.multiple:
+            empty = default if default is not None else []
+
+            def extract_all(node: Any, scope: Scope) -> Any:
+                elements = select(node, scope)
+
+                if limit is not None:
+                    elements = elements[:limit]
+
+                results = [evaluate(element) for element in elements]
+
+                return results if results else empty
+
+            return extract_all
+
+        def extract_one(node: Any, scope: Scope) -> Any:
+            if select is None:
+                element = node
+            else:
+                elements = select(node, scope)
+
+                if not elements:
+                    return default
+
+                element = elements[0]
+
+            if extractor:
+                return model.extract(extractor(wrap(element)))
+
+            return evaluate(element)
+
+        return extract_one
+
+    def _compile_query(self, query: QueryConfig) -> Callable[[Any, Scope], list]:
+        expression = query["value"]
+
+        if query["type"] == "css":
+            expression = _translators[self._method].css_to_xpath(expression)
+
+        prefix = self._shared_prefixes.get(self._query_key(query))
+
+        if prefix == expression:
+            return lambda node, scope: scope[prefix]
+
+        if prefix is not None:
+            # The prefix ends on a step boundary, so `$shared` followed by the rest of the path selects the same nodes.
+            expression = "$shared" + expression[len(prefix) :]
+
+        try:
+            compiled = etree.XPath(expression, namespaces=self._namespaces(expression), smart_strings=False)
+        except etree.XPathError as error:
+            raise ValueError(f"XPath error: {error} in {expression}")
+
+        def select(node: Any, scope: Scope) -> list:
+            try:
+                result = compiled(node) if prefix is None else compiled(node, shared=scope[prefix])
+            except etree.XPathError as error:
+                raise ValueError(f"XPath error: {error} in {expression}")
+
+            return result if isinstance(result, list) else [result]
+
+        return select
+
+    def _find_shared_prefixes(self, fields: Iterable[HtmlExtractionField]) -> Dict[tuple[str, str], str]:
+        """
+        Maps each CSS query to the XPath of the longest leading part of it that another query of the model also
+        starts with. Queries without one are left out.
+        """
+        candidates: Dict[tuple[str, str], list[str]] = {}
+
+        for field in fields:
+            query = field.query
+
+            if query is not None and query["type"] == "css":
+                candidates.setdefault(self._query_key(query), self._get_prefixes(query["value"]))
+
+        counts: Dict[str, int] = {}
+
+        for prefixes in candidates.values():
+            for prefix in prefixes:
+                counts[prefix] = counts.get(prefix, 0) + 1
+
+        shared = {}
+
+        for key, prefixes in candidates.items():
+            for prefix in reversed(prefixes):
+                if counts[prefix] > 1:
+                    shared[key] = prefix
+                    break
+
+        return shared
+
+    def _get_prefixes(self, query: str) -> list[str]:
+        """
+        Returns the XPath of every leading compound selector chain of `query` that ends on a step boundary of the
+        query's own XPath, shortest first; a query made of a single compound selector is its own prefix.
+        """
+        translator = _translators[self._method]
+
+        try:
+            groups = cssselect.parse(query)
+            expression = translator.css_to_xpath(query)
+        except cssselect.SelectorError:
+            return []
+
+        if len(groups) != 1:
+            return []
+
+        trees = []
+        tree = groups[0].parsed_tree
+
+        if groups[0].pseudo_element is None:
+            trees.append(tree)
+
+        while isinstance(tree, CombinedSelector):
+            tree = tree.selector
+            trees.append(tree)
+
+        prefixes = []
+
+        for tree in reversed(trees):
+            prefix = f"descendant-or-self::{translator.xpath(tree)}"
+
+            if prefix == expression or expression.startswith(f"{prefix}/"):
+                prefixes.append(prefix)
+
+        return prefixes
+
+    def _query_key(self, query: QueryConfig) -> tuple[str, str]:
+        return query["type"], query["value"]
+
+    def _namespaces(self, expression: str) -> Dict[str, str]:
+        return {prefix: uri for prefix, uri in Selector._default_namespaces.items() if f"{prefix}:" in expression}
+
+    def _serialize(self, node: Any) -> str:
+        if isinstance(node, str):
+            return node
+
+        try:
+            return etree.tostring(node, method=self._method, encoding="unicode", with_tail=False)
+        except (AttributeError, TypeError):
+            if node is True:
+                return "1"
+
+            if node is False:
+                return "0"
+
+            return str(node)
+
+    def _wrap(self, node: Any) -> Selector:
+        return Selector(root=node, type=self._method)
+
 
 class HtmlExtractionModel(ExtractionModel):
+    """
+    Declarative HTML model. `engine` picks the parser used when the model is given raw markup: "parsel" (lxml), or
+    "lexbor" (selectolax), which only applies to models made of `css(...)` queries ending in `::text`/`::attr()`
+    without extractors; any other model falls back to parsel.
+    """
+
     _fields: Dict[str, HtmlExtractionField] = {}
+    engine: HtmlEngine = "parsel"
 
-    def __init__(self, shape: Optional[Dict[str, HtmlExtractionField]] = None) -> None:
+    def __init__(self, shape: Optional[Dict[str, HtmlExtractionField]] = None, engine: Optional[HtmlEngine] = None) -> None:
         self.shape = shape if shape is not None else self._fields
+        self._plans: Dict[str, HtmlExtractionPlan] = {}
+        self._lexbor_plan: Any = _UNCOMPILED
+
+        if engine is not None:
+            self.engine = engine
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Compiled XPath objects cannot be pickled; unpickled copies compile their own plans.
+        return {key: value for key, value in self.__dict__.items() if key not in ("_plans", "_lexbor_plan")}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._plans = {}
+        self._lexbor_plan = _UNCOMPILED
 
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
@@ -53,9 +367,68 @@ class HtmlExtractionModel(ExtractionModel):
 
         cls._fields = combined_fields
 
-    def extract(self, content: str | Selector) -> Dict[str, Any]:
-        root = content if isinstance(content, Selector) else Selector(text=content)
+    def compile(self, type_: str = "html") -> HtmlExtractionPlan:
+        """
+        Returns the compiled plan for `type_` documents ("html" or "xml"), compiling it on first use.
+        Plans capture `shape` as it is when compiled.
+        """
+        plan = self._plans.get(type_)
+
+        if plan is None:
+            plan = self._plans[type_] = HtmlExtractionPlan(self, type_)
+
+            try:
+                plan.build()
+            except BaseException:
+                plan.discard()
+                raise
+
+        return plan
+
+    def compile_lexbor(self) -> Optional["LexborExtractionPlan"]:
+        """
+        Returns the plan that runs this model on lexbor nodes, or `None` when the model has to run on parsel.
+        """
+        if self._lexbor_plan is _UNCOMPILED:
+            from .lexbor_extraction_plan import LexborExtractionPlan, UnsupportedQuery
+
+            plan = self._lexbor_plan = LexborExtractionPlan(self)
+
+            try:
+                plan.build()
+            except UnsupportedQuery:
+                plan.discard()
+                self._lexbor_plan = None
+            except BaseException:
+                plan.discard()
+                raise
+
+        return self._lexbor_plan
+
+    def extract(self, content: str | bytes | Selector | Any) -> Dict[str, Any]:
+        if isinstance(content, (str, bytes)) and self.engine == "lexbor" and self.compile_lexbor() is not None:
+            from .lexbor_extraction_plan import parse_lexbor
+
+            return self._lexbor_plan.evaluate(parse_lexbor(content))
+
+        if isinstance(content, Selector):
+            root = content
+        elif isinstance(content, str):
+            root = Selector(text=content)
+        elif isinstance(content, bytes):
+            # parsel rejects an empty body; an empty document extracts the field defaults.
+            root = Selector(body=content) if content else Selector(text="")
+        elif self.compile_lexbor() is not None:
+            return self._lexbor_plan.evaluate(content)
+        else:
+            root = Selector(text=content.html)
+
+        if root.type in ("html", "xml") and root.namespaces == Selector._default_namespaces:
+            return self.compile(root.type).evaluate(root.root)
 
+        return self._interpret(root)
+
+    def _interpret(self, root: Selector) -> Dict[str, Any]:
         data: Dict[str, Any] = {}
 
         for key, value in self.shape.items():
@@ -94,10 +467,7 @@ class HtmlExtractionModel(ExtractionModel):
     def _extract_nested_value(self, value: HtmlNestedField, root: Selector) -> Any:
         elements = self._select_elements(value.query, root) if value.query else [root]
 
-        model = value.model
-
-        if isinstance(model, type):
-            model = model()
+        model = resolve_model(value.model)
 
         if value.multiple:
             if value.query is None:
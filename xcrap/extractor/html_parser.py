@@ -1,23 +1,105 @@
-from typing import Any, Optional
+import codecs
+import re
+from functools import cached_property
+from typing import Any, BinaryIO, Iterator, Optional
 
+from lxml import etree, html
 from parsel import Selector
 
-from .html_extraction_model import HtmlExtractionModel
+from ..utils.limit import limit_items
+from .extraction_model import resolve_model
+from .html_extraction_model import HtmlEngine, HtmlExtractionModel
+from .html_stream import RecordQuery, iter_file_chunks, iter_html_records, iter_source_chunks
 from .query_builders import QueryConfig
-from .source_parser import SourceParser
+from .source_parser import BytesLike, SourceParser, close_map, unmap
+
+_NUL = re.compile(b"\x00")
+
+# libxml2 errors parsel retries on after decoding the document itself.
+_ENCODING_ERRORS = frozenset({etree.ErrorTypes.ERR_INVALID_CHAR, etree.ErrorTypes.ERR_INVALID_ENCODING})
 
 
 class HtmlParser(SourceParser):
-    def __init__(self, content: str) -> None:
-        self.selector = Selector(text=content)
+    """
+    Parses HTML on demand with parsel and/or lexbor.
+
+    With `engine="lexbor"`, models and `css(...)` queries that lexbor can run (see `HtmlExtractionModel`) skip
+    lxml entirely; everything else still goes through parsel. With `engine=None`, each model's own `engine` is used.
+    """
+
+    def __init__(self, content: str | BytesLike, encoding: str = "utf-8", engine: Optional[HtmlEngine] = None) -> None:
+        self.source = content
+        self.encoding = encoding
+        self.engine = engine
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Parsed trees stay behind; an unpickled parser parses its source again on demand.
+        source = self._get_source()
+        source = source if isinstance(source, (str, bytes)) else bytes(source)
+
+        return {"source": source, "encoding": self.encoding, "engine": self.engine}
+
+    @classmethod
+    def from_bytes(cls, content: BytesLike, encoding: str = "utf-8") -> "HtmlParser":
+        return cls(content, encoding)
+
+    @cached_property
+    def selector(self) -> Selector:
+        source = self._get_source()
+
+        # parsel rejects an empty body, but empty responses (204, HEAD) and empty files still parse as an empty page.
+        if isinstance(source, str) or not len(source):
+            return Selector(text=source if isinstance(source, str) else "")
+
+        if isinstance(source, bytes):
+            return Selector(body=source, encoding=self.encoding)
+
+        return self._parse_buffer(source)
+
+    @cached_property
+    def tree(self) -> Any:
+        """
+        Root node of the document parsed with lexbor.
+        """
+        from .lexbor_extraction_plan import parse_lexbor
+
+        return parse_lexbor(self._get_source(), self.encoding)
+
+    def parse(self) -> "HtmlParser":
+        if self.engine == "lexbor":
+            self.tree
+        else:
+            self.selector
+
+        return self
+
+    def close(self) -> None:
+        # The parsed tree is all that is used afterwards; streaming, pickling and the other engine map the file again.
+        if self._file is None:
+            self.source = unmap(self.source)
+        else:
+            close_map(self.source)
+            self.source = None
 
     def extract_value(self, query: QueryConfig, default: Optional[str] = None) -> Optional[str]:
+        lexbor_query = self._get_lexbor_query(query) if self.engine == "lexbor" else None
+
+        if lexbor_query is not None:
+            results = lexbor_query.select(self.tree, False)
+            return results[0] if results else default
+
         elements = self._select_elements(query)
         result = elements.get()
 
         return result if result is not None else default
 
     def extract_values(self, query: QueryConfig, limit: Optional[int] = None) -> list[str]:
+        lexbor_query = self._get_lexbor_query(query) if self.engine == "lexbor" else None
+
+        if lexbor_query is not None:
+            results = lexbor_query.select(self.tree, False)
+            return results[:limit] if limit is not None else results
+
         elements = self._select_elements(query)
 
         if limit is not None:
@@ -25,23 +107,122 @@ class HtmlParser(SourceParser):
 
         return elements.getall()
 
-    def extract_model(self, model: type[HtmlExtractionModel], query: Optional[QueryConfig] = None) -> Any:
+    def extract_model(self, model: HtmlExtractionModel | type[HtmlExtractionModel], query: Optional[QueryConfig] = None) -> Any:
+        model = resolve_model(model)
+        plan = self._get_lexbor_plan(model, query)
+
+        if plan is not None:
+            element = self._get_lexbor_query(query, False).select(self.tree, False)[0] if query else self.tree
+            return plan.evaluate(element)
+
         element = self._select_elements(query)[0] if query else self.selector
 
-        return model().extract(element)
+        return model.extract(element)
 
     def extract_models(
         self,
-        model: type[HtmlExtractionModel],
+        model: HtmlExtractionModel | type[HtmlExtractionModel],
         query: QueryConfig,
         limit: Optional[int] = None,
     ) -> list[Any]:
-        elements = self._select_elements(query)
+        model = resolve_model(model)
+        plan = self._get_lexbor_plan(model, query)
+
+        if plan is not None:
+            elements = self._get_lexbor_query(query, False).select(self.tree, False)
+            extract = plan.evaluate
+        else:
+            elements = self._select_elements(query)
+            extract = model.extract
 
         if limit is not None:
             elements = elements[:limit]
 
-        return [model().extract(el) for el in elements]
+        return [extract(el) for el in elements]
+
+    def iter_models(
+        self,
+        model: HtmlExtractionModel | type[HtmlExtractionModel],
+        record: RecordQuery,
+        limit: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Extracts `model` from every `record` (a tag name or a query) while the document is parsed incrementally,
+        without ever building the whole tree. See `iter_file_models` to stream straight from disk.
+        """
+        return self._iter_models(iter_source_chunks(self._get_source()), model, record, self.encoding, limit)
+
+    @classmethod
+    def iter_file_models(
+        cls,
+        file: str | BinaryIO,
+        model: HtmlExtractionModel | type[HtmlExtractionModel],
+        record: RecordQuery,
+        encoding: str = "utf-8",
+        limit: Optional[int] = None,
+    ) -> Iterator[Any]:
+        if not isinstance(file, str):
+            yield from cls._iter_models(iter_file_chunks(file), model, record, encoding, limit)
+            return
+
+        with open(file, "rb") as handle:
+            yield from cls._iter_models(iter_file_chunks(handle), model, record, encoding, limit)
+
+    @staticmethod
+    def _iter_models(
+        chunks: Iterator[bytes],
+        model: HtmlExtractionModel | type[HtmlExtractionModel],
+        record: RecordQuery,
+        encoding: str,
+        limit: Optional[int],
+    ) -> Iterator[Any]:
+        model = resolve_model(model)
+
+        for element in limit_items(iter_html_records(chunks, record, encoding), limit):
+            yield model.extract(Selector(root=element, type="html"))
+
+    def _get_lexbor_query(self, query: QueryConfig, extracts_values: bool = True) -> Any:
+        from .lexbor_extraction_plan import get_lexbor_query
+
+        lexbor_query = get_lexbor_query(query)
+
+        if lexbor_query is None or (lexbor_query.pseudo_element is None) == extracts_values:
+            return None
+
+        return lexbor_query
+
+    def _get_lexbor_plan(self, model: HtmlExtractionModel, query: Optional[QueryConfig]) -> Any:
+        if not isinstance(model, HtmlExtractionModel) or type(model).extract is not HtmlExtractionModel.extract:
+            return None
+
+        if (self.engine or model.engine) != "lexbor":
+            return None
+
+        if query is not None and self._get_lexbor_query(query, False) is None:
+            return None
+
+        return model.compile_lexbor()
+
+    def _get_source(self) -> str | BytesLike:
+        return self.source if self.source is not None else self._reopen().source
+
+    def _parse_buffer(self, source: BytesLike) -> Selector:
+        """
+        Parses a memory map (or another bytes-like source) with lxml in place. Documents parsel has to clean up
+        or decode first (NUL bytes, encodings other than UTF-8, invalid bytes) are copied to `bytes` for parsel.
+        """
+        if codecs.lookup(self.encoding).name == "utf-8" and not _NUL.search(source):
+            parser = html.HTMLParser(recover=True, encoding="utf-8", huge_tree=True)
+
+            try:
+                root = etree.fromstring(source, parser=parser)
+            except etree.XMLSyntaxError:
+                root = None
+
+            if root is not None and not any(error.type in _ENCODING_ERRORS for error in parser.error_log):
+                return Selector(root=root, type="html")
+
+        return Selector(body=bytes(source), encoding=self.encoding)
 
     def _select_elements(self, query: QueryConfig):
         if query["type"] == "css":
@@ -0,0 +1,154 @@
+import codecs
+from itertools import chain
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+import cssselect
+from cssselect.parser import CombinedSelector
+from lxml import etree
+from parsel.csstranslator import HTMLTranslator
+
+from .query_builders import QueryConfig
+
+CHUNK_SIZE = 64 * 1024
+
+RecordQuery = str | QueryConfig
+
+_translator = HTMLTranslator()
+
+
+def iter_html_records(chunks: Iterable[bytes], record: RecordQuery, encoding: str = "utf-8") -> Iterator[etree._Element]:
+    """
+    Incrementally parses HTML from `chunks` and yields every `record` element as soon as it is closed.
+
+    `record` is a tag name or a `css(...)`/`xpath(...)` query. Once the caller moves on, the record is cleared and
+    everything before it is dropped from the tree, so memory stays bounded by the size of a single record. Records
+    nested in another record are held back until the outermost one is closed, then all of them are yielded in
+    document order, as `extract_models` returns them. Records only see their own subtree: queries that look outside
+    of it (absolute `//` XPath, `:nth-child` against records already dropped) do not behave as they would on the
+    whole document.
+    """
+    tag, matches = _compile_record(record)
+    parser = etree.HTMLPullParser(events=("end",), tag=tag, encoding="utf-8", huge_tree=True)
+    # Closed records waiting for an enclosing record (or a candidate that turned out not to match) to close.
+    pending: list[etree._Element] = []
+
+    for chunk in _as_utf8(chunks, encoding):
+        parser.feed(chunk)
+        yield from _read_records(parser, tag, matches, pending)
+
+    parser.close()
+    yield from _read_records(parser, tag, matches, pending)
+
+
+def iter_source_chunks(source: str | bytes) -> Iterator[bytes]:
+    if isinstance(source, str):
+        for start in range(0, len(source), CHUNK_SIZE):
+            yield source[start : start + CHUNK_SIZE].encode("utf-8")
+
+        return
+
+    view = memoryview(source)
+
+    for start in range(0, len(view), CHUNK_SIZE):
+        yield bytes(view[start : start + CHUNK_SIZE])
+
+
+def iter_file_chunks(file: BinaryIO) -> Iterator[bytes]:
+    while chunk := file.read(CHUNK_SIZE):
+        yield chunk
+
+
+def _read_records(
+    parser: etree.HTMLPullParser,
+    tag: Optional[str],
+    matches: Optional[Callable[[etree._Element], bool]],
+    pending: list[etree._Element],
+) -> Iterator[etree._Element]:
+    for _, element in parser.read_events():
+        is_record = matches is None or matches(element)
+
+        if not is_record and not pending:
+            continue
+
+        if is_record:
+            pending.append(element)
+
+        if _in_open_record(element, tag, matches):
+            continue
+
+        if len(pending) == 1:
+            yield pending[0]
+        else:
+            # Records close innermost first; yield them in document order instead.
+            held = {id(node) for node in pending}
+            yield from (node for node in element.iter() if id(node) in held)
+
+        pending.clear()
+        _release(element)
+
+
+def _in_open_record(element: etree._Element, tag: Optional[str], matches: Optional[Callable[[etree._Element], bool]]) -> bool:
+    ancestors = element.iterancestors(tag) if tag is not None else element.iterancestors()
+
+    return any(matches is None or matches(ancestor) for ancestor in ancestors)
+
+
+def _release(element: etree._Element) -> None:
+    element.clear(keep_tail=True)
+
+    for node in chain([element], element.iterancestors()):
+        parent = node.getparent()
+
+        if parent is None:
+            break
+
+        while node.getprevious() is not None:
+            del parent[0]
+
+
+def _compile_record(record: RecordQuery) -> tuple[Optional[str], Optional[Callable[[etree._Element], bool]]]:
+    if isinstance(record, str):
+        return record.lower(), None
+
+    if record["type"] == "css":
+        groups = cssselect.parse(record["value"])
+        tree = groups[0].parsed_tree
+
+        while isinstance(tree, CombinedSelector):
+            tree = tree.subselector
+
+        element = getattr(tree, "element", None)
+        tag = element.lower() if len(groups) == 1 and element else None
+
+        if len(groups) == 1 and not isinstance(groups[0].parsed_tree, CombinedSelector):
+            match_self = etree.XPath(_translator.css_to_xpath(record["value"], prefix="self::"))
+            return tag, lambda node: bool(match_self(node))
+
+        expression = _translator.css_to_xpath(record["value"])
+    else:
+        tag = None
+        expression = record["value"]
+
+    select = etree.XPath(expression)
+
+    def matches(node: etree._Element) -> bool:
+        result = select(node.getroottree().getroot())
+        return isinstance(result, list) and any(item is node for item in result)
+
+    return tag, matches
+
+
+def _as_utf8(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    if codecs.lookup(encoding).name == "utf-8":
+        yield from chunks
+        return
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+    for chunk in chunks:
+        yield decoder.decode(chunk).encode("utf-8")
+
+    yield decoder.decode(b"", final=True).encode("utf-8")
+
+
+__all__ = ["iter_html_records", "iter_source_chunks", "iter_file_chunks"]
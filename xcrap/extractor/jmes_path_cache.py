@@ -0,0 +1,29 @@
+from functools import lru_cache
+from typing import Callable, Optional
+
+import jmespath
+from jmespath.parser import ParsedResult
+
+DEFAULT_CACHE_SIZE = 4096
+
+_compile: Callable[[str], ParsedResult] = lru_cache(maxsize=DEFAULT_CACHE_SIZE)(jmespath.compile)
+
+
+def compile_jmes_path(expression: str) -> ParsedResult:
+    """
+    Returns the compiled JMESPath `expression`, from an LRU cache of `DEFAULT_CACHE_SIZE` expressions unless resized
+    with `set_jmes_path_cache_size`. jmespath's own cache holds 512 expressions and evicts at random.
+    """
+    return _compile(expression)
+
+
+def set_jmes_path_cache_size(size: Optional[int]) -> None:
+    """
+    Resizes the cache of compiled expressions (unbounded when `None`), dropping what it holds.
+    """
+    global _compile
+
+    _compile = lru_cache(maxsize=size)(jmespath.compile)
+
+
+__all__ = ["compile_jmes_path", "set_jmes_path_cache_size", "DEFAULT_CACHE_SIZE"]
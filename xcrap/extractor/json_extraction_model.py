@@ -1,21 +1,46 @@
-import json
 from typing import Any, Dict, Optional, Type, Union
 
-import jmespath
-from pydantic import BaseModel
+from jmespath.parser import ParsedResult
+from pydantic import BaseModel, PrivateAttr
 
-from .extraction_model import ExtractionModel
+from ..utils.json_decoder import loads
+from .extraction_model import ExtractionModel, resolve_model
+from .jmes_path_cache import compile_jmes_path
 from .query_builders import QueryConfig
 
 
-class JsonBaseField(BaseModel):
+class JsonQueryField(BaseModel):
+    """
+    Base of the JSON fields: compiles `query` once, when the field is created (or again if `query` is replaced).
+    """
+
+    query: Optional[QueryConfig] = None
+
+    _expression: Optional[ParsedResult] = PrivateAttr(default=None)
+
+    def model_post_init(self, context: Any) -> None:
+        if self.query is not None:
+            self._expression = compile_jmes_path(self.query["value"])
+
+    @property
+    def expression(self) -> Optional[ParsedResult]:
+        if self.query is None:
+            return None
+
+        if self._expression is None or self._expression.expression != self.query["value"]:
+            self._expression = compile_jmes_path(self.query["value"])
+
+        return self._expression
+
+
+class JsonBaseField(JsonQueryField):
     query: QueryConfig
     default: Optional[Any] = None
     multiple: bool = False
     limit: Optional[int] = None
 
 
-class JsonNestedField(BaseModel):
+class JsonNestedField(JsonQueryField):
     query: Optional[QueryConfig] = None
     model: Union[ExtractionModel, Type[ExtractionModel]]
     limit: Optional[int] = None
@@ -53,8 +78,8 @@ class JsonExtractionModel(ExtractionModel):
 
         cls._fields = combined_fields
 
-    def extract(self, content: str | dict | list) -> Dict[str, Any]:
-        root = content if isinstance(content, (dict, list)) else json.loads(content)
+    def extract(self, content: str | bytes | dict | list) -> Dict[str, Any]:
+        root = content if isinstance(content, (dict, list)) else loads(content)
 
         data: Dict[str, Any] = {}
 
@@ -68,7 +93,7 @@ class JsonExtractionModel(ExtractionModel):
         return data
 
     def _extract_base_value(self, value: JsonBaseField, root: Any) -> Any:
-        result = jmespath.search(value.query["value"], root)
+        result = value.expression.search(root)
 
         if result is None:
             return value.default
@@ -85,15 +110,12 @@ class JsonExtractionModel(ExtractionModel):
         return result
 
     def _extract_nested_value(self, value: JsonNestedField, root: Any) -> Any:
-        extracted_data = jmespath.search(value.query["value"], root) if value.query else root
+        extracted_data = value.expression.search(root) if value.query else root
 
         if extracted_data is None:
             return value.default
 
-        model = value.model
-
-        if isinstance(model, type):
-            model = model()
+        model = resolve_model(value.model)
 
         if value.multiple:
             if not isinstance(extracted_data, list):
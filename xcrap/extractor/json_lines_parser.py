@@ -0,0 +1,228 @@
+import codecs
+from contextlib import aclosing
+from functools import cached_property
+from typing import Any, AsyncIterable, AsyncIterator, BinaryIO, Iterable, Iterator, Optional
+
+from ..utils.json_decoder import loads_lines
+from ..utils.limit import alimit_items, limit_items
+from .extraction_model import resolve_model
+from .jmes_path_cache import compile_jmes_path
+from .json_extraction_model import JsonExtractionModel
+from .query_builders import QueryConfig
+from .source_parser import BytesLike, SourceParser, close_map
+
+BATCH_SIZE = 1024 * 1024
+
+
+class LineBatcher:
+    """
+    Regroups arbitrary chunks of bytes into batches of whole lines of at least `batch_size` bytes (except for the
+    last one), so every batch can be decoded on its own.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self._pending: list[bytes] = []
+        self._size = 0
+
+    def feed(self, chunk: bytes) -> Optional[bytes]:
+        self._pending.append(chunk)
+        self._size += len(chunk)
+
+        if self._size < self.batch_size:
+            return None
+
+        end = chunk.rfind(b"\n")
+
+        if end < 0:
+            return None
+
+        self._pending[-1] = chunk[: end + 1]
+        batch = b"".join(self._pending)
+        self._pending = [chunk[end + 1 :]]
+        self._size = len(self._pending[0])
+
+        return batch
+
+    def close(self) -> Optional[bytes]:
+        batch = b"".join(self._pending)
+        self._pending = []
+        self._size = 0
+
+        return batch if batch.strip() else None
+
+
+class JsonLinesParser(SourceParser):
+    """
+    Parses newline-delimited JSON (JSON Lines / NDJSON), one record per line.
+
+    Records are decoded in batches of about `batch_size` bytes with the fast JSON backend (see
+    `xcrap.utils.json_decoder`). The `iter_*` methods extract each batch as soon as it is decoded, so memory stays
+    bounded by one batch, whether the lines come from memory, a file or an async byte stream.
+    """
+
+    def __init__(self, content: str | BytesLike, batch_size: int = BATCH_SIZE) -> None:
+        super().__init__(content)
+        self.batch_size = batch_size
+
+    def __getstate__(self) -> dict[str, Any]:
+        content = self._get_content()
+        content = content if isinstance(content, (str, bytes)) else bytes(content)
+
+        return {"content": content, "batch_size": self.batch_size}
+
+    @classmethod
+    def from_bytes(cls, content: BytesLike, encoding: str = "utf-8") -> "JsonLinesParser":
+        if codecs.lookup(encoding).name != "utf-8":
+            return cls(str(content, encoding, errors="replace"))
+
+        return cls(content)
+
+    def parse(self) -> "JsonLinesParser":
+        self.data
+        return self
+
+    def close(self) -> None:
+        # Decoded records are all that is used afterwards; streaming and pickling map the file again.
+        if self._file is None:
+            super().close()
+        else:
+            close_map(self.content)
+            self.content = None
+
+    @cached_property
+    def data(self) -> list[Any]:
+        return list(self.iter_records())
+
+    def iter_records(self) -> Iterator[Any]:
+        return self._iter_records(self._iter_chunks(), self.batch_size)
+
+    def extract_value(self, query: QueryConfig, default: Optional[Any] = None) -> Any:
+        """
+        Runs `query` against the list of all records.
+        """
+        result = compile_jmes_path(query["value"]).search(self.data)
+        return result if result is not None else default
+
+    def extract_model(self, model: JsonExtractionModel | type[JsonExtractionModel], query: Optional[QueryConfig] = None) -> Any:
+        element = compile_jmes_path(query["value"]).search(self.data) if query else self.data
+
+        return resolve_model(model).extract(element)
+
+    def extract_models(
+        self,
+        model: JsonExtractionModel | type[JsonExtractionModel],
+        query: Optional[QueryConfig] = None,
+        limit: Optional[int] = None,
+    ) -> list[Any]:
+        """
+        Extracts `model` from every record, or from every element `query` selects in the list of records.
+        """
+        if query is None:
+            return list(self.iter_models(model, limit))
+
+        elements = compile_jmes_path(query["value"]).search(self.data)
+
+        if not isinstance(elements, list):
+            elements = [elements] if elements is not None else []
+
+        if limit is not None:
+            elements = elements[:limit]
+
+        extract = resolve_model(model).extract
+
+        return [extract(el) for el in elements]
+
+    def iter_models(self, model: JsonExtractionModel | type[JsonExtractionModel], limit: Optional[int] = None) -> Iterator[Any]:
+        return self._iter_models(self.iter_records(), model, limit)
+
+    @classmethod
+    def iter_file_models(
+        cls,
+        file: str | BinaryIO,
+        model: JsonExtractionModel | type[JsonExtractionModel],
+        limit: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> Iterator[Any]:
+        if not isinstance(file, str):
+            yield from cls._iter_models(cls._iter_records(_iter_file_chunks(file, batch_size), batch_size), model, limit)
+            return
+
+        with open(file, "rb") as handle:
+            yield from cls._iter_models(cls._iter_records(_iter_file_chunks(handle, batch_size), batch_size), model, limit)
+
+    @classmethod
+    async def aiter_models(
+        cls,
+        stream: AsyncIterable[bytes],
+        model: JsonExtractionModel | type[JsonExtractionModel],
+        limit: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> AsyncIterator[Any]:
+        """
+        Extracts `model` from every record of an async byte stream, such as httpx's `response.aiter_bytes()`.
+        """
+        extract = resolve_model(model).extract
+
+        async with aclosing(cls._aiter_records(stream, batch_size)) as records:
+            async for record in alimit_items(records, limit):
+                yield extract(record)
+
+    @staticmethod
+    async def _aiter_records(stream: AsyncIterable[bytes], batch_size: int) -> AsyncIterator[Any]:
+        batcher = LineBatcher(batch_size)
+
+        async for chunk in stream:
+            batch = batcher.feed(chunk)
+
+            if batch is not None:
+                for record in loads_lines(batch):
+                    yield record
+
+        batch = batcher.close()
+
+        if batch is not None:
+            for record in loads_lines(batch):
+                yield record
+
+    @staticmethod
+    def _iter_records(chunks: Iterable[bytes], batch_size: int) -> Iterator[Any]:
+        batcher = LineBatcher(batch_size)
+
+        for chunk in chunks:
+            batch = batcher.feed(chunk)
+
+            if batch is not None:
+                yield from loads_lines(batch)
+
+        batch = batcher.close()
+
+        if batch is not None:
+            yield from loads_lines(batch)
+
+    @staticmethod
+    def _iter_models(
+        records: Iterator[Any],
+        model: JsonExtractionModel | type[JsonExtractionModel],
+        limit: Optional[int],
+    ) -> Iterator[Any]:
+        yield from map(resolve_model(model).extract, limit_items(records, limit))
+
+    def _iter_chunks(self) -> Iterator[bytes]:
+        content = self._get_content()
+        content = content.encode("utf-8") if isinstance(content, str) else content
+        view = memoryview(content)
+
+        for start in range(0, len(view), self.batch_size):
+            yield bytes(view[start : start + self.batch_size])
+
+    def _get_content(self) -> str | BytesLike:
+        return self.content if self.content is not None else self._reopen().content
+
+
+def _iter_file_chunks(file: BinaryIO, size: int) -> Iterator[bytes]:
+    while chunk := file.read(size):
+        yield chunk
+
+
+__all__ = ["JsonLinesParser", "LineBatcher", "BATCH_SIZE"]
@@ -1,23 +1,63 @@
-from typing import Any, Optional
-import jmespath
-import json
+import codecs
+from functools import cached_property
+from typing import Any, BinaryIO, Iterator, Optional
 
+from ..utils.json_decoder import loads
+from ..utils.limit import limit_items
+from .extraction_model import resolve_model
+from .jmes_path_cache import compile_jmes_path
 from .json_extraction_model import JsonExtractionModel
+from .json_stream import iter_json_items, open_json_source
 from .query_builders import QueryConfig
-from .source_parser import SourceParser
+from .source_parser import BytesLike, SourceParser, close_map
 
 
 class JsonParser(SourceParser):
-    def __init__(self, content: str) -> None:
+    """
+    Parses JSON with JMESPath queries. The document is decoded on first use of `data`; `iter_models` and
+    `iter_file_models` stream the items of huge arrays instead.
+    """
+
+    def __init__(self, content: str | BytesLike) -> None:
         super().__init__(content)
-        self.data = json.loads(content)
+
+    def __getstate__(self) -> dict[str, Any]:
+        content = self._get_content()
+
+        return {"content": content if isinstance(content, (str, bytes)) else bytes(content)}
+
+    @cached_property
+    def data(self) -> Any:
+        return loads(self._get_content())
+
+    @classmethod
+    def from_bytes(cls, content: BytesLike, encoding: str = "utf-8") -> "JsonParser":
+        if codecs.lookup(encoding).name != "utf-8":
+            return cls(str(content, encoding, errors="replace"))
+
+        return cls(content)
+
+    def parse(self) -> "JsonParser":
+        self.data
+        return self
+
+    def close(self) -> None:
+        # Decoded records are all that is used afterwards; streaming and pickling map the file again.
+        if self._file is None:
+            super().close()
+        else:
+            close_map(self.content)
+            self.content = None
+
+    def _get_content(self) -> str | BytesLike:
+        return self.content if self.content is not None else self._reopen().content
 
     def extract_value(self, query: QueryConfig, default: Optional[Any] = None) -> Any:
-        result = jmespath.search(query["value"], self.data)
+        result = compile_jmes_path(query["value"]).search(self.data)
         return result if result is not None else default
 
     def extract_values(self, query: QueryConfig, limit: Optional[int] = None) -> list[Any]:
-        results = jmespath.search(query["value"], self.data)
+        results = compile_jmes_path(query["value"]).search(self.data)
 
         if not isinstance(results, list):
             results = [results] if results is not None else []
@@ -27,18 +67,18 @@ class JsonParser(SourceParser):
 
         return results
 
-    def extract_model(self, model: type[JsonExtractionModel], query: Optional[QueryConfig] = None) -> Any:
-        element = jmespath.search(query["value"], self.data) if query else self.data
+    def extract_model(self, model: JsonExtractionModel | type[JsonExtractionModel], query: Optional[QueryConfig] = None) -> Any:
+        element = compile_jmes_path(query["value"]).search(self.data) if query else self.data
 
-        return model().extract(element)
+        return resolve_model(model).extract(element)
 
     def extract_models(
         self,
-        model: type[JsonExtractionModel],
+        model: JsonExtractionModel | type[JsonExtractionModel],
         query: QueryConfig,
         limit: Optional[int] = None,
     ) -> list[Any]:
-        elements = jmespath.search(query["value"], self.data)
+        elements = compile_jmes_path(query["value"]).search(self.data)
 
         if not isinstance(elements, list):
             elements = [elements] if elements is not None else []
@@ -46,4 +86,42 @@ class JsonParser(SourceParser):
         if limit is not None:
             elements = elements[:limit]
 
-        return [model().extract(el) for el in elements]
+        extract = resolve_model(model).extract
+
+        return [extract(el) for el in elements]
+
+    def iter_models(
+        self,
+        model: JsonExtractionModel | type[JsonExtractionModel],
+        prefix: str,
+        limit: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Extracts `model` from every value at `prefix` (ijson syntax, e.g. `"data.items.item"`) while the document is
+        parsed incrementally, without ever decoding it whole. See `iter_file_models` to stream straight from disk.
+        """
+        return self._iter_models(open_json_source(self._get_content()), model, prefix, limit)
+
+    @classmethod
+    def iter_file_models(
+        cls,
+        file: str | BinaryIO,
+        model: JsonExtractionModel | type[JsonExtractionModel],
+        prefix: str,
+        limit: Optional[int] = None,
+    ) -> Iterator[Any]:
+        if not isinstance(file, str):
+            yield from cls._iter_models(file, model, prefix, limit)
+            return
+
+        with open(file, "rb") as handle:
+            yield from cls._iter_models(handle, model, prefix, limit)
+
+    @staticmethod
+    def _iter_models(
+        file: BinaryIO,
+        model: JsonExtractionModel | type[JsonExtractionModel],
+        prefix: str,
+        limit: Optional[int],
+    ) -> Iterator[Any]:
+        yield from map(resolve_model(model).extract, limit_items(iter_json_items(file, prefix), limit))
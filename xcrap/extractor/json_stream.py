@@ -0,0 +1,54 @@
+import io
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None
+
+
+def iter_json_items(file: BinaryIO, prefix: str) -> Iterator[Any]:
+    """
+    Incrementally parses the UTF-8 JSON in `file` and yields every value found at `prefix` as soon as it is complete.
+
+    `prefix` uses ijson's syntax: keys joined by dots, with `item` standing for the elements of an array, so
+    `"item"` is every element of a top-level array and `"data.products.item"` every element of `data.products`.
+    Only the value being built is kept in memory.
+    """
+    if ijson is None:
+        raise ImportError("Streaming JSON requires ijson (pip install ijson)")
+
+    return ijson.items(file, prefix, use_float=True)
+
+
+def open_json_source(source: Any) -> BinaryIO:
+    if isinstance(source, str):
+        return io.BytesIO(source.encode("utf-8"))
+
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+
+    return io.BufferedReader(BufferReader(source))
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Reads a memory map (or any other buffer) as a file without copying it first.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, target: Any) -> int:
+        chunk = self._view[self._position : self._position + len(target)]
+        target[: len(chunk)] = chunk
+        self._position += len(chunk)
+
+        return len(chunk)
+
+
+__all__ = ["iter_json_items", "open_json_source", "BufferReader"]
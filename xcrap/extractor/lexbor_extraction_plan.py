@@ -0,0 +1,407 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+import cssselect
+from cssselect.parser import CombinedSelector, Element, FunctionalPseudoElement
+
+from .extraction_model import resolve_model
+from .html_extraction_model import _UNCOMPILED, HtmlBaseField, HtmlExtractionField, HtmlExtractionModel, HtmlNestedField
+from .query_builders import QueryConfig
+
+try:
+    from selectolax.lexbor import LexborHTMLParser, SelectolaxError
+except ImportError:  # pragma: no cover - selectolax is optional
+    LexborHTMLParser = None
+    SelectolaxError = Exception
+
+FieldHandler = Callable[[Any, bool], Any]
+
+# Attributes libxml2 fills with their own name when they are written without a value (`<input checked>`).
+_BOOLEAN_ATTRIBUTES = frozenset(
+    {
+        "checked",
+        "compact",
+        "declare",
+        "defer",
+        "disabled",
+        "ismap",
+        "multiple",
+        "nohref",
+        "noresize",
+        "noshade",
+        "nowrap",
+        "readonly",
+        "selected",
+    }
+)
+
+
+class UnsupportedQuery(Exception):
+    pass
+
+
+def parse_lexbor(content: Any, encoding: str = "utf-8") -> Any:
+    """
+    Parses a document with lexbor and returns its root (`<html>`) node.
+    """
+    if LexborHTMLParser is None:
+        raise ImportError("The lexbor engine requires selectolax (pip install selectolax)")
+
+    if not isinstance(content, (str, bytes)):
+        content = bytes(content)
+
+    if isinstance(content, bytes) and encoding.replace("_", "-").lower() not in ("utf-8", "utf8"):
+        content = content.decode(encoding, errors="replace")
+
+    return LexborHTMLParser(content).root
+
+
+class LexborQuery:
+    """
+    A `css(...)` query run with lexbor, with parsel's `::text`/`::attr(name)` pseudo-elements.
+
+    Parsel evaluates CSS from `descendant-or-self::`, so every step of a combined selector has to be the context
+    node or one of its descendants; lexbor also lets ancestors outside the context match. Combined selectors run
+    from an element context are therefore re-checked against the context before being returned. Sibling
+    combinators (`+`, `~`) are left to parsel, where `dt + dd` run from a `dt` matches its sibling outside the
+    context, which lexbor never searches.
+    """
+
+    def __init__(self, query: str) -> None:
+        if LexborHTMLParser is None:
+            raise UnsupportedQuery("selectolax is not installed")
+
+        try:
+            groups = cssselect.parse(query)
+        except cssselect.SelectorError as error:
+            raise UnsupportedQuery(str(error))
+
+        pseudo_elements = {self._pseudo_element(group.pseudo_element) for group in groups}
+
+        if len(pseudo_elements) != 1:
+            raise UnsupportedQuery("Mixed pseudo-elements")
+
+        self.pseudo_element = pseudo_elements.pop()
+        trees = [group.parsed_tree for group in groups]
+
+        # parsel turns a trailing `*` into `descendant-or-self::` when a pseudo-element follows it, so
+        # `a *::text` is every text node inside `a` and `*::attr(href)` includes the context node itself.
+        self.deep = self.pseudo_element is not None and any(self._ends_with_universal(tree) for tree in trees)
+
+        if self.deep:
+            if len(trees) > 1:
+                raise UnsupportedQuery("Universal pseudo-element queries must be a single selector")
+
+            trees = [] if self._is_universal(trees[0]) else [trees[0].selector]
+
+        self.selector = ", ".join(tree.canonical() for tree in trees) or None
+        self.chains = [self._flatten(tree) for tree in trees]
+
+        if any(combinator in ("+", "~") for chain in self.chains for _, combinator in chain):
+            raise UnsupportedQuery("Sibling combinators need parsel")
+        self.combined = any(len(chain) > 1 for chain in self.chains)
+
+        try:
+            document = _empty_document()
+
+            if self.selector is not None:
+                document.css(self.selector)
+
+            for chain in self.chains:
+                for compound, _ in chain:
+                    document.css(compound)
+        except SelectolaxError as error:
+            raise UnsupportedQuery(str(error))
+
+    def select(self, node: Any, scoped: bool) -> list[Any]:
+        if self.selector is None:
+            elements = [node]
+        else:
+            elements = node.css(self.selector)
+
+            if scoped and self.combined:
+                elements = [element for element in elements if self._is_within(element, node)]
+
+        if self.pseudo_element is None:
+            return elements
+
+        if self.pseudo_element == "text":
+            return self._texts(elements, node)
+
+        if self.deep:
+            elements = [child for element in self._outermost(elements, node) for child in element.traverse()]
+
+        name = self.pseudo_element[1]
+        values = []
+
+        for element in elements:
+            attributes = element.attributes
+
+            if name in attributes:
+                value = attributes[name]
+                values.append(value if value is not None else name if name in _BOOLEAN_ATTRIBUTES else "")
+
+        return values
+
+    def _texts(self, elements: list[Any], context: Any) -> list[str]:
+        """
+        Returns the text children (or, for `deep` queries, all descendant text) of `elements` in document order.
+        """
+        if self.deep:
+            return [
+                child.text_content
+                for element in self._outermost(elements, context)
+                for child in element.traverse(include_text=True)
+                if child.is_text_node
+            ]
+
+        if len(elements) == 1:
+            return [child.text_content for child in elements[0].iter(include_text=True) if child.is_text_node]
+
+        matched = {element.mem_id for element in elements}
+
+        return [
+            child.text_content
+            for element in self._outermost(elements, context)
+            for child in element.traverse(include_text=True)
+            if child.is_text_node and child.parent.mem_id in matched
+        ]
+
+    def _outermost(self, elements: list[Any], context: Any) -> list[Any]:
+        """
+        Drops the elements nested inside other matched elements, whose subtrees are already covered.
+        """
+        if len(elements) < 2:
+            return elements
+
+        matched = {element.mem_id for element in elements}
+
+        return [element for element in elements if not self._has_matched_ancestor(element, matched, context)]
+
+    def _has_matched_ancestor(self, element: Any, matched: set[int], context: Any) -> bool:
+        while element.mem_id != context.mem_id:
+            element = element.parent
+
+            if element is None:
+                break
+
+            if element.mem_id in matched:
+                return True
+
+        return False
+
+    def _is_within(self, element: Any, context: Any) -> bool:
+        return any(self._match_chain(chain, len(chain) - 1, element, context) for chain in self.chains)
+
+    def _match_chain(self, chain: list[tuple[str, Optional[str]]], index: int, node: Any, context: Any) -> bool:
+        compound, combinator = chain[index]
+
+        if not node.css_matches(compound):
+            return False
+
+        if index == 0:
+            return True
+
+        while node.mem_id != context.mem_id:
+            node = node.parent
+
+            if self._match_chain(chain, index - 1, node, context):
+                return True
+
+            if combinator == ">":
+                break
+
+        return False
+
+    def _flatten(self, tree: Any) -> list[tuple[str, Optional[str]]]:
+        """
+        Splits a selector into `(compound, combinator to the previous compound)` steps.
+        """
+        if isinstance(tree, CombinedSelector):
+            return [*self._flatten(tree.selector), (tree.subselector.canonical(), tree.combinator)]
+
+        return [(tree.canonical(), None)]
+
+    def _ends_with_universal(self, tree: Any) -> bool:
+        if isinstance(tree, CombinedSelector):
+            return tree.combinator == " " and self._is_universal(tree.subselector)
+
+        return self._is_universal(tree)
+
+    def _is_universal(self, tree: Any) -> bool:
+        return isinstance(tree, Element) and tree.element is None and tree.namespace is None
+
+    def _pseudo_element(self, pseudo_element: Any) -> Any:
+        if pseudo_element is None or pseudo_element == "text":
+            return pseudo_element
+
+        if isinstance(pseudo_element, FunctionalPseudoElement) and pseudo_element.name == "attr":
+            arguments = [token.value for token in pseudo_element.arguments if token.type in ("IDENT", "STRING")]
+
+            if len(arguments) == 1:
+                return ("attr", arguments[0])
+
+        raise UnsupportedQuery(f"Unsupported pseudo-element: {pseudo_element}")
+
+
+def get_lexbor_query(query: QueryConfig) -> Optional[LexborQuery]:
+    """
+    Returns the lexbor version of a `css(...)` query, or `None` when it has to run on parsel.
+    """
+    if query["type"] != "css":
+        return None
+
+    return _compile_lexbor_query(query["value"])
+
+
+class LexborExtractionPlan:
+    """
+    An `HtmlExtractionModel` compiled to run on lexbor nodes.
+
+    Only models made of `css(...)` queries are supported: base fields must end in `::text` or `::attr(name)` and
+    no field may use an `extractor`. Building the plan raises `UnsupportedQuery` for anything else.
+    """
+
+    def __init__(self, model: HtmlExtractionModel) -> None:
+        self.model = model
+        self.fields: tuple[tuple[str, FieldHandler], ...] = ()
+        # Plans whose nested fields run this one; they are discarded with it if it fails to build.
+        self.referrers: list["LexborExtractionPlan"] = []
+
+    def build(self) -> None:
+        """
+        Compiles the fields of the model, raising `UnsupportedQuery` if one of them cannot run on lexbor.
+        """
+        self.fields = tuple((key, self._compile_field(field)) for key, field in self.model.shape.items())
+
+    def discard(self) -> None:
+        """
+        Unregisters the plan and every plan that refers to it, so they are compiled again on next use.
+        """
+        if self.model._lexbor_plan is not self:
+            return
+
+        self.model._lexbor_plan = _UNCOMPILED
+
+        for referrer in self.referrers:
+            referrer.discard()
+
+    def evaluate(self, node: Any) -> Dict[str, Any]:
+        scoped = node.parent is not None and node.parent.is_element_node
+
+        return {key: handler(node, scoped) for key, handler in self.fields}
+
+    def _compile_field(self, field: HtmlExtractionField) -> FieldHandler:
+        if field.extractor is not None:
+            raise UnsupportedQuery("Extractors need a parsel Selector")
+
+        if isinstance(field, HtmlNestedField):
+            return self._compile_nested_field(field)
+
+        return self._compile_base_field(field)
+
+    def _compile_base_field(self, field: HtmlBaseField) -> FieldHandler:
+        query = self._compile_query(field.query)
+
+        if query.pseudo_element is None:
+            raise UnsupportedQuery("Serializing elements needs parsel")
+
+        select = query.select
+        default = field.default
+        limit = field.limit
+
+        if field.multiple:
+            empty = default if default is not None else []
+
+            def extract_all(node: Any, scoped: bool) -> Any:
+                results = select(node, scoped)
+
+                if limit is not None:
+                    results = results[:limit]
+
+                return results if results else empty
+
+            return extract_all
+
+        def extract_first(node: Any, scoped: bool) -> Any:
+            results = select(node, scoped)
+
+            return results[0] if results else default
+
+        return extract_first
+
+    def _compile_nested_field(self, field: HtmlNestedField) -> FieldHandler:
+        if field.multiple and field.query is None:
+            raise Exception("Query is required for nested model with multiple values")
+
+        query = self._compile_query(field.query) if field.query else None
+
+        if query is not None and query.pseudo_element is not None:
+            raise UnsupportedQuery("Nested models need element queries")
+
+        model = resolve_model(field.model)
+
+        if not isinstance(model, HtmlExtractionModel) or type(model).extract is not HtmlExtractionModel.extract:
+            raise UnsupportedQuery("Nested model is not a plain HtmlExtractionModel")
+
+        plan = model.compile_lexbor()
+
+        if plan is None:
+            raise UnsupportedQuery("Nested model cannot run on lexbor")
+
+        # `plan.fields` is read on each call: a plan nested in itself is still being built here.
+        plan.referrers.append(self)
+        default = field.default
+        limit = field.limit
+
+        if field.multiple:
+            empty = default if default is not None else []
+
+            def extract_all(node: Any, scoped: bool) -> Any:
+                elements = query.select(node, scoped)
+
+                if limit is not None:
+                    elements = elements[:limit]
+
+                results = [{key: handler(element, True) for key, handler in plan.fields} for element in elements]
+
+                return results if results else empty
+
+            return extract_all
+
+        def extract_one(node: Any, scoped: bool) -> Any:
+            if query is None:
+                return {key: handler(node, scoped) for key, handler in plan.fields}
+
+            elements = query.select(node, scoped)
+
+            if not elements:
+                return default
+
+            return {key: handler(elements[0], True) for key, handler in plan.fields}
+
+        return extract_one
+
+    def _compile_query(self, query: QueryConfig) -> LexborQuery:
+        compiled = get_lexbor_query(query)
+
+        if compiled is None:
+            raise UnsupportedQuery(f"Query cannot run on lexbor: {query['value']}")
+
+        return compiled
+
+
+@lru_cache(maxsize=1024)
+def _compile_lexbor_query(query: str) -> Optional[LexborQuery]:
+    try:
+        return LexborQuery(query)
+    except UnsupportedQuery:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _empty_document() -> Any:
+    return LexborHTMLParser("")
+
+
+__all__ = ["LexborExtractionPlan", "LexborQuery", "UnsupportedQuery", "get_lexbor_query", "parse_lexbor"]
@@ -1,19 +1,166 @@
+import mmap
 from abc import ABC
-from typing import Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Type, TypeVar
+
+from .extraction_model import ExtractionModel, resolve_model
+from .query_builders import QueryConfig
+
+if TYPE_CHECKING:
+    from .extraction_executor import ExtractionExecutor
 
 SourceParserType = TypeVar("SourceParserType", bound="SourceParser")
 
+# Raw documents parsers accept besides `bytes`, e.g. the memory map made by `load_file`.
+BytesLike = bytes | bytearray | memoryview | mmap.mmap
+
 
 class SourceParser(ABC):
+    # File and encoding `load_file` read the document from. Parsers that drop the raw document on `close` map the
+    # file again when they need it, so the file must not change while they are in use.
+    _file: Optional[tuple[str, str]] = None
+
     def __init__(self, content: str) -> None:
         self.content = content
 
     @classmethod
-    def load_file(cls: Type[SourceParserType], path: str) -> SourceParserType:
-        with open(path, "r", encoding="utf-8") as file:
-            file_content = file.read()
+    def from_bytes(cls: Type[SourceParserType], content: BytesLike, encoding: str = "utf-8") -> SourceParserType:
+        """
+        Builds a parser from raw bytes. Parsers that can read bytes natively override this to skip the decode.
+        """
+        return cls(str(content, encoding, errors="replace"))
+
+    @classmethod
+    def load_file(cls: Type[SourceParserType], path: str, encoding: str = "utf-8") -> SourceParserType:
+        """
+        Memory-maps the file and hands the mapping to `from_bytes`, so parsers that read bytes natively parse it in
+        place instead of reading it into a `str` first. The document is parsed right away and the map closed (see
+        `close`), so loaded parsers do not hold file descriptors.
+        """
+        parser = cls.from_bytes(map_file(path), encoding)
+        parser._file = (path, encoding)
+        parser.parse().close()
+
+        return parser
+
+    @classmethod
+    def load_files(
+        cls: Type[SourceParserType],
+        paths: Iterable[str],
+        workers: Optional[int] = None,
+        encoding: str = "utf-8",
+    ) -> list[SourceParserType]:
+        """
+        Loads and parses many files on a pool of `workers` threads, returning the parsers in the order of `paths`.
+        lxml releases the GIL while parsing, so HTML documents are parsed in parallel; the JSON decoders hold it, so
+        JSON documents are decoded one at a time (use `extract_many` to spread the work across processes).
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda path: cls.load_file(path, encoding), paths))
+
+    def parse(self: SourceParserType) -> SourceParserType:
+        """
+        Parses the document now instead of on first use. Returns the parser itself.
+        """
+        return self
+
+    def close(self) -> None:
+        """
+        Releases the memory map the parser reads from, if any, with its file descriptor. Parsers loaded with
+        `load_file` that keep the parsed document drop the raw one and map the file again when they need it
+        (streaming, pickling, other engines); otherwise the raw document is copied to `bytes`.
+        """
+        self.content = unmap(self.content)
+
+    def _reopen(self: SourceParserType) -> SourceParserType:
+        """
+        Returns a new, unparsed parser over the file this one was loaded from.
+        """
+        path, encoding = self._file
+        return type(self).from_bytes(map_file(path), encoding)
+
+    async def extract_model_async(
+        self,
+        model: ExtractionModel | Type[ExtractionModel],
+        query: Optional[QueryConfig] = None,
+        executor: Optional["ExtractionExecutor"] = None,
+    ) -> Any:
+        """
+        Runs `extract_model` in `executor` (the default thread pool when `None`), so neither parsing nor extraction
+        blocks the event loop.
+        """
+        from .extraction_executor import get_default_executor
+
+        return await (executor or get_default_executor()).call_parser(self, "extract_model", resolve_model(model), query)
+
+    async def extract_models_async(
+        self,
+        model: ExtractionModel | Type[ExtractionModel],
+        query: QueryConfig,
+        limit: Optional[int] = None,
+        executor: Optional["ExtractionExecutor"] = None,
+    ) -> list[Any]:
+        from .extraction_executor import get_default_executor
+
+        return await (executor or get_default_executor()).call_parser(self, "extract_models", resolve_model(model), query, limit)
+
+    @classmethod
+    def extract_many(
+        cls,
+        contents: Iterable[str | bytes],
+        model: ExtractionModel | Type[ExtractionModel],
+        query: Optional[QueryConfig] = None,
+        multiple: bool = False,
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        mp_context: Optional[BaseContext] = None,
+    ) -> list[Any]:
+        """
+        Parses every document of `contents` and runs `extract_model(model, query)` on it (`extract_models` when
+        `multiple`) across a pool of `workers` processes, one per core when `None`. Results keep the input order.
+        """
+        from .batch_extraction import parse_many
+
+        return parse_many(cls, contents, resolve_model(model), query, multiple, workers, chunksize, mp_context)
+
+
+def map_file(path: str) -> mmap.mmap | bytes:
+    """
+    Maps the file at `path` read-only into memory. Empty files cannot be mapped and are returned as `b""`.
+    """
+    with open(path, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+def unmap(content: Any) -> Any:
+    """
+    Returns a `bytes` copy of a memory map and closes it; any other content is returned as it is.
+    """
+    if not isinstance(content, mmap.mmap):
+        return content
+
+    data = content[:]
+    close_map(content)
+
+    return data
+
+
+def close_map(content: Any) -> None:
+    """
+    Closes `content` if it is a memory map.
+    """
+    if not isinstance(content, mmap.mmap):
+        return
 
-        return cls(file_content)
+    try:
+        content.close()
+    except BufferError:
+        # Still exported (e.g. to a stream being read): the map closes once the last view of it is gone.
+        pass
 
 
-__all__ = ["SourceParser"]
+__all__ = ["SourceParser", "BytesLike", "map_file", "unmap", "close_map"]
@@ -1,5 +1,21 @@
-from .client_factory import create_client
-from .extractor_factory import create_extractor
-from .extraction_model_factory import create_extraction_model
+from typing import TYPE_CHECKING
 
-__all__ = ["create_client", "create_extractor", "create_extraction_model"]
+from ..utils.lazy_import import lazy_exports
+
+if TYPE_CHECKING:
+    from .client_factory import create_client
+    from .extraction_model_cache import ExtractionModelCache
+    from .extraction_model_factory import create_extraction_model
+    from .extractor_factory import create_extractor
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "create_client": ".client_factory",
+        "ExtractionModelCache": ".extraction_model_cache",
+        "create_extraction_model": ".extraction_model_factory",
+        "create_extractor": ".extractor_factory",
+    },
+)
+
+__all__ = ["create_client", "create_extractor", "create_extraction_model", "ExtractionModelCache"]
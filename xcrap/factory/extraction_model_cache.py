@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Type
+
+from ..extractor.extraction_model import ExtractionModel
+from ..extractor.html_extraction_model import HtmlExtractionModel
+from .extraction_model_factory import _get_recipe_args, create_extraction_model
+
+# Part of every key, so entries written by an incompatible version of the cache are never read back.
+CACHE_VERSION = 1
+
+
+class ExtractionModelCache:
+    """
+    Content-addressed cache of the models built by `create_extraction_model`, keyed by a SHA-256 of the config
+    (canonical JSON), the separator and the names of the model classes and extractor generators it uses.
+
+    Models are returned built and compiled, and shared by every caller asking for the same config, so they must not
+    be modified. Up to `max_size` models are kept in memory (least recently used evicted first). With `path`, models
+    are also pickled into that directory so other processes skip building them; compiled XPath plans cannot be
+    pickled and are compiled again when a model is loaded, and models whose extractors cannot be pickled (lambdas,
+    closures) are only kept in memory. Only point `path` at a directory you trust, as loading unpickles its files.
+    """
+
+    def __init__(self, max_size: Optional[int] = 128, path: Optional[str] = None) -> None:
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._models: OrderedDict[str, ExtractionModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def get(
+        self,
+        model_config: Dict[str, Any],
+        allowed_models: Dict[str, Type[ExtractionModel]],
+        allowed_extractors: Dict[str, Any],
+        extractor_argument_separator: str = ":",
+    ) -> ExtractionModel:
+        """
+        Returns the model for `model_config`, building it with `create_extraction_model` on a miss.
+        """
+        args = _get_recipe_args(model_config, allowed_models, allowed_extractors, extractor_argument_separator)
+        key = _hash(args)
+
+        with self._lock:
+            model = self._models.get(key)
+
+            if model is not None and _uses(model, args):
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+
+        model = self._load(key, args)
+
+        if model is None:
+            model = create_extraction_model(*args)
+            self._store(key, model)
+
+        _compile(model)
+
+        with self._lock:
+            self.misses += 1
+            self._models[key] = model
+            self._models.move_to_end(key)
+
+            while self.max_size is not None and len(self._models) > self.max_size:
+                self._models.popitem(last=False)
+
+        return model
+
+    def key(
+        self,
+        model_config: Dict[str, Any],
+        allowed_models: Dict[str, Type[ExtractionModel]],
+        allowed_extractors: Dict[str, Any],
+        extractor_argument_separator: str = ":",
+    ) -> str:
+        """
+        Returns the cache key of a config; models and extractors the config does not use take no part in it.
+        """
+        return _hash(_get_recipe_args(model_config, allowed_models, allowed_extractors, extractor_argument_separator))
+
+    def clear(self) -> None:
+        """
+        Empties the in-memory cache; files under `path` are kept.
+        """
+        with self._lock:
+            self._models.clear()
+
+    def _load(self, key: str, args: tuple) -> Optional[ExtractionModel]:
+        if self.path is None:
+            return None
+
+        try:
+            with open(self._file(key), "rb") as file:
+                model = pickle.load(file)
+        except Exception:
+            # Missing, unreadable or stale entries (e.g. a generator that moved) are rebuilt and overwritten.
+            return None
+
+        return model if isinstance(model, ExtractionModel) and _uses(model, args) else None
+
+    def _store(self, key: str, model: ExtractionModel) -> None:
+        if self.path is None:
+            return
+
+        try:
+            data = pickle.dumps(model)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return
+
+        # Written next to the final file and renamed, so concurrent workers never read a partial entry.
+        descriptor, temp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(data)
+
+            os.replace(temp_path, self._file(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.pickle")
+
+
+def _hash(args: tuple) -> str:
+    model_config, allowed_models, allowed_extractors, extractor_argument_separator = args
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "config": model_config,
+            "models": {key: _qualified_name(value) for key, value in allowed_models.items()},
+            "extractors": {key: _qualified_name(value) for key, value in allowed_extractors.items()},
+            "separator": extractor_argument_separator,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=repr,
+    )
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _uses(model: ExtractionModel, args: tuple) -> bool:
+    # Names can collide (two lambdas in one module), so hits are checked against the actual objects.
+    recipe = model._recipe
+    return recipe is not None and recipe[1][1] == args[1] and recipe[1][2] == args[2]
+
+
+def _compile(model: ExtractionModel) -> None:
+    # JSON fields compile their queries when built; HTML plans (nested models included) compile on first use.
+    if isinstance(model, HtmlExtractionModel):
+        model.compile()
+
+        if model.engine == "lexbor":
+            model.compile_lexbor()
+
+
+def _qualified_name(value: Callable[..., Any]) -> str:
+    return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+
+
+__all__ = ["ExtractionModelCache", "CACHE_VERSION"]
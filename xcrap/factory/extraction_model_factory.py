@@ -1,16 +1,21 @@
-from typing import Any, Dict, Type
+import copy
+from typing import TYPE_CHECKING, Any, Dict, Optional, Type
 
 from ..extractor.extraction_model import ExtractionModel
 from ..extractor.html_extraction_model import HtmlBaseField, HtmlExtractionModel, HtmlNestedField
 from ..extractor.json_extraction_model import JsonBaseField, JsonExtractionModel, JsonNestedField
 from .extractor_factory import create_extractor
 
+if TYPE_CHECKING:
+    from .extraction_model_cache import ExtractionModelCache
+
 
 def create_extraction_model(
     model_config: Dict[str, Any],
     allowed_models: Dict[str, Type[ExtractionModel]],
     allowed_extractors: Dict[str, Any],
     extractor_argument_separator: str = ":",
+    cache: Optional["ExtractionModelCache"] = None,
 ) -> ExtractionModel:
     """
     Creates a parsing model instance from a configuration dictionary.
@@ -20,10 +25,25 @@ def create_extraction_model(
         allowed_models: A dictionary mapping model types to ExtractionModel classes.
         allowed_extractors: A dictionary mapping extractor names to their generators.
         extractor_argument_separator: The character used to split extractor keys from arguments.
+        cache: An ExtractionModelCache to return the already built (and shared) model for the same config from.
 
     Returns:
-        An instantiated ExtractionModel (HtmlExtractionModel or JsonExtractionModel).
+        An instantiated ExtractionModel (HtmlExtractionModel or JsonExtractionModel). Its recipe is this call, limited
+        to the models and extractors the config uses, so process pools rebuild it from the config.
     """
+    if cache is not None:
+        return cache.get(model_config, allowed_models, allowed_extractors, extractor_argument_separator)
+
+    # The model and its recipe keep the config they were built from, whatever the caller does with theirs afterwards.
+    return _create_extraction_model(copy.deepcopy(model_config), allowed_models, allowed_extractors, extractor_argument_separator)
+
+
+def _create_extraction_model(
+    model_config: Dict[str, Any],
+    allowed_models: Dict[str, Type[ExtractionModel]],
+    allowed_extractors: Dict[str, Any],
+    extractor_argument_separator: str,
+) -> ExtractionModel:
     model_type = model_config.get("type")
     if not model_type or model_type not in allowed_models:
         raise ValueError(f"Unsupported model type: '{model_type}'")
@@ -43,7 +63,7 @@ def create_extraction_model(
 
         # Handle nested
         if "nested" in field_data:
-            nested_model = create_extraction_model(
+            nested_model = _create_extraction_model(
                 field_data["nested"], allowed_models, allowed_extractors, extractor_argument_separator
             )
 
@@ -82,4 +102,39 @@ def create_extraction_model(
                     limit=field_data.get("limit"),
                 )
 
-    return model_class(shape=shape)
+    model = model_class(shape=shape)
+    model._recipe = (
+        create_extraction_model,
+        _get_recipe_args(model_config, allowed_models, allowed_extractors, extractor_argument_separator),
+    )
+
+    return model
+
+
+def _get_recipe_args(
+    model_config: Dict[str, Any],
+    allowed_models: Dict[str, Type[ExtractionModel]],
+    allowed_extractors: Dict[str, Any],
+    extractor_argument_separator: str,
+) -> tuple:
+    model_types = set()
+    extractor_keys = set()
+    pending = [model_config]
+
+    while pending:
+        config = pending.pop()
+        model_types.add(config.get("type"))
+
+        for field_data in config.get("model", {}).values():
+            if "extractor" in field_data:
+                extractor_keys.add(field_data["extractor"].split(extractor_argument_separator)[0])
+
+            if "nested" in field_data:
+                pending.append(field_data["nested"])
+
+    return (
+        model_config,
+        {key: value for key, value in allowed_models.items() if key in model_types},
+        {key: value for key, value in allowed_extractors.items() if key in extractor_keys},
+        extractor_argument_separator,
+    )
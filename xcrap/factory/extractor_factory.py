@@ -1,8 +1,9 @@
-from typing import Any, Callable, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict
 
-from parsel import Selector
+if TYPE_CHECKING:
+    from parsel import Selector
 
-ExtractorFunction = Callable[[Selector], Any]
+ExtractorFunction = Callable[["Selector"], Any]
 
 
 def create_extractor(
@@ -0,0 +1,132 @@
+import json
+from typing import Any, Callable, Literal, Optional
+
+JsonBackend = Literal["msgspec", "orjson", "json"]
+JsonDecoder = Callable[[str | bytes], Any]
+
+# Tried in this order when no backend is set. msgspec comes first because orjson turns integers wider than
+# 64 bits into floats.
+AUTO_BACKENDS: tuple[JsonBackend, ...] = ("msgspec", "orjson", "json")
+
+_backend: Optional[JsonBackend] = None
+_decode: Optional[JsonDecoder] = None
+_decode_lines: Optional[Callable[[str | bytes], list]] = None
+
+
+def load_json_decoder(backend: JsonBackend) -> JsonDecoder:
+    """
+    Returns the raw `loads` function of `backend`, raising `ImportError` when it is not installed.
+    """
+    if backend == "msgspec":
+        import msgspec
+
+        return msgspec.json.Decoder().decode
+
+    if backend == "orjson":
+        import orjson
+
+        return orjson.loads
+
+    if backend == "json":
+        return json.loads
+
+    raise ValueError(f"Unsupported JSON backend: '{backend}'")
+
+
+def set_json_backend(backend: Optional[JsonBackend]) -> None:
+    """
+    Picks the backend used by `loads`; `None` uses the first installed one of `AUTO_BACKENDS`.
+    """
+    global _backend, _decode, _decode_lines
+
+    _decode = load_json_decoder(backend) if backend is not None else None
+    _decode_lines = None
+    _backend = backend
+
+
+def get_json_backend() -> JsonBackend:
+    _get_decoder()
+    return _backend
+
+
+def loads(content: Any) -> Any:
+    """
+    Decodes JSON from `str` or bytes-like `content` (without decoding it to `str` first) with the current backend.
+
+    Documents a faster backend rejects but the stdlib accepts (`NaN`, UTF-16 bytes, ...) are decoded again with
+    `json.loads`, so every backend accepts the same input and raises `json.JSONDecodeError` on invalid JSON.
+    """
+    decode = _decode or _get_decoder()
+
+    if not isinstance(content, (str, bytes)):
+        # Memory maps and other buffers: msgspec and orjson read them as they are, the stdlib needs `bytes`.
+        if decode is json.loads:
+            return json.loads(bytes(content))
+
+        content = memoryview(content)
+
+    if decode is json.loads:
+        return decode(content)
+
+    try:
+        return decode(content)
+    except ValueError:
+        return json.loads(content if not isinstance(content, memoryview) else bytes(content))
+
+
+def loads_lines(content: str | bytes) -> list[Any]:
+    """
+    Decodes newline-delimited JSON (JSON Lines), skipping blank lines. msgspec decodes the whole batch in one call;
+    other backends go line by line through `loads`.
+    """
+    decode_lines = _decode_lines or _get_lines_decoder()
+
+    if decode_lines is not None:
+        try:
+            return decode_lines(content)
+        except ValueError:
+            pass
+
+    # Only "\n" ends a record: str.splitlines() would also split on U+2028, which JSON strings may hold unescaped.
+    lines = content.split(b"\n" if isinstance(content, bytes) else "\n")
+
+    return [loads(line) for line in lines if line.strip()]
+
+
+def _get_lines_decoder() -> Optional[Callable[[str | bytes], list]]:
+    global _decode_lines
+
+    if get_json_backend() == "msgspec" and _decode_lines is None:
+        import msgspec
+
+        _decode_lines = msgspec.json.Decoder().decode_lines
+
+    return _decode_lines
+
+
+def _get_decoder() -> JsonDecoder:
+    global _backend, _decode
+
+    if _decode is None:
+        for backend in AUTO_BACKENDS:
+            try:
+                _decode = load_json_decoder(backend)
+            except ImportError:
+                continue
+
+            _backend = backend
+            break
+
+    return _decode
+
+
+__all__ = [
+    "loads",
+    "loads_lines",
+    "set_json_backend",
+    "get_json_backend",
+    "load_json_decoder",
+    "JsonBackend",
+    "JsonDecoder",
+    "AUTO_BACKENDS",
+]
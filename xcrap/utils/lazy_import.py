@@ -0,0 +1,29 @@
+import importlib
+from typing import Any, Callable
+
+
+def lazy_exports(package: str, exports: dict[str, str]) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Builds the PEP 562 `__getattr__` and `__dir__` of `package`, which import the module that defines a name the
+    first time the name is used. `exports` maps each name to its module, relative to `package` (e.g. ".html_parser").
+    """
+    namespace = importlib.import_module(package).__dict__
+
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+
+        if module is None:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *exports})
+
+    return __getattr__, __dir__
+
+
+__all__ = ["lazy_exports"]
@@ -0,0 +1,32 @@
+import itertools
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def limit_items(items: Iterable[T], limit: Optional[int]) -> Iterator[T]:
+    """
+    Returns an iterator over the first `limit` items (all of them when `limit` is `None`). Nothing past the last
+    item returned is read, so lazy sources stop parsing there.
+    """
+    if limit is None:
+        return iter(items)
+
+    return itertools.islice(items, max(limit, 0))
+
+
+async def alimit_items(items: AsyncIterable[T], limit: Optional[int]) -> AsyncIterator[T]:
+    """
+    Async version of `limit_items`.
+    """
+    if limit is not None and limit <= 0:
+        return
+
+    count = 0
+
+    async for item in items:
+        yield item
+        count += 1
+
+        if count == limit:
+            return